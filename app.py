@@ -1,9 +1,12 @@
 # filename: password_analyzer_app.py
 import streamlit as st
-import math
 import hashlib
 from datetime import datetime
 
+from password_analyzer import cached_analyze
+from password_analyzer.attacker import get_attacker_model
+from password_analyzer.pcfg import describe_structure
+
 # Page configuration
 st.set_page_config(
     page_title="Password Security Analyzer",
@@ -43,182 +46,6 @@ st.markdown("""
 st.markdown('<h1 class="main-header">🔒 Password Security Analyzer</h1>', unsafe_allow_html=True)
 st.markdown("---")
 
-# Common passwords list
-COMMON_PASSWORDS = [
-    "123456", "password", "12345678", "qwerty", "123456789",
-    "12345", "1234", "111111", "1234567", "dragon",
-    "123123", "baseball", "abc123", "football", "monkey",
-    "letmein", "696969", "shadow", "master", "666666",
-    "qwertyuiop", "123321", "mustang", "1234567890",
-    "michael", "654321", "superman", "1qaz2wsx", "7777777",
-    "fuckyou", "121212", "000000", "qazwsx", "123qwe",
-    "killer", "trustno1", "jordan", "jennifer", "zxcvbnm",
-    "asdfgh", "hunter", "buster", "soccer", "harley",
-    "batman", "andrew", "tigger", "sunshine", "iloveyou",
-    "fuckme", "2000", "charlie", "robert", "thomas",
-    "hockey", "ranger", "daniel", "starwars", "klaster",
-    "112233", "george", "asshole", "computer", "michelle",
-    "jessica", "pepper", "1111", "zxcvbn", "555555",
-    "11111111", "131313", "freedom", "777777", "pass",
-    "fuck", "maggie", "159753", "aaaaaa", "ginger",
-    "princess", "joshua", "cheese", "amanda", "summer",
-    "love", "ashley", "6969", "nicole", "chelsea",
-    "biteme", "matthew", "access", "yankees", "987654321",
-    "dallas", "austin", "thunder", "taylor", "matrix"
-]
-
-
-def calculate_entropy(password):
-    """Calculate password entropy in bits"""
-    if not password:
-        return 0
-
-    # Character pool size
-    pool_size = 0
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_special = any(not c.isalnum() for c in password)
-
-    if has_lower:
-        pool_size += 26
-    if has_upper:
-        pool_size += 26
-    if has_digit:
-        pool_size += 10
-    if has_special:
-        pool_size += 32  # Common special characters
-
-    if pool_size == 0:
-        return 0
-
-    # Entropy calculation
-    entropy = len(password) * math.log2(pool_size)
-    return round(entropy, 2)
-
-
-def calculate_strength_score(password):
-    """Calculate password strength score (0-100)"""
-    if not password:
-        return 0
-
-    score = 0
-
-    # Length points (max 40)
-    length = len(password)
-    if length >= 8:
-        score += 10
-    if length >= 12:
-        score += 10
-    if length >= 16:
-        score += 10
-    if length >= 20:
-        score += 10
-
-    # Character variety points (max 40)
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_special = any(not c.isalnum() for c in password)
-
-    char_types = sum([has_lower, has_upper, has_digit, has_special])
-    score += char_types * 10
-
-    # Entropy points (max 20)
-    entropy = calculate_entropy(password)
-    if entropy > 50:
-        score += 20
-    elif entropy > 30:
-        score += 15
-    elif entropy > 20:
-        score += 10
-    elif entropy > 10:
-        score += 5
-
-    # Penalty for common password
-    if password.lower() in COMMON_PASSWORDS:
-        score = max(10, score - 30)
-
-    return min(100, score)
-
-
-def get_strength_rating(score):
-    """Get rating based on score"""
-    if score >= 90:
-        return "A+ (EXCELLENT)", "#4CAF50"
-    elif score >= 80:
-        return "A (VERY GOOD)", "#8BC34A"
-    elif score >= 70:
-        return "B (GOOD)", "#CDDC39"
-    elif score >= 60:
-        return "C (FAIR)", "#FFEB3B"
-    elif score >= 50:
-        return "D (WEAK)", "#FFC107"
-    elif score >= 40:
-        return "E (POOR)", "#FF9800"
-    else:
-        return "F (VERY POOR)", "#F44336"
-
-
-def estimate_crack_time(entropy):
-    """Estimate crack time based on entropy"""
-    # Assumptions: 10^9 guesses per second
-    guesses_per_second = 1e9
-    possible_combinations = 2 ** entropy
-    seconds = possible_combinations / guesses_per_second
-
-    # Convert to readable time
-    if seconds < 1:
-        return "Instantly"
-    elif seconds < 60:
-        return f"{int(seconds)} seconds"
-    elif seconds < 3600:
-        return f"{int(seconds / 60)} minutes"
-    elif seconds < 86400:
-        return f"{int(seconds / 3600)} hours"
-    elif seconds < 31536000:
-        return f"{int(seconds / 86400)} days"
-    elif seconds < 3153600000:
-        return f"{int(seconds / 31536000)} years"
-    else:
-        return f"{int(seconds / 31536000):,} years"
-
-
-def get_recommendations(password, score):
-    """Get security recommendations"""
-    recommendations = []
-
-    if score < 60:
-        recommendations.append("🔴 **CRITICAL:** Consider changing this password")
-
-    if len(password) < 8:
-        recommendations.append("🔴 Increase password length to at least 8 characters")
-    elif len(password) < 12:
-        recommendations.append("🟡 Increase password length to 12+ characters for better security")
-
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_special = any(not c.isalnum() for c in password)
-
-    if not has_lower:
-        recommendations.append("🟡 Add lowercase letters (a-z)")
-    if not has_upper:
-        recommendations.append("🟡 Add uppercase letters (A-Z)")
-    if not has_digit:
-        recommendations.append("🟡 Add numbers (0-9)")
-    if not has_special:
-        recommendations.append("🟡 Add special characters (!@#$%^&*)")
-
-    if password.lower() in COMMON_PASSWORDS:
-        recommendations.append("🔴 **WARNING:** This is a very common password!")
-
-    if score >= 80:
-        recommendations.append("✅ Your password is strong! Keep it up!")
-
-    return recommendations
-
-
 # Main UI
 col1, col2 = st.columns([1, 2])
 
@@ -242,11 +69,13 @@ with col1:
 if analyze_button and password:
     with col2:
         # Calculate metrics
-        entropy = calculate_entropy(password)
-        score = calculate_strength_score(password)
-        rating, rating_color = get_strength_rating(score)
-        crack_time = estimate_crack_time(entropy)
-        recommendations = get_recommendations(password, score)
+        # Streamlit reruns this script on every interaction: reuse earlier results
+        result = cached_analyze(password)
+        entropy = result.entropy
+        score = result.score
+        rating, rating_color = result.rating, result.rating_color
+        crack_time = result.crack_time
+        recommendations = result.recommendations
 
         # Display strength meter
         st.markdown(f"### 📊 Strength Score: **{score}/100**")
@@ -262,13 +91,13 @@ if analyze_button and password:
             st.markdown(f"**Length:** {len(password)} characters")
 
             char_types = []
-            if any(c.islower() for c in password):
+            if result.has_lower:
                 char_types.append("Lowercase ✓")
-            if any(c.isupper() for c in password):
+            if result.has_upper:
                 char_types.append("Uppercase ✓")
-            if any(c.isdigit() for c in password):
+            if result.has_digit:
                 char_types.append("Numbers ✓")
-            if any(not c.isalnum() for c in password):
+            if result.has_special:
                 char_types.append("Special ✓")
 
             st.markdown("**Contains:** " + ", ".join(char_types))
@@ -278,14 +107,20 @@ if analyze_button and password:
             st.markdown('<div class="report-box">', unsafe_allow_html=True)
             st.markdown("#### ⏱️ Time to Crack")
             st.markdown(f"**Estimated:** {crack_time}")
-            st.markdown("*Based on 1 billion guesses/second*")
+            attacker_model = get_attacker_model()
+            basis = f"*Based on {attacker_model.speed():,.0f} guesses/second"
+            if attacker_model.scheme is not None:
+                basis += f" against {attacker_model.scheme}"
+            st.markdown(basis + "*")
             st.markdown("</div>", unsafe_allow_html=True)
 
         with col_b:
             st.markdown('<div class="report-box">', unsafe_allow_html=True)
             st.markdown("#### ⚠️ Security Check")
 
-            if password.lower() in COMMON_PASSWORDS:
+            if result.breach_count > 1:
+                st.error(f"❌ **BREACHED PASSWORD** - Seen {result.breach_count:,} times in hacked databases!")
+            elif result.is_common:
                 st.error("❌ **COMMON PASSWORD** - Found in hacked databases!")
             else:
                 st.success("✅ Not in common password list")
@@ -295,6 +130,13 @@ if analyze_button and password:
             else:
                 st.success(f"✅ Length OK ({len(password)} chars)")
 
+            if result.has_keyboard_walk:
+                st.warning("⚠️ **KEYBOARD PATTERN** - Contains a walk along neighbouring keys")
+
+            if result.weak_structure:
+                st.warning(f"⚠️ **PREDICTABLE LAYOUT** - {describe_structure(result.weak_structure)} "
+                           f"({result.weak_structure}) is a very common structure")
+
             if entropy < 40:
                 st.warning(f"⚠️ **LOW ENTROPY** ({entropy} bits)")
             else:
@@ -0,0 +1,67 @@
+"""Import-time budget check for the headless scoring package.
+
+Run from the repository root:
+
+    python benchmarks/bench_import.py [--budget-ms 25] [--runs 7]
+
+Each run imports ``password_analyzer`` in a fresh interpreter with
+``-X importtime`` and the best cumulative time is compared to the budget.
+Exits with status 1 when the budget is exceeded or a UI toolkit gets imported.
+tests/test_import_budget.py runs the same check in the test suite.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "password_analyzer"
+FORBIDDEN = ("streamlit",)
+
+
+def measure_import_us():
+    """Import the package in a fresh interpreter, return (cumulative us, imported modules)"""
+    code = f"import {PACKAGE}, sys; print(' '.join(sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == PACKAGE:
+            cumulative = int(parts[1])
+    return cumulative, proc.stdout.split()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=25.0)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    timings = []
+    modules = []
+    for _ in range(args.runs):
+        cumulative, modules = measure_import_us()
+        timings.append(cumulative / 1000)
+
+    best = min(timings)
+    print(f"import {PACKAGE}: best {best:.2f} ms, worst {max(timings):.2f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    leaked = [name for name in modules if name.split(".")[0] in FORBIDDEN]
+    if leaked:
+        print(f"FAIL: UI modules imported: {', '.join(sorted(leaked))}")
+        return 1
+    if best > args.budget_ms:
+        print("FAIL: import time over budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
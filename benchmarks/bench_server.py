@@ -0,0 +1,116 @@
+"""Throughput benchmark: single-threaded HTTP/1.0 server vs the pooled keep-alive server.
+
+Run from the repository root:
+
+    python benchmarks/bench_server.py [--clients 16] [--requests 200] [--path /api/analyze]
+
+Both servers run in this process on ephemeral ports with the same handler.
+The legacy setup is socketserver.TCPServer with HTTP/1.0, so every request
+opens a new connection; the new one is web.PooledHTTPServer with HTTP/1.1
+keep-alive. A second round adds one idle client that connects and never
+sends a request, which stalls the single-threaded server until it times out.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import web  # noqa: E402
+
+
+class LegacyHandler(web.PasswordAnalyzerHandler):
+    """The handler as the old server ran it: one request per connection"""
+
+    protocol_version = 'HTTP/1.0'
+    timeout = 2
+
+
+def start(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.server_address[1]
+
+
+def run_client(port, path, count, keep_alive, errors):
+    body = json.dumps({'password': 'MySecureP@ssw0rd!'}) if path.startswith('/api/') else None
+    method = 'POST' if body else 'GET'
+    conn = None
+    for _ in range(count):
+        try:
+            if conn is None:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            if not keep_alive or response.will_close:
+                conn.close()
+                conn = None
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            conn = None
+    if conn is not None:
+        conn.close()
+
+
+def measure(port, args, keep_alive, idle_client=False):
+    """Get requests per second for all clients hammering one server"""
+    idle = None
+    if idle_client:
+        idle = socket.create_connection(('127.0.0.1', port))
+
+    errors = []
+    threads = [threading.Thread(target=run_client,
+                                args=(port, args.path, args.requests, keep_alive, errors))
+               for _ in range(args.clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if idle is not None:
+        idle.close()
+    total = args.clients * args.requests - len(errors)
+    return total / elapsed, len(errors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200, help='requests per client')
+    parser.add_argument('--path', default='/api/analyze', help='GET path, or /api/... to POST')
+    parser.add_argument('--workers', type=int, default=32)
+    args = parser.parse_args(argv)
+
+    socketserver.TCPServer.allow_reuse_address = True
+    legacy = socketserver.TCPServer(('127.0.0.1', 0), LegacyHandler)
+    pooled = web.PooledHTTPServer(('127.0.0.1', 0), web.PasswordAnalyzerHandler, workers=args.workers)
+    legacy_port, pooled_port = start(legacy), start(pooled)
+
+    print(f'{args.clients} clients x {args.requests} requests to {args.path}')
+    for idle_client in (False, True):
+        label = 'with one idle client' if idle_client else 'all clients active'
+        legacy_rps, legacy_errors = measure(legacy_port, args, False, idle_client)
+        pooled_rps, pooled_errors = measure(pooled_port, args, True, idle_client)
+        print(f'\n{label}:')
+        print(f"  {'TCPServer, HTTP/1.0':<30}{legacy_rps:8.0f} req/s  ({legacy_errors} errors)")
+        print(f"  {'PooledHTTPServer, keep-alive':<30}{pooled_rps:8.0f} req/s  ({pooled_errors} errors)")
+        print(f"  {'speedup':<30}{pooled_rps / legacy_rps:8.1f}x")
+
+    for server in (legacy, pooled):
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Startup latency check: time from launching web.py to the first byte of the page.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py [--budget-ms 1500] [--runs 3]
+
+Each run starts `web.py --no-browser` in a fresh interpreter and requests
+the page as soon as the port accepts connections. Two setups are timed:
+the default one, with network discovery pointed at a proxy that accepts
+connections and never answers (an offline host where the public IP lookup
+hangs), and one with --no-discovery. Exits with status 1 when the best time
+of either setup is over the budget.
+"""
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Discovery may take this long in the hanging setup: far over the budget,
+# so a server waiting for it fails the check
+HANGING_DISCOVERY_TIMEOUT = 30
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_byte(args, env, limit):
+    """Start the server, return seconds until the first byte of GET / (None past limit)"""
+    port = free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, 'web.py', '--port', str(port), '--no-browser'] + args,
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < limit:
+            if proc.poll() is not None:
+                raise RuntimeError(f'web.py exited with status {proc.returncode}')
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=limit)
+            try:
+                conn.request('GET', '/')
+                response = conn.getresponse()
+                response.read(1)
+                return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+            finally:
+                conn.close()
+        return None
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=1500.0)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args(argv)
+    limit = 4 * args.budget_ms / 1000
+
+    # A proxy that completes the TCP handshake and then never reads or answers
+    blackhole = socket.socket()
+    blackhole.bind(('127.0.0.1', 0))
+    blackhole.listen(16)
+    proxy = f'http://127.0.0.1:{blackhole.getsockname()[1]}'
+    env = dict(os.environ, https_proxy=proxy, HTTPS_PROXY=proxy, PYTHONUNBUFFERED='1')
+
+    setups = (
+        ('discovery hanging', ['--discovery-timeout', str(HANGING_DISCOVERY_TIMEOUT)]),
+        ('--no-discovery', ['--no-discovery']),
+    )
+    failed = False
+    for label, server_args in setups:
+        timings = [time_to_first_byte(server_args, env, limit) for _ in range(args.runs)]
+        if None in timings:
+            print(f'{label:<20} no response within {limit:.0f} s')
+            failed = True
+            continue
+        best = min(timings) * 1000
+        print(f'{label:<20} best {best:.0f} ms, worst {max(timings) * 1000:.0f} ms '
+              f'over {args.runs} runs (budget {args.budget_ms:.0f} ms)')
+        failed |= best > args.budget_ms
+
+    blackhole.close()
+    if failed:
+        print('FAIL: time to first byte over budget')
+        return 1
+    print('OK')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
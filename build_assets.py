@@ -0,0 +1,164 @@
+"""Vendor and fingerprint the analyzer page's static assets.
+
+Run from the repository root:
+
+    python build_assets.py              # download missing assets, then build
+    python build_assets.py --offline    # build from static/vendor only
+
+The page loads Font Awesome and Chart.js from public CDNs. This downloads
+them (with the web fonts the stylesheet references) into static/vendor/,
+then writes content-hashed copies of them and of the analysis engine script
+to static/dist/, e.g. static/dist/chart.umd.3b1f8c0e2a4d.js, with a
+manifest.json mapping the page's URLs to those copies. web.py serves the
+page pointing at the hashed files, with Cache-Control: immutable, and
+precaches them in its service worker.
+
+For air-gapped machines, run the download where there is network access
+and copy static/vendor/ over, then build with --offline. Restart web.py
+after a build.
+"""
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT, 'static')
+VENDOR_DIR = os.path.join(STATIC_DIR, 'vendor')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+DIST_URL = 'static/dist/'
+MANIFEST_NAME = 'manifest.json'
+
+# (URL in the page, pinned download URL, file under static/vendor)
+VENDOR_ASSETS = (
+    ('https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+     'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+     'font-awesome/css/all.min.css'),
+    ('https://cdn.jsdelivr.net/npm/chart.js',
+     'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js',
+     'chart.js/chart.umd.js'),
+)
+
+# The page's own scripts: (URL in the page, file under static/)
+LOCAL_ASSETS = (
+    ('static/analyzer-worker.js', 'analyzer-worker.js'),
+)
+
+# Relative url(...) references in stylesheets (fonts, images)
+CSS_URL = re.compile(r'''url\((["']?)(?!data:|https?:|/)([^)"'?#]+)([^)"']*)\1\)''')
+
+DOWNLOAD_TIMEOUT = 30
+
+
+def download(url, path):
+    """Fetch url into path"""
+    print(f'  {url}')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+            body = response.read()
+    except OSError as e:
+        raise SystemExit(f'Could not download {url}: {e}') from None
+    with open(path, 'wb') as f:
+        f.write(body)
+    return body
+
+
+def css_references(css):
+    """Get the relative file references of a stylesheet"""
+    return sorted({match.group(2) for match in CSS_URL.finditer(css)})
+
+
+def vendor(offline=False, refresh=False):
+    """Make sure every vendored asset (and the files its stylesheet uses) is in static/vendor"""
+    for _, download_url, name in VENDOR_ASSETS:
+        files = [(download_url, name)]
+        while files:
+            url, name = files.pop()
+            path = os.path.join(VENDOR_DIR, name)
+            if refresh or not os.path.exists(path):
+                if offline:
+                    raise SystemExit(f'Missing {path}: run without --offline where the CDNs are reachable')
+                download(url, path)
+            if name.endswith('.css'):
+                with open(path, encoding='utf-8') as f:
+                    for reference in css_references(f.read()):
+                        files.append((urllib.parse.urljoin(url, reference),
+                                      posixpath.normpath(posixpath.join(posixpath.dirname(name), reference))))
+
+
+def fingerprint(name, body):
+    """Get the content-hashed file name of a file: chart.umd.js -> chart.umd.<hash>.js"""
+    stem, extension = posixpath.splitext(posixpath.basename(name))
+    return f'{stem}.{hashlib.sha256(body).hexdigest()[:12]}{extension}'
+
+
+def build():
+    """Write static/dist: hashed copies of every asset and the manifest"""
+    staging = DIST_DIR + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    urls = {}
+    files = []
+
+    def emit(name, body):
+        hashed = fingerprint(name, body)
+        with open(os.path.join(staging, hashed), 'wb') as f:
+            f.write(body)
+        files.append(DIST_URL + hashed)
+        return hashed
+
+    def emit_file(directory, name):
+        with open(os.path.join(directory, name), 'rb') as f:
+            body = f.read()
+        if name.endswith('.css'):
+            # The dist directory is flat: point the references at the hashed copies
+            css = body.decode('utf-8')
+            hashed = {reference: emit_file(directory, posixpath.normpath(
+                          posixpath.join(posixpath.dirname(name), reference)))
+                      for reference in css_references(css)}
+            body = CSS_URL.sub(lambda m: f'url({m.group(1)}{hashed[m.group(2)]}{m.group(3)}{m.group(1)})',
+                               css).encode('utf-8')
+        return emit(name, body)
+
+    for page_url, _, name in VENDOR_ASSETS:
+        urls[page_url] = DIST_URL + emit_file(VENDOR_DIR, name)
+    for page_url, name in LOCAL_ASSETS:
+        urls[page_url] = DIST_URL + emit_file(STATIC_DIR, name)
+
+    with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'urls': urls, 'files': sorted(set(files))}, f, indent=2)
+        f.write('\n')
+
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.replace(staging, DIST_DIR)
+    return urls, files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--offline', action='store_true',
+                        help='build from static/vendor without downloading anything')
+    parser.add_argument('--refresh', action='store_true',
+                        help='download every vendored asset again')
+    args = parser.parse_args(argv)
+    if args.offline and args.refresh:
+        parser.error('--offline and --refresh are exclusive')
+
+    print('Vendoring third-party assets into static/vendor')
+    vendor(args.offline, args.refresh)
+    urls, files = build()
+    print(f'Wrote {len(set(files))} files to static/dist:')
+    for page_url, path in urls.items():
+        print(f'  {page_url} -> {path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
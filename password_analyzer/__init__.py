@@ -0,0 +1,43 @@
+"""Password strength scoring core.
+
+Headless counterpart of the Streamlit app: importing this package never
+pulls in a UI toolkit, and word lists are only read from disk on first use.
+
+Optional modules with extra dependencies are not imported here:
+
+* ``password_analyzer.vectorized`` - NumPy batch scoring engine
+"""
+
+from .breach import BreachCorpus, SetCorpus, SortedCorpus, load_corpus, set_corpus
+from .cache import MemoryResultCache, ResultCache, SqliteResultCache, cached_analyze, set_cache
+from .scoring import (
+    AnalysisResult,
+    analyze,
+    analyze_many,
+    calculate_entropy,
+    calculate_strength_score,
+    estimate_crack_time,
+    get_recommendations,
+    get_strength_rating,
+)
+
+__all__ = [
+    "AnalysisResult",
+    "BreachCorpus",
+    "MemoryResultCache",
+    "ResultCache",
+    "SetCorpus",
+    "SortedCorpus",
+    "SqliteResultCache",
+    "analyze",
+    "analyze_many",
+    "cached_analyze",
+    "calculate_entropy",
+    "calculate_strength_score",
+    "estimate_crack_time",
+    "get_recommendations",
+    "get_strength_rating",
+    "load_corpus",
+    "set_cache",
+    "set_corpus",
+]
@@ -0,0 +1,301 @@
+# Attacker cost model: guessing speed by password storage scheme and hardware
+#
+# How fast a password falls depends on how it is stored: an RTX 4090 tries
+# about 164 billion MD5 hashes a second but only 184 thousand bcrypt cost-5
+# hashes.  A scheme is written as a short spec:
+#
+#   md5  sha1  sha256  sha512  ntlm
+#   pbkdf2-sha256:600000        (pbkdf2-sha1 / -sha256 / -sha512, iterations)
+#   bcrypt:12                   (cost)
+#   scrypt:n=131072,r=8,p=1
+#   argon2id:m=19456,t=2,p=1    (argon2i / argon2d / argon2id, memory in KiB)
+#
+# Speeds start from a calibration of this machine: hashlib primitives are
+# timed on one core (each PBKDF2 iteration is two hash compressions, so it
+# measures the raw hash rate without Python overhead; scrypt gives the memory
+# throughput).  Primitives hashlib lacks are scaled from a related measured
+# one.  A GPU is then worth the published RTX 4090 / reference core ratio of
+# the primitive, and each hardware tier is a number of cores and GPUs.
+#
+# Without a configured scheme the page's historical fixed speeds are used.
+import argparse
+import hashlib
+import os
+import re
+import sys
+import time
+
+# Per primitive: (reference x86 core, RTX 4090) speed.  Hashes per second
+# (bcrypt: cost-5 hashes per second; scrypt and argon2: bytes of memory
+# traffic per second).  GPU figures are hashcat 6.2.6 benchmarks; both are
+# order-of-magnitude figures.
+PRIMITIVES = {
+    "md5": (5.0e6, 164.1e9),
+    "sha1": (7.0e6, 50.64e9),
+    "sha256": (8.0e6, 21.98e9),
+    "sha512": (3.0e6, 7.48e9),
+    "ntlm": (8.8e6, 288.5e9),
+    "bcrypt": (1.8e3, 184.0e3),
+    "scrypt": (4.8e8, 2.39e11),
+    "argon2": (4.8e8, 4.8e9),
+}
+
+# Primitives hashlib cannot time, scaled from the one measured for them
+RELATED_PRIMITIVES = {"ntlm": "md5", "bcrypt": "sha256", "argon2": "scrypt"}
+
+# Hardware tiers shown for every password: (name, CPU cores, GPUs)
+HARDWARE_TIERS = (
+    ("Basic Computer", 4, 0),
+    ("Hacker (GPU)", 0, 1),
+    ("Botnet", 100000, 0),
+    ("Supercomputer", 0, 10000),
+)
+
+# Fixed speeds used when no scheme is configured (guesses per second)
+LEGACY_SPEEDS = (
+    ("Basic Computer", 1e3),
+    ("Hacker (GPU)", 1e6),
+    ("Botnet", 1e9),
+    ("Supercomputer", 1e12),
+)
+
+# Tier behind the single crack time of estimate_crack_time
+CRACK_TIME_TIER = "Botnet"
+
+CALIBRATION_SECONDS = 0.05
+SCRYPT_CALIBRATION = {"n": 1 << 14, "r": 8, "p": 1}
+
+HASH_ENV = "PASSWORD_ANALYZER_HASH"
+
+FAST_HASHES = ("md5", "sha1", "sha256", "sha512", "ntlm")
+PBKDF2_HASHES = ("sha1", "sha256", "sha512")
+ARGON2_VARIANTS = ("argon2i", "argon2d", "argon2id")
+
+# Defaults for parameters left out of a spec (OWASP password storage advice)
+DEFAULT_PARAMETERS = {
+    "pbkdf2-sha1": {"iterations": 1300000},
+    "pbkdf2-sha256": {"iterations": 600000},
+    "pbkdf2-sha512": {"iterations": 210000},
+    "bcrypt": {"cost": 10},
+    "scrypt": {"n": 1 << 17, "r": 8, "p": 1},
+    "argon2": {"m": 19456, "t": 2, "p": 1},
+}
+
+
+def _pbkdf2_rate(name, seconds):
+    """Get the hash compressions per second of one core, timing PBKDF2-HMAC"""
+    iterations = 1000
+    while True:
+        start = time.perf_counter()
+        hashlib.pbkdf2_hmac(name, b"password", b"calibration", iterations)
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return 2 * iterations / elapsed
+        iterations *= 2
+
+
+def _scrypt_rate(seconds):
+    """Get the scrypt memory traffic per second of one core"""
+    n, r, p = SCRYPT_CALIBRATION["n"], SCRYPT_CALIBRATION["r"], SCRYPT_CALIBRATION["p"]
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        hashlib.scrypt(b"password", salt=b"calibration", n=n, r=r, p=p, maxmem=256 * r * n * p)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return runs * 256 * r * n * p / elapsed
+
+
+def calibrate(seconds=CALIBRATION_SECONDS):
+    """Time the hashlib primitives on this machine
+
+    Returns {primitive: local one-core speed}, in the units of PRIMITIVES.
+    Primitives that cannot be timed here (FIPS builds without MD5, Python
+    without scrypt) keep their reference speed.
+    """
+    measured = {}
+    for name in ("md5", "sha1", "sha256", "sha512"):
+        try:
+            measured[name] = _pbkdf2_rate(name, seconds)
+        except ValueError:
+            pass
+    try:
+        measured["scrypt"] = _scrypt_rate(seconds)
+    except (AttributeError, ValueError):
+        pass
+
+    speeds = {}
+    for name, (reference, _) in PRIMITIVES.items():
+        related = RELATED_PRIMITIVES.get(name, name)
+        if related in measured:
+            speeds[name] = reference * measured[related] / PRIMITIVES[related][0]
+        else:
+            speeds[name] = reference
+    return speeds
+
+
+_calibration = None
+
+
+def get_calibration():
+    """Get the calibration of this machine, measuring it on first use"""
+    global _calibration
+    if _calibration is None:
+        _calibration = calibrate()
+    return _calibration
+
+
+class HashScheme:
+    """A password storage scheme and its cost parameters"""
+
+    __slots__ = ("name", "primitive", "parameters")
+
+    def __init__(self, name, primitive, parameters):
+        self.name = name
+        self.primitive = primitive
+        self.parameters = parameters
+
+    @classmethod
+    def parse(cls, spec):
+        """Parse a scheme spec such as "bcrypt:12" or "argon2id:m=65536,t=3,p=4" """
+        name, _, arguments = spec.strip().lower().partition(":")
+        if name in FAST_HASHES:
+            primitive, defaults = name, {}
+        elif name.startswith("pbkdf2-") and name[7:] in PBKDF2_HASHES:
+            primitive, defaults = name[7:], DEFAULT_PARAMETERS[name]
+        elif name in ("bcrypt", "scrypt"):
+            primitive, defaults = name, DEFAULT_PARAMETERS[name]
+        elif name in ARGON2_VARIANTS:
+            primitive, defaults = "argon2", DEFAULT_PARAMETERS["argon2"]
+        else:
+            raise ValueError(f"Unknown hash scheme: {spec!r}")
+
+        parameters = dict(defaults)
+        if arguments:
+            if not defaults:
+                raise ValueError(f"{name} takes no parameters")
+            for argument in arguments.split(","):
+                key, equals, value = argument.partition("=")
+                if not equals:
+                    # A lone number is the scheme's first parameter
+                    key, value = next(iter(defaults)), key
+                if key not in defaults or not re.fullmatch(r"\d+", value.strip()):
+                    raise ValueError(f"Bad parameter {argument!r} for {name}")
+                parameters[key] = int(value)
+            if min(parameters.values()) < 1:
+                raise ValueError(f"{name} parameters must be positive")
+        return cls(name, primitive, parameters)
+
+    def core_speed(self, calibration):
+        """Guesses per second of one CPU core"""
+        speed = calibration[self.primitive]
+        parameters = self.parameters
+        if self.name.startswith("pbkdf2-"):
+            # Two compressions per iteration
+            return speed / (2 * parameters["iterations"])
+        if self.primitive == "bcrypt":
+            return speed * 2.0 ** (5 - parameters["cost"])
+        if self.primitive == "scrypt":
+            return speed / (256 * parameters["r"] * parameters["n"] * parameters["p"])
+        if self.primitive == "argon2":
+            # Every pass reads and writes the whole m KiB, as scrypt's two loops do
+            return speed / (2 * 1024 * parameters["m"] * parameters["t"])
+        return speed
+
+    @property
+    def gpu_ratio(self):
+        """How many CPU cores one GPU is worth for this scheme"""
+        reference, gpu = PRIMITIVES[self.primitive]
+        return gpu / reference
+
+    def __str__(self):
+        if not self.parameters:
+            return self.name
+        return f"{self.name}:" + ",".join(f"{key}={value}" for key, value in self.parameters.items())
+
+    def __repr__(self):
+        return f"HashScheme({str(self)!r})"
+
+
+class AttackerModel:
+    """Guessing speed of each hardware tier against one storage scheme"""
+
+    def __init__(self, speeds, scheme=None):
+        # ((tier name, guesses per second), ...) in display order
+        self.speeds = tuple(speeds)
+        self.scheme = scheme
+
+    @classmethod
+    def for_scheme(cls, scheme, calibration=None, tiers=HARDWARE_TIERS):
+        """Build the model of a scheme (a HashScheme or a spec string)"""
+        if not isinstance(scheme, HashScheme):
+            scheme = HashScheme.parse(scheme)
+        if calibration is None:
+            calibration = get_calibration()
+        core = scheme.core_speed(calibration)
+        ratio = scheme.gpu_ratio
+        return cls(((name, core * (cores + gpus * ratio)) for name, cores, gpus in tiers), scheme)
+
+    def speed(self, tier=CRACK_TIME_TIER):
+        """Guesses per second of one tier"""
+        for name, speed in self.speeds:
+            if name == tier:
+                return speed
+        raise KeyError(tier)
+
+    def to_dict(self):
+        """Convert the model to a plain dict, as served to the page"""
+        return {
+            "scheme": str(self.scheme) if self.scheme is not None else None,
+            "attackers": {name: speed for name, speed in self.speeds},
+        }
+
+    def __repr__(self):
+        return f"AttackerModel(scheme={str(self.scheme) if self.scheme else None!r})"
+
+
+_active_model = None
+
+
+def get_attacker_model():
+    """Get the active attacker model
+
+    Uses the scheme named by $PASSWORD_ANALYZER_HASH when set (calibrating
+    this machine on first use), otherwise the legacy fixed speeds.
+    """
+    global _active_model
+    if _active_model is None:
+        spec = os.environ.get(HASH_ENV)
+        _active_model = AttackerModel.for_scheme(spec) if spec else AttackerModel(LEGACY_SPEEDS)
+    return _active_model
+
+
+def set_attacker_model(model):
+    """Replace the active attacker model (None restores the default on next use)"""
+    global _active_model
+    _active_model = model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Calibrate this machine and show the guessing speeds for a hash scheme")
+    parser.add_argument("scheme", nargs="+", help='scheme specs, e.g. md5 "bcrypt:12"')
+    args = parser.parse_args(argv)
+
+    calibration = get_calibration()
+    print("Calibration (one core): " + ", ".join(
+        f"{name} {speed:.3g}/s" for name, speed in calibration.items()))
+    for spec in args.scheme:
+        try:
+            model = AttackerModel.for_scheme(spec, calibration)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"\n{model.scheme}")
+        for name, speed in model.speeds:
+            print(f"  {name:16} {speed:12.4g} guesses/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
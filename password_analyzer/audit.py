@@ -0,0 +1,180 @@
+# Bulk password audit command
+#
+#   python -m password_analyzer.audit passwords.txt --workers 8 > report.jsonl
+#   some-export | python -m password_analyzer.audit -0 --format csv > report.csv
+#
+# Input is streamed (newline- or NUL-delimited), cut into chunks and fanned
+# out to a process pool.  Only a bounded window of chunks is in flight at any
+# time and results are written in input order, so memory use does not depend
+# on the size of the input.  Passwords are not echoed unless asked for.
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .scoring import analyze
+
+READ_SIZE = 1 << 20
+
+CSV_FIELDS = (
+    "index", "score", "rating", "entropy", "crack_time", "is_common", "breach_count",
+    "length", "has_lower", "has_upper", "has_digit", "has_special", "has_keyboard_walk",
+    "weak_structure", "recommendations",
+)
+
+
+def iter_passwords(stream, delimiter=b"\n"):
+    """Yield the records of a binary stream, decoded as UTF-8
+
+    With the newline delimiter a trailing carriage return is dropped too.
+    Undecodable bytes are kept as surrogate escapes.
+    """
+    pending = b""
+    while True:
+        block = stream.read(READ_SIZE)
+        if not block:
+            break
+        records = (pending + block).split(delimiter)
+        pending = records.pop()
+        for record in records:
+            if delimiter == b"\n" and record.endswith(b"\r"):
+                record = record[:-1]
+            yield record.decode("utf-8", "surrogateescape")
+    if pending:
+        if delimiter == b"\n" and pending.endswith(b"\r"):
+            pending = pending[:-1]
+        yield pending.decode("utf-8", "surrogateescape")
+
+
+def iter_chunks(passwords, chunk_size):
+    """Group passwords into (start index, list) chunks"""
+    chunk = []
+    start = 0
+    for password in passwords:
+        chunk.append(password)
+        if len(chunk) == chunk_size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def audit_chunk(start, passwords, output_format="jsonl", include_password=False):
+    """Analyze a chunk and render its output lines (runs in the worker processes)"""
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+    else:
+        lines = []
+
+    for index, password in enumerate(passwords, start):
+        row = analyze(password).to_dict()
+        if output_format == "csv":
+            row["recommendations"] = " | ".join(row["recommendations"])
+            values = [index] + [row[field] for field in CSV_FIELDS[1:]]
+            if include_password:
+                values.insert(1, password.encode("utf-8", "surrogateescape").decode("utf-8", "replace"))
+            writer.writerow(values)
+        else:
+            record = {"index": index}
+            if include_password:
+                record["password"] = password
+            record.update(row)
+            lines.append(json.dumps(record) + "\n")
+
+    if output_format == "csv":
+        return buffer.getvalue()
+    return "".join(lines)
+
+
+def run_audit(passwords, out, output_format="jsonl", workers=None, chunk_size=2000,
+              include_password=False):
+    """Audit an iterable of passwords, writing results to out in input order
+
+    Returns the number of passwords processed.
+    """
+    workers = workers or os.cpu_count() or 1
+    count = 0
+
+    if output_format == "csv":
+        header = list(CSV_FIELDS)
+        if include_password:
+            header.insert(1, "password")
+        out.write(",".join(header) + "\n")
+
+    chunks = iter_chunks(passwords, chunk_size)
+    if workers == 1:
+        for start, chunk in chunks:
+            out.write(audit_chunk(start, chunk, output_format, include_password))
+            count += len(chunk)
+        return count
+
+    # Keep a bounded window of chunks in flight and drain it in order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for start, chunk in chunks:
+            in_flight.append((len(chunk), pool.submit(
+                audit_chunk, start, chunk, output_format, include_password)))
+            if len(in_flight) >= workers * 2:
+                size, future = in_flight.popleft()
+                out.write(future.result())
+                count += size
+        while in_flight:
+            size, future = in_flight.popleft()
+            out.write(future.result())
+            count += size
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Audit a password list with the analyzer's scoring rules")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="password list, one per line (default: stdin)")
+    parser.add_argument("-0", "--null", action="store_true",
+                        help="entries are NUL-delimited instead of newline-delimited")
+    parser.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl",
+                        help="output format (default: jsonl)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count, 1 runs in-process)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=2000,
+                        help="passwords per work unit (default: 2000)")
+    parser.add_argument("--include-password", action="store_true",
+                        help="include the plaintext password in each result")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    delimiter = b"\0" if args.null else b"\n"
+
+    started = time.perf_counter()
+    try:
+        count = run_audit(iter_passwords(source, delimiter), out, args.format,
+                          args.workers, args.chunk_size, args.include_password)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+        else:
+            out.flush()
+    elapsed = time.perf_counter() - started
+
+    rate = count / elapsed if elapsed else 0
+    print(f"Audited {count:,} passwords in {elapsed:.2f}s ({rate:,.0f} passwords/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# Aho-Corasick automaton over the dictionary word lists
+#
+# Dictionary matching has to find every word of every list occurring anywhere
+# in the password.  Probing each of the O(n^2) substrings against each list
+# gets slower with every list added; the automaton reports all occurrences of
+# all words in a single pass over the password instead, so matching stays
+# linear in the password length (plus the number of matches) however many
+# dictionaries are loaded.
+from collections import deque
+
+
+class Automaton:
+    """Aho-Corasick automaton mapping words to (dictionary, rank) entries
+
+    Add every word, call build() once, then search any number of texts.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        # Entries of the words ending at each node: (length, dictionary, rank)
+        self._output = [()]
+        # Nearest node down the failure chain that has entries (-1: none)
+        self._output_link = [-1]
+        self.words = 0
+        self.built = False
+
+    def add(self, word, dictionary, rank):
+        """Add a word of a dictionary, ranked from 1 (most common)"""
+        if self.built:
+            raise RuntimeError("Cannot add words to a built automaton")
+        if not word:
+            return
+        goto = self._goto
+        node = 0
+        for ch in word:
+            child = goto[node].get(ch)
+            if child is None:
+                child = len(goto)
+                goto[node][ch] = child
+                goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._output_link.append(-1)
+            node = child
+        entries = self._output[node]
+        if any(entry[1] == dictionary for entry in entries):
+            return  # keep the best rank of a duplicate
+        self._output[node] = entries + ((len(word), dictionary, rank),)
+        self.words += 1
+
+    def add_dictionary(self, name, words):
+        """Add a ranked word list (most common first)"""
+        for rank, word in enumerate(words, 1):
+            self.add(word, name, rank)
+
+    def build(self):
+        """Compute the failure and output links (breadth first)"""
+        goto, fail, output, output_link = self._goto, self._fail, self._output, self._output_link
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if node else 0
+                target = fail[child]
+                output_link[child] = target if output[target] else output_link[target]
+        self.built = True
+        return self
+
+    def search(self, text):
+        """Yield (i, j, dictionary, rank) for every word occurring at text[i:j + 1]"""
+        if not self.built:
+            raise RuntimeError("Automaton must be built before searching")
+        goto, fail, output, output_link = self._goto, self._fail, self._output, self._output_link
+        node = 0
+        for j, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if output[node] else output_link[node]
+            while hit > 0:
+                for length, dictionary, rank in output[hit]:
+                    yield j - length + 1, j, dictionary, rank
+                hit = output_link[hit]
+
+    def __len__(self):
+        return self.words
+
+    def __repr__(self):
+        return f"Automaton(words={self.words}, states={len(self._goto)})"
@@ -0,0 +1,205 @@
+# Bloom filter tier for breached-password checks on low-memory nodes
+#
+# A filter for n entries at false-positive rate p takes about
+# -n * ln(p) / ln(2)^2 bits: ~1.2 bytes per entry at 1%, against 24 bytes
+# per entry for the SHA-1 corpus.  Keys are SHA-1 digests, so a filter can be
+# built from a plaintext list or straight from a Pwned Passwords hash dump.
+#
+# File layout: MAGIC, bit count, entry count, hash count, flags (little-endian),
+# then the bit array.  Build one with:
+#
+#   python -m password_analyzer.bloom breached.txt breached.bloom --fp-rate 0.001
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+
+from .breach import BreachCorpus
+
+MAGIC = b"PWBLOOM1"
+HEADER = struct.Struct("<8sQQII")
+
+# Header flags
+FLAG_LOWERCASE = 1  # keys were lowercased before hashing (plaintext lists)
+
+
+def _positions(digest, num_bits, num_hashes):
+    """Yield the bit positions of a digest (Kirsch-Mitzenmacher double hashing)"""
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:16], "little") | 1
+    for i in range(num_hashes):
+        yield (h1 + i * h2) % num_bits
+
+
+def optimal_parameters(capacity, fp_rate):
+    """Get (bit count, hash count) for capacity entries at the given false-positive rate"""
+    if not 0 < fp_rate < 1:
+        raise ValueError("fp_rate must be between 0 and 1")
+    capacity = max(1, capacity)
+    num_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+    num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+    return num_bits, num_hashes
+
+
+class BloomFilter:
+    """Bloom filter over SHA-1 digests"""
+
+    def __init__(self, num_bits, num_hashes, bits=None, count=0, flags=0):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        self.count = count
+        self.flags = flags
+
+    @classmethod
+    def for_capacity(cls, capacity, fp_rate=0.01, flags=0):
+        """Create an empty filter sized for capacity entries"""
+        num_bits, num_hashes = optimal_parameters(capacity, fp_rate)
+        return cls(num_bits, num_hashes, flags=flags)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a filter file"""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+            data.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+        _, num_bits, count, num_hashes, flags = HEADER.unpack_from(data, 0)
+        bits = memoryview(data)[HEADER.size:HEADER.size + (num_bits + 7) // 8]
+        return cls(num_bits, num_hashes, bits, count, flags)
+
+    def save(self, path):
+        """Write the filter to a single file"""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.num_bits, self.count, self.num_hashes, self.flags))
+            f.write(self.bits)
+
+    def key(self, password):
+        """Get the digest a password is stored under"""
+        if self.flags & FLAG_LOWERCASE:
+            password = password.lower()
+        return hashlib.sha1(password.encode("utf-8", "surrogatepass")).digest()
+
+    def add_digest(self, digest):
+        bits = self.bits
+        for position in _positions(digest, self.num_bits, self.num_hashes):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def contains_digest(self, digest):
+        bits = self.bits
+        for position in _positions(digest, self.num_bits, self.num_hashes):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __contains__(self, password):
+        return self.contains_digest(self.key(password))
+
+    def false_positive_rate(self):
+        """Expected false-positive rate at the current fill"""
+        if not self.count:
+            return 0.0
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class BloomCorpus(BreachCorpus):
+    """Breach corpus with a Bloom filter as its first tier
+
+    Negatives are answered by the filter alone. Positives are confirmed by
+    the exact corpus when one is given (which also supplies the prevalence
+    count); otherwise they are reported as a single, probable hit.
+    """
+
+    def __init__(self, bloom_filter, exact=None):
+        self.filter = bloom_filter
+        self.exact = exact
+
+    @classmethod
+    def from_file(cls, path, exact=None):
+        return cls(BloomFilter.load(path), exact)
+
+    def count(self, password):
+        if password not in self.filter:
+            return 0
+        if self.exact is None:
+            return 1
+        return self.exact.count(password)
+
+    def __len__(self):
+        return self.filter.count
+
+
+def is_bloom_file(path):
+    """Check if a file starts with the Bloom filter magic"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _iter_keys(path, hashed, lowercase):
+    """Yield the SHA-1 digests of the entries of a list or hash dump"""
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if hashed:
+                yield bytes.fromhex(line.partition(b":")[0].decode("ascii"))
+            else:
+                if lowercase:
+                    line = line.decode("utf-8", "replace").lower().encode("utf-8")
+                yield hashlib.sha1(line).digest()
+
+
+def build_filter(source, output, fp_rate=0.01, hashed=False, lowercase=None, capacity=None):
+    """Build a filter file from a plaintext list or a HASH[:COUNT] dump
+
+    Plaintext entries are lowercased by default, matching the bundled common
+    passwords check; hash dumps are case-sensitive by nature. The source is
+    read twice when capacity is not given. Returns the filter.
+    """
+    if lowercase is None:
+        lowercase = not hashed
+    if hashed and lowercase:
+        raise ValueError("Hash dumps cannot be lowercased")
+    if capacity is None:
+        capacity = sum(1 for _ in _iter_keys(source, hashed, False))
+
+    bloom_filter = BloomFilter.for_capacity(capacity, fp_rate, FLAG_LOWERCASE if lowercase else 0)
+    for digest in _iter_keys(source, hashed, lowercase):
+        bloom_filter.add_digest(digest)
+    bloom_filter.save(output)
+    return bloom_filter
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build a Bloom filter file from a breached password list")
+    parser.add_argument("source", help="plaintext list or HASH[:COUNT] dump, one entry per line")
+    parser.add_argument("output", help="filter file to write")
+    parser.add_argument("--fp-rate", type=float, default=0.01,
+                        help="target false-positive rate (default: 0.01)")
+    parser.add_argument("--sha1", action="store_true",
+                        help="source is a SHA-1 hash dump instead of plaintext")
+    parser.add_argument("--case-sensitive", action="store_true",
+                        help="do not lowercase plaintext entries")
+    parser.add_argument("--capacity", type=int,
+                        help="number of entries (default: count the source first)")
+    args = parser.parse_args(argv)
+
+    lowercase = False if args.case_sensitive else None
+    bloom_filter = build_filter(args.source, args.output, args.fp_rate,
+                                args.sha1, lowercase, args.capacity)
+    size = os.path.getsize(args.output)
+    print(f"Wrote {bloom_filter.count:,} entries to {args.output} "
+          f"({size / 2 ** 20:.2f} MiB, {bloom_filter.num_hashes} hashes, "
+          f"expected false-positive rate {bloom_filter.false_positive_rate():.4%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
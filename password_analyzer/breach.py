@@ -0,0 +1,213 @@
+# Breached / common password corpora
+#
+# The corpus is looked up once per analysis and shared by everything that
+# needs the answer (score penalty, recommendations, UI).  Lookups never scan
+# the list: SetCorpus is a hashed set, SortedCorpus a compact sorted array
+# searched with bisect for lists too big to keep as Python strings, and
+# hashcorpus.Sha1Corpus a memory-mapped SHA-1 file for Pwned-Passwords-sized
+# dumps that would not fit in RAM at all.  bloom.BloomCorpus puts a compact
+# probabilistic filter in front of any of them for low-memory deployments.
+import bisect
+import os
+from array import array
+
+from .profile import get_profile
+from .wordlists import common_passwords
+
+# Environment variable pointing at a corpus file to use instead of the bundled list
+CORPUS_ENV = "PASSWORD_ANALYZER_CORPUS"
+
+
+class BreachCorpus:
+    """Base class for a collection of breached passwords"""
+
+    def count(self, password):
+        """Get how often the password appears in the corpus (0 if absent)"""
+        raise NotImplementedError
+
+    def count_profile(self, profile):
+        """Same as count(), for an already profiled password"""
+        return self.count(profile.password)
+
+    def __contains__(self, password):
+        return self.count(password) > 0
+
+
+class SetCorpus(BreachCorpus):
+    """Case-insensitive corpus held in a hashed set"""
+
+    def __init__(self, words):
+        self._words = frozenset(word.lower() for word in words)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a plain text list, one password per line"""
+        return cls(_read_lines(path))
+
+    def count(self, password):
+        return 1 if password.lower() in self._words else 0
+
+    def count_profile(self, profile):
+        return 1 if profile.lowered in self._words else 0
+
+    def __len__(self):
+        return len(self._words)
+
+
+class _EntryView:
+    """Read-only sequence over the entries packed in a SortedCorpus"""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        return self._blob[self._offsets[i]:self._offsets[i + 1]]
+
+
+class SortedCorpus(BreachCorpus):
+    """Case-insensitive corpus packed into one sorted byte string
+
+    Entries are stored back to back with an offsets array, which takes a
+    fraction of the memory of a set of str for multi-million entry lists.
+    Membership is a binary search.
+    """
+
+    def __init__(self, words):
+        entries = sorted({word.lower().encode("utf-8") for word in words})
+        offsets = array("Q", [0])
+        position = 0
+        for entry in entries:
+            position += len(entry)
+            offsets.append(position)
+        self._entries = _EntryView(b"".join(entries), offsets)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a plain text list, one password per line"""
+        return cls(_read_lines(path))
+
+    def count(self, password):
+        key = password.lower().encode("utf-8", "surrogatepass")
+        i = bisect.bisect_left(self._entries, key)
+        return 1 if i < len(self._entries) and self._entries[i] == key else 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _read_lines(path):
+    """Yield the non-empty stripped lines of a text file"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+# Binary formats are imported on demand to keep mmap/hashlib out of the
+# package import
+def _sha1_corpus_class():
+    from .hashcorpus import Sha1Corpus
+    return Sha1Corpus
+
+
+def _bloom_corpus_class():
+    from .bloom import BloomCorpus
+    return BloomCorpus
+
+
+# Corpus kinds accepted by load_corpus
+CORPUS_KINDS = {
+    "set": lambda: SetCorpus,
+    "sorted": lambda: SortedCorpus,
+    "sha1": _sha1_corpus_class,
+    "bloom": _bloom_corpus_class,
+}
+
+
+def detect_corpus_kind(path):
+    """Guess the corpus kind of a file from its first bytes"""
+    from .bloom import is_bloom_file
+    from .hashcorpus import is_corpus_file
+    if is_corpus_file(path):
+        return "sha1"
+    if is_bloom_file(path):
+        return "bloom"
+    return "set"
+
+
+def load_corpus(path, kind=None):
+    """Load a corpus file as the given kind ("set", "sorted", "sha1" or "bloom")
+
+    The kind is detected from the file contents when omitted.
+    """
+    if kind is None:
+        kind = detect_corpus_kind(path)
+    try:
+        corpus_class = CORPUS_KINDS[kind]()
+    except KeyError:
+        raise ValueError(f"Unknown corpus kind: {kind!r}") from None
+    return corpus_class.from_file(path)
+
+
+def load_tiered_corpus(paths):
+    """Load a chain of corpus files, each one backing the Bloom filter before it
+
+    ["edge.bloom"] answers from the filter alone, while
+    ["edge.bloom", "corpus.bin"] only consults the exact corpus on positives.
+    """
+    corpus = None
+    for path in reversed(paths):
+        kind = detect_corpus_kind(path)
+        if kind == "bloom":
+            corpus = _bloom_corpus_class().from_file(path, exact=corpus)
+        elif corpus is not None:
+            raise ValueError(f"Only a Bloom filter can be placed in front of another corpus: {path}")
+        else:
+            corpus = load_corpus(path, kind)
+    return corpus
+
+
+_active_corpus = None
+
+
+def get_corpus():
+    """Get the active corpus, loading it on first use
+
+    Uses the files named by $PASSWORD_ANALYZER_CORPUS when set, otherwise the
+    bundled common passwords list. The variable holds a text list, a SHA-1
+    corpus built by password_analyzer.hashcorpus, or a Bloom filter built by
+    password_analyzer.bloom optionally followed by the exact corpus it fronts
+    (separated by os.pathsep, e.g. "edge.bloom:corpus.bin").
+    """
+    global _active_corpus
+    if _active_corpus is None:
+        paths = os.environ.get(CORPUS_ENV)
+        if paths:
+            _active_corpus = load_tiered_corpus(paths.split(os.pathsep))
+        else:
+            _active_corpus = SetCorpus(common_passwords())
+    return _active_corpus
+
+
+def set_corpus(corpus):
+    """Replace the active corpus (None restores the default on next use)"""
+    global _active_corpus
+    _active_corpus = corpus
+
+
+def breach_count(password):
+    """Get how often the password appears in the active corpus
+
+    Accepts a password or its PasswordProfile.
+    """
+    return get_corpus().count_profile(get_profile(password))
+
+
+def is_breached(password):
+    """Check if the password is in the active corpus"""
+    return breach_count(password) > 0
@@ -0,0 +1,312 @@
+# Result cache for repeated analyses
+#
+# The same passwords come back again and again: client retries, form
+# re-validation, and Streamlit rerunning the whole script on every widget
+# interaction.  Results are cached under an HMAC-SHA256 fingerprint of the
+# password, so the cache never holds plaintext (AnalysisResult does not
+# either).  Without the key, a fingerprint cannot be tested against a
+# dictionary.
+#
+# MemoryResultCache is a per-process LRU.  SqliteResultCache keeps entries in
+# a SQLite file that every worker process on the host shares (put it on
+# /dev/shm to keep it in shared memory).  Both bound the entry count and
+# expire entries after a TTL, so a refreshed breach corpus is picked up.
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .scoring import AnalysisResult, analyze
+
+CACHE_ENV = "PASSWORD_ANALYZER_CACHE"
+CACHE_KEY_ENV = "PASSWORD_ANALYZER_CACHE_KEY"
+# Directory of the SQLite caches' key files (default: ~/.local/state/password-analyzer).
+# Never next to a database: whoever can read both can test fingerprints offline
+KEY_DIR_ENV = "PASSWORD_ANALYZER_KEY_DIR"
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL = 3600
+
+
+def fingerprint(key, password):
+    """Get the HMAC-SHA256 digest a password is cached under"""
+    return hmac.new(key, password.encode("utf-8", "surrogatepass"), hashlib.sha256).digest()
+
+
+def _env_key():
+    """Get the cache key from $PASSWORD_ANALYZER_CACHE_KEY (hex), if set"""
+    value = os.environ.get(CACHE_KEY_ENV)
+    return bytes.fromhex(value) if value else None
+
+
+def key_path(database):
+    """Get the key file of a SQLite cache, in the private key directory"""
+    directory = os.environ.get(KEY_DIR_ENV)
+    if not directory:
+        state = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+        directory = os.path.join(state, "password-analyzer")
+    name = hashlib.sha256(os.fsencode(os.path.realpath(database))).hexdigest()[:32]
+    return os.path.join(directory, f"cache-{name}.key")
+
+
+class ResultCache:
+    """Bounded LRU/TTL cache of analysis results, keyed by HMAC fingerprint
+
+    Subclasses store the entries; lookups, counters and the cached analyze
+    live here.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, key=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.key = key or _env_key() or os.urandom(32)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _load(self, digest, now):
+        """Get the result stored under digest, or None if missing or expired"""
+        raise NotImplementedError
+
+    def _store(self, digest, result, expires):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def get(self, password):
+        """Get the cached result for a password, or None"""
+        result = self._load(fingerprint(self.key, password), time.time())
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, password, result):
+        expires = time.time() + self.ttl if self.ttl else None
+        self._store(fingerprint(self.key, password), result, expires)
+
+    def analyze(self, password):
+        """Analyze a password, reusing a cached result when there is one"""
+        result = self.get(password)
+        if result is None:
+            result = analyze(password)
+            self.put(password, result)
+        return result
+
+    def analyze_many(self, passwords):
+        return [self.analyze(password) for password in passwords]
+
+    def stats(self):
+        """Get the hit/miss/eviction counters of this process"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(entries={len(self)}, max_entries={self.max_entries}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+
+class MemoryResultCache(ResultCache):
+    """Per-process LRU of results"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, key=None):
+        super().__init__(max_entries, ttl, key)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, digest, now):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            result, expires = entry
+            if expires is not None and expires <= now:
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return result
+
+    def _store(self, digest, result, expires):
+        with self._lock:
+            self._entries[digest] = (result, expires)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SqliteResultCache(ResultCache):
+    """Results in a SQLite file shared by every process that opens it
+
+    Processes must agree on the HMAC key: it comes from the key argument,
+    $PASSWORD_ANALYZER_CACHE_KEY, or a key file named after the database in
+    a private directory (see key_path; 0700, the file 0600). Store errors
+    are ignored and lookup errors count as misses, so a busy or broken
+    cache never fails an analysis.
+    """
+
+    # Trim expired and least recently used entries every this many stores
+    PRUNE_INTERVAL = 64
+    # Seconds between recency updates of a hot entry
+    TOUCH_INTERVAL = 10
+
+    def __init__(self, path, max_entries=65536, ttl=DEFAULT_TTL, key=None):
+        import json
+        import sqlite3
+
+        super().__init__(max_entries, ttl, key or _env_key() or self._key_file(key_path(path)))
+        self.path = path
+        self._errors = sqlite3.Error
+        self._json = json
+        self._lock = threading.Lock()
+        self._stores = 0
+        self._db = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "digest BLOB PRIMARY KEY, result TEXT NOT NULL, expires REAL, used REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+
+    @staticmethod
+    def _key_file(path):
+        """Read the shared key file, creating it on first use"""
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        key = os.urandom(32)
+        temp = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        try:
+            # link() fails if another process got there first: use its key
+            os.link(temp, path)
+        except FileExistsError:
+            with open(path, "rb") as f:
+                key = f.read()
+        finally:
+            os.unlink(temp)
+        return key
+
+    def _load(self, digest, now):
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT result, used FROM results WHERE digest = ? AND (expires IS NULL OR expires > ?)",
+                    (digest, now)).fetchone()
+                if row is None:
+                    return None
+                # Refreshing recency is a write: do it at most once per interval
+                if now - row[1] > self.TOUCH_INTERVAL:
+                    self._db.execute("UPDATE results SET used = ? WHERE digest = ?", (now, digest))
+        except self._errors:
+            return None
+        try:
+            return AnalysisResult(**self._json.loads(row[0]))
+        except (KeyError, TypeError, ValueError):
+            return None  # written by a version with other result fields
+
+    def _store(self, digest, result, expires):
+        data = self._json.dumps(result.to_dict())
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (digest, result, expires, used) VALUES (?, ?, ?, ?)",
+                    (digest, data, expires, time.time()))
+                self._stores += 1
+                if self._stores % self.PRUNE_INTERVAL == 0:
+                    self._prune()
+        except self._errors:
+            pass
+
+    def _prune(self):
+        now = time.time()
+        removed = self._db.execute(
+            "DELETE FROM results WHERE expires IS NOT NULL AND expires <= ?", (now,)).rowcount
+        removed += self._db.execute(
+            "DELETE FROM results WHERE digest IN (SELECT digest FROM results ORDER BY used DESC "
+            "LIMIT -1 OFFSET ?)", (self.max_entries,)).rowcount
+        self.evictions += removed
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+
+_active_cache = None
+_cache_loaded = False
+
+
+def get_cache():
+    """Get the active result cache, creating it on first use
+
+    $PASSWORD_ANALYZER_CACHE names a SQLite file to share between processes,
+    or "off" to disable caching; otherwise results are cached in memory.
+    Returns None when caching is disabled.
+    """
+    global _active_cache, _cache_loaded
+    if not _cache_loaded:
+        setting = os.environ.get(CACHE_ENV)
+        if setting == "off":
+            _active_cache = None
+        elif setting:
+            _active_cache = SqliteResultCache(setting)
+        else:
+            _active_cache = MemoryResultCache()
+        _cache_loaded = True
+    return _active_cache
+
+
+def set_cache(cache):
+    """Replace the active result cache (None disables caching)"""
+    global _active_cache, _cache_loaded
+    _active_cache = cache
+    _cache_loaded = True
+
+
+def cached_analyze(password):
+    """Analyze a password through the active result cache"""
+    cache = get_cache()
+    if cache is None:
+        return analyze(password)
+    return cache.analyze(password)
+
+
+def cached_analyze_many(passwords):
+    """Analyze every password of an iterable through the active cache, in order"""
+    cache = get_cache()
+    if cache is None:
+        return [analyze(password) for password in passwords]
+    return cache.analyze_many(passwords)
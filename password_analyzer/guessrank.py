@@ -0,0 +1,159 @@
+# Monte Carlo guess ranks for the probabilistic models
+#
+# A model gives the probability p of a password, but a cracker's guess
+# number is the count of passwords it tries first: those more likely than p.
+# Sampling n passwords from the model once estimates that count as
+#
+#   rank(p) = sum over samples with p_i > p of 1 / (n * p_i)
+#
+# (Dell'Amico and Filippone, "Monte Carlo Strength Evaluation", CCS 2015).
+# The samples' -log2 p_i are stored sorted, alongside the log2 of the
+# running rank, so a lookup is a single bisect on the memory-mapped arrays:
+#
+#   header      MAGIC (8 bytes) + sample count n (uint64)
+#   bits        n x float64, -log2 p_i ascending
+#   cumulative  (n + 1) x float64, log2 rank of a password just less likely
+#               than the first k samples
+#
+# Rank files are written next to the model they belong to (model.bin.ranks)
+# by the trainers, or afterwards with:
+#
+#   python -m password_analyzer.guessrank model.bin --samples 100000
+import argparse
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+
+MAGIC = b"PWRANK01"
+HEADER = struct.Struct("<8sQ")
+RANKS_SUFFIX = ".ranks"
+DEFAULT_SAMPLES = 100000
+
+
+class GuessRankTable:
+    """Sorted sample probabilities and cumulative ranks of one model"""
+
+    def __init__(self, data):
+        if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a guess rank file")
+        count = HEADER.unpack_from(data, 0)[1]
+        if len(data) != HEADER.size + (2 * count + 1) * 8:
+            raise ValueError("Truncated guess rank file")
+        self.data = data
+        self.samples = count
+        values = memoryview(data)[HEADER.size:].cast("d")
+        self.bits = values[:count]
+        self.cumulative = values[count:]
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a rank file"""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(data)
+        except ValueError:
+            data.close()
+            raise ValueError(f"{path} is not a guess rank file") from None
+
+    def guesses_log2(self, bits):
+        """Get the log2 guess number of a password with probability 2**-bits
+
+        Passwords less likely than every sample are beyond what the samples
+        can tell apart; they keep their 1/p estimate (at least the total).
+        """
+        index = bisect_left(self.bits, bits)
+        if index == self.samples:
+            return max(self.cumulative[index], bits)
+        return max(self.cumulative[index], 0.0)
+
+    def batch_guesses_log2(self, bits):
+        """guesses_log2 over a NumPy array of -log2 probabilities"""
+        import numpy as np
+
+        sorted_bits = np.frombuffer(self.data, dtype="<f8", count=self.samples, offset=HEADER.size)
+        cumulative = np.frombuffer(self.data, dtype="<f8", count=self.samples + 1,
+                                   offset=HEADER.size + self.samples * 8)
+        index = np.searchsorted(sorted_bits, bits, side="left")
+        ranks = cumulative[index]
+        return np.where(index == self.samples, np.maximum(ranks, bits), np.maximum(ranks, 0.0))
+
+    def close(self):
+        self.bits.release()
+        self.cumulative.release()
+        self.data.close()
+
+    def __repr__(self):
+        return f"GuessRankTable(samples={self.samples})"
+
+
+def build(sample_bits):
+    """Get the (sorted bits, log2 cumulative ranks) arrays of sampled -log2 probabilities"""
+    import numpy as np
+
+    bits = np.sort(np.asarray(sample_bits, dtype=np.float64))
+    # Each sample stands for 1 / (n * p_i) passwords: log2 of it is bits - log2 n
+    weights = bits - np.log2(len(bits))
+    cumulative = np.empty(len(bits) + 1, dtype=np.float64)
+    cumulative[0] = -np.inf
+    cumulative[1:] = np.logaddexp2.accumulate(weights)
+    return bits, cumulative
+
+
+def save(path, bits, cumulative):
+    """Write a rank file (replaced atomically: it may be mapped by running processes)"""
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(bits)))
+        f.write(bits.astype("<f8").tobytes())
+        f.write(cumulative.astype("<f8").tobytes())
+    os.replace(temporary, path)
+
+
+def build_for_model(model, path, samples=DEFAULT_SAMPLES, seed=None):
+    """Sample a model, write its rank file and attach the table to it"""
+    bits, cumulative = build(model.sample_bits(samples, seed))
+    save(path, bits, cumulative)
+    model.ranks = GuessRankTable.load(path)
+    return model.ranks
+
+
+def load_ranks(model_path):
+    """Load the rank file next to a model file, or None when there is none"""
+    path = model_path + RANKS_SUFFIX
+    if not os.path.exists(path):
+        return None
+    return GuessRankTable.load(path)
+
+
+def discard_ranks(model_path):
+    """Remove the rank file next to a model file, if any"""
+    try:
+        os.remove(model_path + RANKS_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def main(argv=None):
+    from .markov import MarkovModel, is_model_file
+    from .pcfg import PcfgModel
+
+    parser = argparse.ArgumentParser(
+        description="Sample a Markov model or PCFG grammar and write its guess rank file")
+    parser.add_argument("model", help="model file (the ranks are written to MODEL.ranks)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES,
+                        help=f"passwords sampled from the model (default: {DEFAULT_SAMPLES})")
+    parser.add_argument("--seed", type=int, help="random seed, for reproducible tables")
+    args = parser.parse_args(argv)
+
+    model_class = MarkovModel if is_model_file(args.model) else PcfgModel
+    model = model_class.load(args.model)
+    ranks = build_for_model(model, args.model + RANKS_SUFFIX, args.samples, args.seed)
+    print(f"Wrote {ranks.samples:,} samples to {args.model + RANKS_SUFFIX}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
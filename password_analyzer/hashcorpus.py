@@ -0,0 +1,233 @@
+# Memory-mapped SHA-1 breach corpus (Pwned Passwords style)
+#
+# File layout, all integers little-endian:
+#
+#   header   MAGIC (8 bytes) + record count (uint64)
+#   index    65537 x uint64 - first record of every 2-byte hash prefix bucket,
+#            the last entry being the record count
+#   records  count x (20-byte SHA-1 digest + uint32 prevalence), sorted
+#
+# A lookup reads two index entries and binary-searches one bucket, so it only
+# touches a couple of pages of a file that can hold hundreds of millions of
+# hashes.  Build one with:
+#
+#   python -m password_analyzer.hashcorpus pwned-passwords-sha1.txt corpus.bin
+import argparse
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from .breach import BreachCorpus
+
+MAGIC = b"PWSHA1\x00\x01"
+HEADER = struct.Struct("<8sQ")
+BUCKETS = 1 << 16
+INDEX = struct.Struct(f"<{BUCKETS + 1}Q")
+RECORD = struct.Struct("<20sI")
+DIGEST_SIZE = 20
+DATA_OFFSET = HEADER.size + INDEX.size
+MAX_COUNT = 0xFFFFFFFF
+
+
+def password_digest(password):
+    """Get the SHA-1 digest of a password, as stored in the corpus"""
+    return hashlib.sha1(password.encode("utf-8", "surrogatepass")).digest()
+
+
+class Sha1Corpus(BreachCorpus):
+    """Exact, case-sensitive corpus backed by a memory-mapped hash file"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < DATA_OFFSET or self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a SHA-1 corpus file")
+        self._count = HEADER.unpack_from(self._map, 0)[1]
+        self.path = path
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(path)
+
+    def bucket_bounds(self, bucket):
+        """Get the (first, end) record numbers of a 2-byte prefix bucket"""
+        offset = HEADER.size + bucket * 8
+        return struct.unpack_from("<2Q", self._map, offset)
+
+    def record(self, i):
+        """Get the (digest, count) pair of record number i"""
+        return RECORD.unpack_from(self._map, DATA_OFFSET + i * RECORD.size)
+
+    def lookup_digest(self, digest):
+        """Get the prevalence count of a raw SHA-1 digest (0 if absent)"""
+        lo, hi = self.bucket_bounds(digest[0] << 8 | digest[1])
+        data = self._map
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = DATA_OFFSET + mid * RECORD.size
+            candidate = data[start:start + DIGEST_SIZE]
+            if candidate < digest:
+                lo = mid + 1
+            elif candidate > digest:
+                hi = mid
+            else:
+                return RECORD.unpack_from(data, start)[1]
+        return 0
+
+    def count(self, password):
+        return self.lookup_digest(password_digest(password))
+
+    def hash_range(self, prefix):
+        """Yield (suffix, count) for every hash starting with a 5-hex-digit prefix
+
+        This is the k-anonymity range query: suffixes are the remaining 35
+        uppercase hex digits.
+        """
+        if len(prefix) != 5:
+            raise ValueError("Range prefix must be 5 hex digits")
+        head = bytes.fromhex(prefix[:4])
+        nibble = int(prefix[4], 16)
+        low = head + bytes([nibble << 4])
+
+        # Binary search for the first record >= low inside the 2-byte bucket
+        lo, hi = self.bucket_bounds(head[0] << 8 | head[1])
+        data = self._map
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = DATA_OFFSET + mid * RECORD.size
+            if data[start:start + 3] < low:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        end = self.bucket_bounds(head[0] << 8 | head[1])[1]
+        for i in range(lo, end):
+            digest, count = self.record(i)
+            if digest[2] >> 4 != nibble:
+                break
+            yield digest.hex().upper()[5:], count
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        self._map.close()
+
+
+def format_range(records):
+    """Format hash_range() results as a "SUFFIX:COUNT" CRLF-separated body"""
+    return "\r\n".join(f"{suffix}:{count}" for suffix, count in records).encode("ascii")
+
+
+def parse_line(line):
+    """Parse a "HASH:COUNT" (or bare "HASH") text line into a record"""
+    hex_digest, _, count = line.strip().partition(b":")
+    digest = bytes.fromhex(hex_digest.decode("ascii"))
+    if len(digest) != DIGEST_SIZE:
+        raise ValueError(f"Not a SHA-1 hash: {hex_digest!r}")
+    return digest, min(int(count or 1), MAX_COUNT)
+
+
+def _write_run(records, directory):
+    """Sort records and spill them to a temporary run file"""
+    records.sort()
+    run = tempfile.TemporaryFile(dir=directory)
+    for digest, count in records:
+        run.write(RECORD.pack(digest, count))
+    run.seek(0)
+    return run
+
+
+def _read_run(run):
+    """Yield the records of a run file"""
+    while True:
+        chunk = run.read(RECORD.size * 4096)
+        if not chunk:
+            return
+        yield from RECORD.iter_unpack(chunk)
+
+
+def build_corpus(source, output, chunk_records=5_000_000, temp_dir=None):
+    """Convert a hash:count text dump into a sorted, indexed corpus file
+
+    The dump does not need to be sorted: it is split into sorted runs of
+    chunk_records entries that are merged on the way out, so memory stays
+    bounded. Duplicate hashes have their counts added up. Returns the
+    number of records written.
+    """
+    runs = []
+    records = []
+    with open(source, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            records.append(parse_line(line))
+            if len(records) >= chunk_records:
+                runs.append(_write_run(records, temp_dir))
+                records = []
+    runs.append(_write_run(records, temp_dir))
+
+    bucket_sizes = [0] * BUCKETS
+    written = 0
+    with open(output, "wb") as out:
+        out.write(b"\x00" * DATA_OFFSET)
+
+        def flush(digest, count):
+            out.write(RECORD.pack(digest, min(count, MAX_COUNT)))
+            bucket_sizes[digest[0] << 8 | digest[1]] += 1
+
+        previous, total = None, 0
+        for digest, count in heapq.merge(*(_read_run(run) for run in runs)):
+            if digest == previous:
+                total += count
+                continue
+            if previous is not None:
+                flush(previous, total)
+                written += 1
+            previous, total = digest, count
+        if previous is not None:
+            flush(previous, total)
+            written += 1
+
+        # Bucket start offsets, then the header
+        index = [0] * (BUCKETS + 1)
+        for bucket, size in enumerate(bucket_sizes):
+            index[bucket + 1] = index[bucket] + size
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, written))
+        out.write(INDEX.pack(*index))
+
+    for run in runs:
+        run.close()
+    return written
+
+
+def is_corpus_file(path):
+    """Check if a file starts with the SHA-1 corpus magic"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build a memory-mapped SHA-1 breach corpus from a HASH:COUNT text dump")
+    parser.add_argument("source", help="text dump, one HASH[:COUNT] per line")
+    parser.add_argument("output", help="corpus file to write")
+    parser.add_argument("--chunk-records", type=int, default=5_000_000,
+                        help="records sorted in memory at a time (default: 5000000)")
+    parser.add_argument("--temp-dir", help="directory for sorted runs (default: system temp)")
+    args = parser.parse_args(argv)
+
+    written = build_corpus(args.source, args.output, args.chunk_records, args.temp_dir)
+    size = os.path.getsize(args.output)
+    print(f"Wrote {written:,} hashes to {args.output} ({size / 2 ** 20:.1f} MiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
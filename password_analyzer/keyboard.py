@@ -0,0 +1,170 @@
+# Keyboard-walk detection over precomputed adjacency tables
+#
+# "qwertyuiop", "1qaz2wsx" and "zxcvbnm" are walks over neighbouring keys.
+# Each layout below is compiled once, at import, into compact integer tables:
+#
+#   codes       char -> key index * 2 + 1 if the char is the key's shifted one
+#   directions  bytearray of keys * keys; entry [a * keys + b] is 1 + the
+#               direction from key a to neighbouring key b, or 0
+#
+# so checking whether two characters are adjacent (and in which direction) is
+# one dict probe and one byte lookup, and walks, turns and shifted keys are
+# all found in a single linear scan of the password per layout.
+import math
+from array import array
+
+# One token per key: unshifted then shifted character. Rows are offset by
+# one character each, like the physical (staggered) keyboard.
+QWERTY = r"""
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+
+    qQ wW eE rR tT yY uU iI oO pP [{ ]} \|
+     aA sS dD fF gG hH jJ kK lL ;: '"
+      zZ xX cC vV bB nN mM ,< .> /?
+"""
+
+AZERTY = r"""
+²~ &1 é2 "3 '4 (5 -6 è7 _8 ç9 à0 )° =+
+    aA zZ eE rR tT yY uU iI oO pP ^¨ $£
+     qQ sS dD fF gG hH jJ kK lL mM ù% *µ
+      wW xX cC vV bB nN ,? ;. :/ !§
+"""
+
+QWERTZ = r"""
+^° 1! 2" 3§ 4$ 5% 6& 7/ 8( 9) 0= ß? ´`
+    qQ wW eE rR tT zZ uU iI oO pP üÜ +*
+     aA sS dD fF gG hH jJ kK lL öÖ äÄ #'
+      yY xX cC vV bB nN mM ,; .: -_
+"""
+
+DVORAK = r"""
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) [{ ]}
+    '" ,< .> pP yY fF gG cC rR lL /? =+ \|
+     aA oO eE uU iI dD hH tT nN sS -_
+      ;: qQ jJ kK xX bB mM wW vV zZ
+"""
+
+# Keypad keys are aligned, not staggered
+KEYPAD = r"""
+  / * -
+7 8 9 +
+4 5 6
+1 2 3
+  0 .
+"""
+
+MIN_WALK_LENGTH = 3
+
+
+def _slanted_neighbours(x, y):
+    return ((x - 1, y), (x, y - 1), (x + 1, y - 1), (x + 1, y), (x, y + 1), (x - 1, y + 1))
+
+
+def _aligned_neighbours(x, y):
+    return ((x - 1, y), (x - 1, y - 1), (x, y - 1), (x + 1, y - 1),
+            (x + 1, y), (x + 1, y + 1), (x, y + 1), (x - 1, y + 1))
+
+
+class Layout:
+    """Adjacency tables of one keyboard layout"""
+
+    __slots__ = ("name", "keys", "codes", "directions", "starts", "degree")
+
+    def __init__(self, name, layout, slanted):
+        positions = {}
+        x_unit = len(layout.split()[0]) + 1
+        for y, line in enumerate(layout.split("\n")):
+            slant = y - 1 if slanted else 0
+            for token in line.split():
+                positions[((line.index(token) - slant) // x_unit, y)] = token
+
+        index = {coord: i for i, coord in enumerate(positions)}
+        keys = len(index)
+        codes = {}
+        for coord, token in positions.items():
+            for shifted, char in enumerate(token):
+                codes[char] = index[coord] * 2 + shifted
+
+        neighbours = _slanted_neighbours if slanted else _aligned_neighbours
+        directions = bytearray(keys * keys)
+        degrees = array("B", bytes(keys))
+        for coord, key in index.items():
+            for direction, adjacent in enumerate(neighbours(*coord), 1):
+                other = index.get(adjacent)
+                if other is not None:
+                    directions[key * keys + other] = direction
+                    degrees[key] += 1
+
+        self.name = name
+        self.keys = keys
+        self.codes = codes
+        self.directions = directions
+        # Guess model: any character can start a walk, then each step picks
+        # one of the (average number of) neighbouring keys
+        self.starts = len(codes)
+        self.degree = sum(degrees[code >> 1] for code in codes.values()) / len(codes)
+
+    def walks(self, password, min_length=MIN_WALK_LENGTH):
+        """Yield (i, j, turns, shifted count) for each walk at password[i:j + 1]"""
+        codes, directions, keys = self.codes, self.directions, self.keys
+        start = 0
+        turns = 0
+        last = 0
+        previous = codes.get(password[0], -1) if password else -1
+        shifted = previous & 1 if previous >= 0 else 0
+        for j in range(1, len(password)):
+            code = codes.get(password[j], -1)
+            direction = directions[(previous >> 1) * keys + (code >> 1)] \
+                if previous >= 0 and code >= 0 else 0
+            if direction:
+                if direction != last:
+                    turns += 1
+                    last = direction
+                shifted += code & 1
+            else:
+                if j - start >= min_length:
+                    yield start, j - 1, turns, shifted
+                start = j
+                turns = 0
+                last = 0
+                shifted = code & 1 if code >= 0 else 0
+            previous = code
+        if len(password) - start >= min_length:
+            yield start, len(password) - 1, turns, shifted
+
+    def guesses_log2(self, length, turns, shifted):
+        """log2 of the guesses needed to hit a walk of this shape"""
+        starts, degree = self.starts, self.degree
+        guesses = 0
+        for i in range(2, length + 1):
+            for j in range(1, min(turns, i - 1) + 1):
+                guesses += math.comb(i - 1, j - 1) * starts * degree ** j
+        guesses_log2 = math.log2(guesses)
+        if shifted:
+            unshifted = length - shifted
+            if unshifted == 0:
+                guesses_log2 += 1
+            else:
+                guesses_log2 += math.log2(sum(math.comb(length, i)
+                                              for i in range(1, min(shifted, unshifted) + 1)))
+        return guesses_log2
+
+    def __repr__(self):
+        return f"Layout({self.name!r}, keys={self.keys}, degree={self.degree:.2f})"
+
+
+LAYOUTS = {
+    "qwerty": Layout("qwerty", QWERTY, True),
+    "azerty": Layout("azerty", AZERTY, True),
+    "qwertz": Layout("qwertz", QWERTZ, True),
+    "dvorak": Layout("dvorak", DVORAK, True),
+    "keypad": Layout("keypad", KEYPAD, False),
+}
+
+
+def find_walks(password, min_length=MIN_WALK_LENGTH):
+    """Find keyboard walks on every layout, as (layout, i, j, turns, shifted count)"""
+    found = []
+    for name, layout in LAYOUTS.items():
+        for i, j, turns, shifted in layout.walks(password, min_length):
+            found.append((name, i, j, turns, shifted))
+    return found
@@ -0,0 +1,130 @@
+# L33t-normalized dictionary index
+#
+# "P@ssw0rd" is "password" with two substitutions, but trying every way of
+# reading the symbols back as letters is exponential in the number of
+# symbols.  Instead, every character is mapped to a canonical representative
+# of its l33t class ("@" and "4" to "a", "0" to "o"...) and each dictionary
+# word is stored under its canonical form.  Symbols that stand for several
+# letters ("1" for i or l, "7" for l or t) put those letters in one class, so
+# a canonical key can have a few candidate words; each candidate is verified
+# character by character.  A lookup costs one normalization (str.translate)
+# and one hash probe, and substring search runs the canonical password once
+# through an Aho-Corasick automaton over the canonical words.
+from .automaton import Automaton
+
+# Characters each l33t symbol may stand for
+L33T_TABLE = {
+    "a": "4@", "b": "8", "c": "({[<", "e": "3", "g": "69", "i": "1!|",
+    "l": "1|7", "o": "0", "s": "$5", "t": "+7", "x": "%", "z": "2",
+}
+
+
+def _build_classes(table):
+    """Get {char: canonical letter} for every letter and symbol of the table"""
+    parent = {}
+
+    def find(c):
+        while parent.setdefault(c, c) != c:
+            c = parent[c]
+        return c
+
+    for letter, symbols in table.items():
+        for symbol in symbols:
+            a, b = find(letter), find(symbol)
+            if a != b:
+                # Keep a letter (the smallest) as the representative
+                if b.isalpha() and (not a.isalpha() or b < a):
+                    a, b = b, a
+                parent[b] = a
+    return {c: find(c) for c in list(parent)}
+
+
+CANONICAL = _build_classes(L33T_TABLE)
+CANONICAL_TABLE = str.maketrans({c: rep for c, rep in CANONICAL.items() if c != rep})
+
+# Letters each symbol may stand for
+SYMBOL_LETTERS = {}
+for _letter, _symbols in L33T_TABLE.items():
+    for _symbol in _symbols:
+        SYMBOL_LETTERS.setdefault(_symbol, set()).add(_letter)
+del _letter, _symbols, _symbol
+
+
+def canonical(text):
+    """Map every character of (lowercase) text to its l33t class representative"""
+    return text.translate(CANONICAL_TABLE)
+
+
+def unleet(word, token):
+    """Get the {symbol: letter} substitutions spelling word as token, or None
+
+    token is lowercase and has the same canonical form as word. Each symbol
+    has to stand for a single letter throughout, and at least one must be used.
+    """
+    subs = {}
+    for letter, c in zip(word, token):
+        if c == letter:
+            continue
+        if letter not in SYMBOL_LETTERS.get(c, ()) or subs.setdefault(c, letter) != letter:
+            return None
+    return subs or None
+
+
+class LeetIndex:
+    """Dictionary words indexed by their canonical l33t form"""
+
+    def __init__(self, lists):
+        # canonical form -> [(word, dictionary, rank)]
+        self.candidates = {}
+        for name, words in lists.items():
+            for rank, word in enumerate(words, 1):
+                word = word.lower()
+                self.candidates.setdefault(canonical(word), []).append((word, name, rank))
+        self._keys = list(self.candidates)
+        self._automaton = None
+
+    def lookup(self, password, dictionary=None):
+        """Get the best (word, dictionary, rank, subs) spelled by the whole password in l33t"""
+        lowered = password.lower()
+        best = None
+        for word, name, rank in self.candidates.get(canonical(lowered), ()):
+            if dictionary is not None and name != dictionary:
+                continue
+            if best is not None and rank >= best[2]:
+                continue
+            subs = unleet(word, lowered)
+            if subs:
+                best = (word, name, rank, subs)
+        return best
+
+    def search(self, lowered):
+        """Yield (i, j, word, dictionary, rank, subs) for each l33t word at lowered[i:j + 1]
+
+        Only the best ranked word of each dictionary is reported for a span.
+        """
+        if self._automaton is None:
+            automaton = Automaton()
+            for key_id, key in enumerate(self._keys):
+                automaton.add(key, "", key_id)
+            self._automaton = automaton.build()
+
+        keys, candidates = self._keys, self.candidates
+        for i, j, _, key_id in self._automaton.search(canonical(lowered)):
+            if i == j:
+                continue
+            token = lowered[i:j + 1]
+            best = {}
+            for word, name, rank in candidates[keys[key_id]]:
+                if name in best and best[name][1] <= rank:
+                    continue
+                subs = unleet(word, token)
+                if subs:
+                    best[name] = (word, rank, subs)
+            for name, (word, rank, subs) in best.items():
+                yield i, j, word, name, rank, subs
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def __repr__(self):
+        return f"LeetIndex(keys={len(self.candidates)})"
@@ -0,0 +1,302 @@
+# Character n-gram (Markov) guess estimator
+#
+# A model trained on leaked passwords gives the probability of a password
+# character by character; -log2 of it approximates the guesses a Markov
+# cracker needs, which is a much better strength figure than uniform pool
+# math.  Train a model offline:
+#
+#   python -m password_analyzer.markov leaked.txt model.bin --order 4
+#
+# and point $PASSWORD_ANALYZER_MARKOV at it.  The file is the header below
+# followed by one flat float32 array of smoothed log2 probabilities, indexed
+# by (context, next symbol).  It is memory-mapped, so loading costs nothing
+# and every process shares the same pages; the scalar path reads it through
+# a memoryview and the NumPy path wraps it without copying.
+#
+# Sampling the model once at build time also writes a guess rank table
+# (model.bin.ranks, see guessrank.py) turning probabilities into guess numbers.
+#
+# Symbols: 0 marks the start and end of a password, 1-95 are printable ASCII,
+# 96 is anything else.  Contexts fold case and specials (39 classes), which
+# keeps a 4-gram table at 39**3 * 97 floats (22 MiB).
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from .guessrank import DEFAULT_SAMPLES, RANKS_SUFFIX, build_for_model, discard_ranks, load_ranks
+
+MAGIC = b"PWMARKV1"
+HEADER = struct.Struct("<8sIIIf8x")  # magic, order, symbols, context classes, smoothing
+
+BOUNDARY = 0
+OTHER = 96
+SYMBOLS = 97
+CONTEXT_CLASSES = 39
+
+MARKOV_ENV = "PASSWORD_ANALYZER_MARKOV"
+
+# Sampled passwords still going after this many symbols are cut short
+MAX_SAMPLE_LENGTH = 128
+SAMPLE_CHUNK = 8192
+
+
+def symbol(c):
+    """Get the symbol of one character"""
+    code = ord(c)
+    return code - 31 if 32 <= code <= 126 else OTHER
+
+
+def _context_class(sym):
+    """Fold a symbol for use as context: letters by letter, digits by digit, the rest by kind"""
+    if sym == BOUNDARY:
+        return 0
+    if sym == OTHER:
+        return 38
+    c = chr(sym + 31)
+    if c.isalpha():
+        return ord(c.lower()) - ord("a") + 1
+    if c.isdigit():
+        return ord(c) - ord("0") + 27
+    return 37
+
+
+CONTEXT_OF = [_context_class(sym) for sym in range(SYMBOLS)]
+
+
+class MarkovModel:
+    """Memory-mapped n-gram table"""
+
+    def __init__(self, data, order, smoothing):
+        self.data = data
+        self.order = order
+        self.smoothing = smoothing
+        self.table = memoryview(data)[HEADER.size:].cast("f")
+        # Multiplier that drops the oldest context class when sliding
+        self._context_size = CONTEXT_CLASSES ** (order - 2)
+        # GuessRankTable turning -log2 P into a guess number (None: use -log2 P)
+        self.ranks = None
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a model file"""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+            data.close()
+            raise ValueError(f"{path} is not a Markov model file")
+        _, order, symbols, classes, smoothing = HEADER.unpack_from(data, 0)
+        if symbols != SYMBOLS or classes != CONTEXT_CLASSES or order not in (2, 3, 4) \
+                or len(data) != HEADER.size + 4 * classes ** (order - 1) * symbols:
+            data.close()
+            raise ValueError(f"{path} is not a Markov model file")
+        model = cls(data, order, smoothing)
+        model.ranks = load_ranks(path)
+        return model
+
+    def log2_probability(self, password):
+        """Sum of the log2 probabilities of each symbol, and of the end marker"""
+        table, context_size = self.table, self._context_size
+        context = 0
+        total = 0.0
+        for c in password:
+            sym = symbol(c)
+            total += table[context * SYMBOLS + sym]
+            context = (context % context_size) * CONTEXT_CLASSES + CONTEXT_OF[sym]
+        return total + table[context * SYMBOLS + BOUNDARY]
+
+    def guesses_log2(self, password):
+        """Estimated guesses (log2) for a cracker enumerating by model probability"""
+        bits = -self.log2_probability(password)
+        return self.ranks.guesses_log2(bits) if self.ranks is not None else bits
+
+    def entropy(self, password):
+        """Guesses as bits, comparable with calculate_entropy"""
+        return round(self.guesses_log2(password), 2)
+
+    def batch_guesses_log2(self, passwords):
+        """guesses_log2 for a batch, as a NumPy array (same values as the scalar path)"""
+        import numpy as np
+
+        table = np.frombuffer(self.data, dtype="<f4", offset=HEADER.size)
+        symbols, lengths = encode_batch(passwords)
+        context_of = np.array(CONTEXT_OF, dtype=np.int64)
+        context = np.zeros(len(passwords), dtype=np.int64)
+        total = np.zeros(len(passwords), dtype=np.float64)
+        # Column by column, in the same order as the scalar sum, so the
+        # float64 results are identical
+        for t in range(symbols.shape[1]):
+            column = symbols[:, t]
+            active = t <= lengths
+            total += np.where(active, table[context * SYMBOLS + column].astype(np.float64), 0.0)
+            context = (context % self._context_size) * CONTEXT_CLASSES + context_of[column]
+        return self.ranks.batch_guesses_log2(-total) if self.ranks is not None else -total
+
+    def sample_bits(self, count, seed=None):
+        """Draw count passwords from the model and get their -log2 probabilities"""
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        rows = np.frombuffer(self.data, dtype="<f4", offset=HEADER.size).reshape(-1, SYMBOLS)
+        context_of = np.array(CONTEXT_OF, dtype=np.int64)
+        bits = np.empty(count, dtype=np.float64)
+        for start in range(0, count, SAMPLE_CHUNK):
+            size = min(SAMPLE_CHUNK, count - start)
+            context = np.zeros(size, dtype=np.int64)
+            total = np.zeros(size, dtype=np.float64)
+            live = np.arange(size)
+            for _ in range(MAX_SAMPLE_LENGTH + 1):
+                if not len(live):
+                    break
+                # Inverse transform sampling of the next symbol of every live sample
+                log2p = rows[context[live]].astype(np.float64)
+                cdf = np.cumsum(np.exp2(log2p), axis=1)
+                u = rng.random(len(live)) * cdf[:, -1]
+                sym = np.minimum((cdf <= u[:, None]).sum(axis=1), SYMBOLS - 1)
+                # Summed in scoring order, so a sample scores exactly its bits
+                total[live] += log2p[np.arange(len(live)), sym]
+                context[live] = (context[live] % self._context_size) * CONTEXT_CLASSES + context_of[sym]
+                live = live[sym != BOUNDARY]
+            bits[start:start + size] = -total
+        return bits
+
+    def close(self):
+        if self.ranks is not None:
+            self.ranks.close()
+        self.table.release()
+        self.data.close()
+
+    def __repr__(self):
+        return f"MarkovModel(order={self.order}, smoothing={self.smoothing})"
+
+
+def encode_batch(passwords):
+    """Get (symbols, lengths): a (n, max_length + 1) symbol array, ended with BOUNDARY"""
+    import numpy as np
+
+    lengths = np.fromiter((len(p) for p in passwords), dtype=np.int64, count=len(passwords))
+    joined = "".join(passwords).encode("utf-32-le", "surrogatepass")
+    codes = np.frombuffer(joined, dtype="<u4")
+    flat = np.where((codes >= 32) & (codes <= 126), codes.astype(np.int64) - 31, OTHER)
+
+    width = int(lengths.max(initial=0)) + 1
+    symbols = np.full((len(passwords), width), BOUNDARY, dtype=np.int64)
+    symbols[np.arange(width) < lengths[:, None]] = flat
+    return symbols, lengths
+
+
+def train(passwords, order=4, smoothing=0.5, chunk_size=100000):
+    """Count n-grams over an iterable of passwords and return the float32 log2 table
+
+    Probabilities are smoothed towards the symbol frequencies:
+    p(s | context) = (count(context, s) + k * A * p(s)) / (count(context) + k * A)
+    with k = smoothing pseudo-counts per symbol, so unseen n-grams keep a
+    probability that follows how common the symbol is.
+    """
+    import numpy as np
+
+    if order not in (2, 3, 4):
+        raise ValueError("order must be 2, 3 or 4")
+    contexts = CONTEXT_CLASSES ** (order - 1)
+    counts = np.zeros(contexts * SYMBOLS, dtype=np.float64)
+    context_of = np.array(CONTEXT_OF, dtype=np.int64)
+    context_size = CONTEXT_CLASSES ** (order - 2)
+
+    chunk = []
+    for password in passwords:
+        chunk.append(password)
+        if len(chunk) == chunk_size:
+            _count_chunk(chunk, counts, context_of, context_size)
+            chunk = []
+    if chunk:
+        _count_chunk(chunk, counts, context_of, context_size)
+
+    counts = counts.reshape(contexts, SYMBOLS)
+    unigram = counts.sum(axis=0) + 1.0
+    unigram /= unigram.sum()
+    prior = smoothing * SYMBOLS
+    probabilities = (counts + prior * unigram) / (counts.sum(axis=1, keepdims=True) + prior)
+    return np.log2(probabilities).astype(np.float32).reshape(-1)
+
+
+def _count_chunk(passwords, counts, context_of, context_size):
+    import numpy as np
+
+    symbols, lengths = encode_batch(passwords)
+    context = np.zeros(len(passwords), dtype=np.int64)
+    for t in range(symbols.shape[1]):
+        column = symbols[:, t]
+        active = t <= lengths
+        counts += np.bincount((context * SYMBOLS + column)[active], minlength=len(counts))
+        context = (context % context_size) * CONTEXT_CLASSES + context_of[column]
+
+
+def save(path, table, order, smoothing):
+    """Write a model file (removing the rank file of the model it replaces)"""
+    discard_ranks(path)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, order, SYMBOLS, CONTEXT_CLASSES, smoothing))
+        f.write(table.astype("<f4").tobytes())
+
+
+def is_model_file(path):
+    """Check if a file starts with the Markov model magic"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+_active_model = None
+_model_loaded = False
+
+
+def get_model():
+    """Get the model named by $PASSWORD_ANALYZER_MARKOV, or None when not configured"""
+    global _active_model, _model_loaded
+    if not _model_loaded:
+        path = os.environ.get(MARKOV_ENV)
+        _active_model = MarkovModel.load(path) if path else None
+        _model_loaded = True
+    return _active_model
+
+
+def set_model(model):
+    """Replace the active model (None disables the Markov estimate)"""
+    global _active_model, _model_loaded
+    _active_model = model
+    _model_loaded = True
+
+
+def main(argv=None):
+    from .audit import iter_passwords
+
+    parser = argparse.ArgumentParser(
+        description="Train a character n-gram model from a leaked password list")
+    parser.add_argument("source", help="password list, one per line")
+    parser.add_argument("output", help="model file to write")
+    parser.add_argument("--order", type=int, default=4, choices=(2, 3, 4),
+                        help="n-gram order (default: 4)")
+    parser.add_argument("--smoothing", type=float, default=0.5,
+                        help="pseudo-counts per symbol added to every context (default: 0.5)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES,
+                        help="passwords sampled for the guess rank table, 0 to skip "
+                             f"(default: {DEFAULT_SAMPLES})")
+    parser.add_argument("--seed", type=int, help="random seed for the sampling")
+    args = parser.parse_args(argv)
+
+    with open(args.source, "rb") as f:
+        table = train(iter_passwords(f), args.order, args.smoothing)
+    save(args.output, table, args.order, args.smoothing)
+    size = os.path.getsize(args.output)
+    print(f"Wrote order-{args.order} model to {args.output} ({size / 2 ** 20:.1f} MiB, "
+          f"{len(table):,} entries, mean log2 p {float(table.mean()):.2f})")
+    if args.samples:
+        model = MarkovModel.load(args.output)
+        build_for_model(model, args.output + RANKS_SUFFIX, args.samples, args.seed)
+        print(f"Wrote {args.samples:,} samples to {args.output + RANKS_SUFFIX}")
+        model.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,558 @@
+# Pattern matchers and minimum-guesses estimation, after zxcvbn
+#
+# Pool-based entropy assumes every character is drawn uniformly from its
+# character classes, so "Password1!" looks as strong as ten random
+# characters.  Here the password is matched against the patterns attackers
+# actually try first (dictionary words, reversed words, l33t spellings,
+# repeats, sequences, keyboard walks and dates), each match is given a guess
+# count, and a dynamic program finds the cheapest way to cover the password
+# with matches and brute-forced gaps.  All guess counts are kept as log2 so
+# long passwords cannot overflow a float.
+import math
+import re
+from datetime import date
+
+from .automaton import Automaton
+from .keyboard import LAYOUTS, find_walks
+from .leet import LeetIndex
+from .profile import get_profile
+from .wordlists import dictionaries
+
+# Only the first MAX_MATCH_LENGTH characters are matched; the rest of a longer
+# password is counted as brute force
+MAX_MATCH_LENGTH = 100
+
+# Dictionary of the common passwords check
+COMMON_DICTIONARY = "common_passwords"
+
+# A sequence of l matches costs l! orderings plus this many guesses per
+# additional match, so splitting a password into many tiny matches is not free
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+
+REFERENCE_YEAR = date.today().year
+MIN_YEAR_SPACE = 20
+DATE_MIN_YEAR = 1000
+DATE_MAX_YEAR = 2050
+
+# Sequences: largest code point step still counted as a sequence
+MAX_SEQUENCE_DELTA = 5
+
+# Dates: where an unseparated run of digits can be split into day, month, year
+DATE_SPLITS = {
+    4: ((1, 2), (2, 3)),
+    5: ((1, 3), (2, 3)),
+    6: ((1, 2), (2, 4), (4, 5)),
+    7: ((1, 3), (2, 3), (4, 5), (4, 6)),
+    8: ((2, 4), (4, 6)),
+}
+DATE_WITH_SEPARATOR = re.compile(r"(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})\Z")
+RECENT_YEAR = re.compile(r"19\d\d|20[0-4]\d")
+
+REPEAT_GREEDY = re.compile(r"(.+)\1+", re.S)
+REPEAT_LAZY = re.compile(r"(.+?)\1+", re.S)
+REPEAT_LAZY_ANCHORED = re.compile(r"(.+?)\1+\Z", re.S)
+
+LOG2_GROWING_SEQUENCE = math.log2(MIN_GUESSES_BEFORE_GROWING_SEQUENCE)
+
+
+class Match:
+    """A pattern found at password[i:j + 1]
+
+    guesses_log2 is the log2 of the guesses an attacker needs to hit the
+    token with this pattern; details holds pattern-specific fields (the
+    dictionary word and rank, the keyboard graph, the date...).
+    """
+
+    __slots__ = ("pattern", "i", "j", "token", "guesses_log2", "details")
+
+    def __init__(self, pattern, i, j, token, guesses_log2, **details):
+        self.pattern = pattern
+        self.i = i
+        self.j = j
+        self.token = token
+        self.guesses_log2 = guesses_log2
+        self.details = details
+
+    def to_dict(self):
+        """Convert the match to a plain dict (JSON serializable)"""
+        data = {"pattern": self.pattern, "i": self.i, "j": self.j, "token": self.token,
+                "guesses_log2": round(self.guesses_log2, 2)}
+        data.update(self.details)
+        return data
+
+    def __repr__(self):
+        return f"Match({self.pattern!r}, {self.i}, {self.j}, {self.token!r}, guesses_log2={self.guesses_log2:.2f})"
+
+
+class GuessEstimate:
+    """Cheapest decomposition of a password into matches (and every match found)"""
+
+    __slots__ = ("guesses_log2", "sequence", "matches")
+
+    def __init__(self, guesses_log2, sequence, matches=()):
+        self.guesses_log2 = guesses_log2
+        self.sequence = sequence
+        self.matches = matches
+
+    @property
+    def entropy(self):
+        """Guesses as bits, comparable with calculate_entropy"""
+        return round(self.guesses_log2, 2)
+
+    def __repr__(self):
+        patterns = ", ".join(match.pattern for match in self.sequence)
+        return f"GuessEstimate(guesses_log2={self.guesses_log2:.2f}, sequence=[{patterns}])"
+
+
+def _log2_sum(a, b):
+    """log2(2**a + 2**b) without overflowing"""
+    if a < b:
+        a, b = b, a
+    return a + math.log2(1 + 2.0 ** (b - a))
+
+
+def _log2_variations(count, other):
+    """log2 of the ways to place count marked characters among count + other
+
+    Used for uppercase, l33t and shifted-key variations: none marked or all
+    marked doubles the guesses, anything else costs every mix up to the
+    smaller group.
+    """
+    if count == 0 or other == 0:
+        return 1.0
+    return math.log2(sum(math.comb(count + other, i) for i in range(1, min(count, other) + 1)))
+
+
+# Dictionary matchers
+
+_lists = None
+_automaton = None
+_leet_index = None
+
+
+def _dictionaries():
+    global _lists
+    if _lists is None:
+        _lists = dictionaries()
+    return _lists
+
+
+def get_automaton():
+    """Get the automaton over all dictionaries, building it on first use"""
+    global _automaton
+    if _automaton is None:
+        automaton = Automaton()
+        for name, words in _dictionaries().items():
+            automaton.add_dictionary(name, (word.lower() for word in words))
+        _automaton = automaton.build()
+    return _automaton
+
+
+def get_leet_index():
+    """Get the l33t-normalized index over all dictionaries, building it on first use"""
+    global _leet_index
+    if _leet_index is None:
+        _leet_index = LeetIndex(_dictionaries())
+    return _leet_index
+
+
+def set_dictionaries(lists):
+    """Replace the dictionaries, as {name: ranked words} (None reloads the defaults)"""
+    global _lists, _automaton, _leet_index
+    _lists = lists
+    _automaton = None
+    _leet_index = None
+
+
+def _uppercase_variations(token):
+    if token.islower() or not any(c.isupper() for c in token):
+        return 0.0
+    # Capitalized, all upper or a trailing capital: the first things tried
+    if token.isupper() or (token[0].isupper() and token[1:].islower()) or \
+            (token[-1].isupper() and token[:-1].islower()):
+        return 1.0
+    upper = sum(1 for c in token if c.isupper())
+    lower = sum(1 for c in token if c.islower())
+    return _log2_variations(upper, lower)
+
+
+def lower_aligned(password):
+    """Lowercase a password character by character, keeping its length
+
+    A few characters lowercase to several ("İ" -> "i̇"), which would shift
+    every match index after them; those are kept as they are.
+    """
+    lowered = password.lower()
+    if len(lowered) == len(password):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in password)
+
+
+def _dictionary_guesses(rank, token):
+    return math.log2(rank) + _uppercase_variations(token)
+
+
+def dictionary_match(password, lowered=None, automaton=None):
+    """Find every dictionary word in the password"""
+    lowered = lower_aligned(password) if lowered is None else lowered
+    automaton = automaton or get_automaton()
+    matches = []
+    for i, j, dictionary, rank in automaton.search(lowered):
+        token = password[i:j + 1]
+        matches.append(Match("dictionary", i, j, token, _dictionary_guesses(rank, token),
+                             word=lowered[i:j + 1], dictionary=dictionary, rank=rank))
+    return matches
+
+
+def reverse_dictionary_match(password, lowered=None, automaton=None):
+    """Find dictionary words spelled backwards"""
+    lowered = lower_aligned(password) if lowered is None else lowered
+    automaton = automaton or get_automaton()
+    last = len(password) - 1
+    matches = []
+    for i, j, dictionary, rank in automaton.search(lowered[::-1]):
+        i, j = last - j, last - i
+        token = password[i:j + 1]
+        if len(token) < 2 or token == token[::-1]:
+            continue  # palindromes are plain dictionary matches already
+        matches.append(Match("dictionary", i, j, token, _dictionary_guesses(rank, token) + 1,
+                             word=lowered[i:j + 1][::-1], dictionary=dictionary,
+                             rank=rank, reversed=True))
+    return matches
+
+
+def l33t_match(password, lowered=None, index=None):
+    """Find dictionary words spelled with l33t substitutions ("p@ssw0rd")"""
+    lowered = lower_aligned(password) if lowered is None else lowered
+    index = index or get_leet_index()
+    matches = []
+    for i, j, word, dictionary, rank, subs in index.search(lowered):
+        token = password[i:j + 1]
+        subbed = lowered[i:j + 1]
+        l33t_log2 = 0.0
+        for symbol, letter in subs.items():
+            l33t_log2 += _log2_variations(subbed.count(symbol), subbed.count(letter))
+        matches.append(Match("dictionary", i, j, token,
+                             _dictionary_guesses(rank, token) + l33t_log2,
+                             word=word, dictionary=dictionary, rank=rank, l33t=subs))
+    return matches
+
+
+# Repeats, sequences and keyboard walks
+
+def repeat_match(password):
+    """Find repeated runs ("aaa", "abcabc")"""
+    matches = []
+    pos = 0
+    while pos < len(password):
+        greedy = REPEAT_GREEDY.search(password, pos)
+        if not greedy:
+            break
+        lazy = REPEAT_LAZY.search(password, pos)
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            # "aabaab": the greedy run is longer, find its shortest unit
+            match = greedy
+            base = REPEAT_LAZY_ANCHORED.match(match.group(0)).group(1)
+        else:
+            match = lazy
+            base = match.group(1)
+        token = match.group(0)
+        repeat_count = len(token) // len(base)
+        base_log2 = _estimate(base).guesses_log2
+        matches.append(Match("repeat", match.start(), match.end() - 1, token,
+                             base_log2 + math.log2(repeat_count),
+                             base_token=base, repeat_count=repeat_count))
+        pos = match.end()
+    return matches
+
+
+def _sequence_guesses(token, ascending):
+    first = token[0]
+    if first in "aAzZ019":
+        base = 4  # obvious starting points
+    elif first.isdigit():
+        base = 10
+    else:
+        base = 26
+    if not ascending:
+        base *= 2
+    return math.log2(base * len(token))
+
+
+def sequence_match(password):
+    """Find runs of evenly spaced characters ("abcd", "9753", "zyx")"""
+    matches = []
+    if len(password) < 2:
+        return matches
+
+    def add(i, j, delta):
+        if (j - i > 1 or abs(delta) == 1) and 0 < abs(delta) <= MAX_SEQUENCE_DELTA:
+            token = password[i:j + 1]
+            matches.append(Match("sequence", i, j, token, _sequence_guesses(token, delta > 0),
+                                 delta=delta))
+
+    start = 0
+    last_delta = None
+    for k in range(1, len(password)):
+        delta = ord(password[k]) - ord(password[k - 1])
+        if last_delta is None:
+            last_delta = delta
+        if delta == last_delta:
+            continue
+        add(start, k - 1, last_delta)
+        start = k - 1
+        last_delta = delta
+    add(start, len(password) - 1, last_delta)
+    return matches
+
+
+def spatial_match(password):
+    """Find keyboard walks of three or more keys ("qwerty", "1qaz2wsx", "7896")"""
+    matches = []
+    for name, i, j, turns, shifted in find_walks(password):
+        matches.append(Match("spatial", i, j, password[i:j + 1],
+                             LAYOUTS[name].guesses_log2(j - i + 1, turns, shifted),
+                             graph=name, turns=turns, shifted_count=shifted))
+    return matches
+
+
+# Dates
+
+def _two_to_four_digit_year(year):
+    if year > 99:
+        return year
+    return year + 1900 if year > 50 else year + 2000
+
+
+def _day_month(first, second):
+    for day, month in ((first, second), (second, first)):
+        if 1 <= day <= 31 and 1 <= month <= 12:
+            return day, month
+    return None
+
+
+def _to_date(ints):
+    """Read three integers as (year, month, day), or None"""
+    if ints[1] > 31 or ints[1] <= 0:
+        return None
+    over_12 = over_31 = under_1 = 0
+    for value in ints:
+        if 99 < value < DATE_MIN_YEAR or value > DATE_MAX_YEAR:
+            return None
+        over_31 += value > 31
+        over_12 += value > 12
+        under_1 += value <= 0
+    if over_31 >= 2 or over_12 == 3 or under_1 >= 2:
+        return None
+
+    splits = ((ints[2], ints[0], ints[1]), (ints[0], ints[1], ints[2]))
+    for year, first, second in splits:
+        if DATE_MIN_YEAR <= year <= DATE_MAX_YEAR:
+            day_month = _day_month(first, second)
+            return (year,) + day_month[::-1] if day_month else None
+    for year, first, second in splits:
+        day_month = _day_month(first, second)
+        if day_month:
+            return (_two_to_four_digit_year(year),) + day_month[::-1]
+    return None
+
+
+def _date_guesses(year, separator):
+    guesses_log2 = math.log2(max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE) * 365)
+    return guesses_log2 + 2 if separator else guesses_log2
+
+
+def date_match(password):
+    """Find dates ("13.05.1990", "130590", "1990") and recent years"""
+    if sum(c.isdigit() for c in password) < 4:
+        return []
+    matches = []
+    length = len(password)
+    for i in range(length - 3):
+        for j in range(i + 3, min(i + 8, length)):
+            token = password[i:j + 1]
+            if not token.isdigit() or not token.isascii():
+                continue
+            candidates = [_to_date((int(token[:k]), int(token[k:l]), int(token[l:])))
+                          for k, l in DATE_SPLITS[len(token)]]
+            candidates = [candidate for candidate in candidates if candidate]
+            if not candidates:
+                continue
+            year, month, day = min(candidates, key=lambda c: abs(c[0] - REFERENCE_YEAR))
+            matches.append(Match("date", i, j, token, _date_guesses(year, ""),
+                                 separator="", year=year, month=month, day=day))
+
+    for i in range(length - 5):
+        for j in range(i + 5, min(i + 10, length)):
+            token = password[i:j + 1]
+            found = DATE_WITH_SEPARATOR.match(token)
+            if not found:
+                continue
+            ymd = _to_date((int(found.group(1)), int(found.group(3)), int(found.group(4))))
+            if ymd:
+                year, month, day = ymd
+                matches.append(Match("date", i, j, token, _date_guesses(year, found.group(2)),
+                                     separator=found.group(2), year=year, month=month, day=day))
+
+    # Drop dates contained in a longer date
+    dates = [match for match in matches
+             if not any(other is not match and other.i <= match.i and other.j >= match.j
+                        for other in matches)]
+
+    for found in RECENT_YEAR.finditer(password):
+        year = int(found.group(0))
+        dates.append(Match("year", found.start(), found.end() - 1, found.group(0),
+                           math.log2(max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)), year=year))
+    return dates
+
+
+MATCHERS = (repeat_match, sequence_match, spatial_match, date_match)
+
+
+def omnimatch(password, lowered=None):
+    """Run every matcher, returning matches sorted by position"""
+    lowered = lower_aligned(password) if lowered is None else lowered
+    automaton = get_automaton()
+    matches = dictionary_match(password, lowered, automaton)
+    matches += reverse_dictionary_match(password, lowered, automaton)
+    matches += l33t_match(password, lowered)
+    for matcher in MATCHERS:
+        matches += matcher(password)
+    matches.sort(key=lambda match: (match.i, match.j))
+    return matches
+
+
+# Minimum-guesses decomposition
+
+def most_guessable_sequence(password, matches, cardinality, exclude_additive=False):
+    """Find the sequence of matches and brute-forced gaps needing fewest guesses
+
+    Dynamic program over prefixes: for every end position k and sequence
+    length l, keep the cheapest way to cover password[:k + 1] with l
+    matches. Brute-force runs are only materialized for the winning
+    sequence. Returns a GuessEstimate.
+    """
+    n = len(password)
+    if not n:
+        return GuessEstimate(0.0, [])
+    log2_cardinality = math.log2(max(cardinality, 2))
+    log2_min_single = math.log2(MIN_SUBMATCH_GUESSES_SINGLE_CHAR)
+    log2_min_multi = math.log2(MIN_SUBMATCH_GUESSES_MULTI_CHAR)
+    # log2(l!) and the additive term for each sequence length
+    log2_factorial = [0.0, 0.0]
+    for l in range(2, n + 1):
+        log2_factorial.append(log2_factorial[-1] + math.log2(l))
+    by_end = [[] for _ in range(n)]
+    for match in matches:
+        by_end[match.j].append(match)
+
+    # For each k: {l: (log2 guesses of the sequence, log2 product, start, match)}
+    # where match is None for a brute-force run password[start:k + 1]
+    best = [{} for _ in range(n)]
+    ends_in_match = []
+
+    def update(k, l, start, match, guesses_log2):
+        if k - start + 1 < n:
+            minimum = log2_min_single if start == k else log2_min_multi
+            if guesses_log2 < minimum:
+                guesses_log2 = minimum
+        product = guesses_log2 + best[start - 1][l - 1][1] if l > 1 else guesses_log2
+        total = log2_factorial[l] + product
+        if not exclude_additive:
+            total = _log2_sum(total, (l - 1) * LOG2_GROWING_SEQUENCE)
+        entries = best[k]
+        for other_l, other in entries.items():
+            if other_l <= l and other[0] <= total:
+                return
+        entries[l] = (total, product, start, match)
+
+    for k in range(n):
+        for match in by_end[k]:
+            if match.i > 0:
+                for l in list(best[match.i - 1]):
+                    update(k, l + 1, match.i, match, match.guesses_log2)
+            else:
+                update(k, 1, 0, match, match.guesses_log2)
+        update(k, 1, 0, None, (k + 1) * log2_cardinality)
+        for i in range(1, k + 1):
+            # Two adjacent brute-force runs are just one longer run, so a run
+            # only follows sequences ending in a match
+            for l in ends_in_match[i - 1]:
+                update(k, l + 1, i, None, (k - i + 1) * log2_cardinality)
+        ends_in_match.append([l for l, entry in best[k].items() if entry[3] is not None])
+
+    # Walk back from the cheapest full cover
+    k = n - 1
+    l = min(best[k], key=lambda l: best[k][l][0])
+    guesses_log2 = best[k][l][0]
+    sequence = []
+    while k >= 0:
+        _, _, start, match = best[k][l]
+        if match is None:
+            token = password[start:k + 1]
+            match = Match("bruteforce", start, k, token, len(token) * log2_cardinality,
+                          cardinality=cardinality)
+        sequence.append(match)
+        k = start - 1
+        l -= 1
+    sequence.reverse()
+    return GuessEstimate(guesses_log2, sequence)
+
+
+def _estimate(password, profile=None):
+    profile = profile or get_profile(password)
+    head = password[:MAX_MATCH_LENGTH]
+    lowered = profile.lowered[:MAX_MATCH_LENGTH] if len(profile.lowered) == len(password) \
+        else lower_aligned(head)
+    matches = omnimatch(head, lowered)
+    estimate = most_guessable_sequence(head, matches, profile.pool_size)
+    estimate.matches = matches
+    if len(password) > MAX_MATCH_LENGTH:
+        tail = len(password) - MAX_MATCH_LENGTH
+        estimate.guesses_log2 += tail * math.log2(max(profile.pool_size, 2))
+    return estimate
+
+
+def estimate_guesses(password):
+    """Estimate the guesses needed for a password (accepts a password or its PasswordProfile)
+
+    The estimate is kept on the profile, so every analysis step sharing the
+    profile runs the matchers once.
+    """
+    profile = get_profile(password)
+    if profile.estimate is None:
+        profile.estimate = _estimate(profile.password, profile)
+    return profile.estimate
+
+
+def pattern_entropy(password):
+    """Get log2 of the estimated guesses, in bits like calculate_entropy"""
+    profile = get_profile(password)
+    if not profile.length:
+        return 0
+    return estimate_guesses(profile).entropy
+
+
+def leet_common_word(password):
+    """Get the common password a password spells in l33t ("P@ssw0rd"), or None"""
+    found = get_leet_index().lookup(get_profile(password).lowered, COMMON_DICTIONARY)
+    return found[0] if found else None
+
+
+def keyboard_walks(password, min_length=4):
+    """Get the keyboard walks of at least min_length keys found in a password"""
+    return [match for match in estimate_guesses(password).matches
+            if match.pattern == "spatial" and match.j - match.i + 1 >= min_length]
+
+
+def keyboard_coverage(password):
+    """Get the fraction of a password's characters that are part of a keyboard walk"""
+    profile = get_profile(password)
+    if not profile.length:
+        return 0.0
+    covered = set()
+    for match in keyboard_walks(profile):
+        covered.update(range(match.i, match.j + 1))
+    return len(covered) / profile.length
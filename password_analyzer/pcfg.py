@@ -0,0 +1,453 @@
+# Structure-based (PCFG) guess estimator
+#
+# Crackers using probabilistic context-free grammars split passwords into
+# runs of letters, digits and specials: "Password12!" has the base structure
+# L8D2S1, and is guessed as P(L8D2S1) * P(case mask Ullllll of L8)
+# * P("password" | L8) * P("12" | D2) * P("!" | S1).  Train the tables offline:
+#
+#   python -m password_analyzer.pcfg leaked.txt grammar.bin
+#
+# and point $PASSWORD_ANALYZER_PCFG at the file.  Layout, little-endian:
+#
+#   header   MAGIC (8 bytes) + section count (uint32)
+#   section  key (uint8 length + ASCII), log2 probability of any one unseen
+#            item (float32), entry count (uint32), then each entry as
+#            item (uint8 length + UTF-8) + log2 probability (float32)
+#
+# Section "*" holds the base structures, "L8"/"D2"/"S1" the terminals of each
+# run and "U8" the case masks of letter runs.  Loading builds one dict per
+# section, so scoring a password is one parse and one probe per run: O(length).
+# Training also samples the grammar for its guess rank table (grammar.bin.ranks,
+# see guessrank.py).
+import argparse
+import math
+import os
+import re
+import string
+import struct
+import sys
+from collections import Counter
+from itertools import accumulate
+
+from .guessrank import DEFAULT_SAMPLES, RANKS_SUFFIX, build_for_model, discard_ranks, load_ranks
+
+MAGIC = b"PWPCFG01"
+HEADER = struct.Struct("<8sI")
+SECTION = struct.Struct("<fI")
+LOG2P = struct.Struct("<f")
+# Items are stored with a one-byte length
+MAX_ITEM_BYTES = 255
+
+STRUCTURES = "*"
+LETTERS = "L"
+DIGITS = "D"
+SPECIALS = "S"
+CASE = "U"
+
+# Alphabet of each run kind, for items missing from the tables
+ALPHABETS = {LETTERS: string.ascii_lowercase, DIGITS: string.digits,
+             SPECIALS: string.punctuation + " ", CASE: "Ul"}
+KEYSPACE = {kind: len(alphabet) for kind, alphabet in ALPHABETS.items()}
+# There are 3**n structures of length n; unseen ones share the reserved
+# mass as 6**-n, which sums to 1 over all lengths
+UNSEEN_STRUCTURE_LOG2 = math.log2(6)
+
+# Structures at least this likely (1 password in 128) are reported as weak
+WEAK_STRUCTURE_LOG2 = -7.0
+
+PCFG_ENV = "PASSWORD_ANALYZER_PCFG"
+
+
+def run_kind(c):
+    """Get the run kind (L, D or S) of one character"""
+    if "0" <= c <= "9":
+        return DIGITS
+    if c.isalpha():
+        return LETTERS
+    return SPECIALS
+
+
+def parse(password):
+    """Split a password into its (kind, token) runs"""
+    runs = []
+    start = 0
+    kind = None
+    for i, c in enumerate(password):
+        current = run_kind(c)
+        if current != kind:
+            if kind is not None:
+                runs.append((kind, password[start:i]))
+            kind = current
+            start = i
+    if kind is not None:
+        runs.append((kind, password[start:]))
+    return runs
+
+
+def structure_of(runs):
+    """Get the base structure of parsed runs, e.g. "L8D2S1" """
+    return "".join(f"{kind}{len(token)}" for kind, token in runs)
+
+
+def case_mask(token):
+    """Get the case mask of a letter run ("U" upper, "l" anything else)"""
+    return "".join("U" if c.isupper() else "l" for c in token)
+
+
+def parse_structure(structure):
+    """Split a base structure into its (kind, length) runs"""
+    return [(kind, int(length)) for kind, length in re.findall(r"([LDS])(\d+)", structure)]
+
+
+def describe_structure(structure):
+    """Describe a base structure in words, e.g. "8 letters, 2 digits, 1 symbol" """
+    names = {LETTERS: ("letter", "letters"), DIGITS: ("digit", "digits"),
+             SPECIALS: ("symbol", "symbols")}
+    return ", ".join(f"{length} {names[kind][length != 1]}"
+                     for kind, length in parse_structure(structure))
+
+
+class PcfgEstimate:
+    """Probability of a password under the grammar, split by component
+
+    parts holds (section, log2 probability, seen in training) for the
+    structure, then for each run (and case mask) in order.
+    """
+
+    __slots__ = ("guesses_log2", "structure", "structure_log2", "parts")
+
+    def __init__(self, guesses_log2, structure, structure_log2, parts):
+        self.guesses_log2 = guesses_log2
+        self.structure = structure
+        self.structure_log2 = structure_log2
+        self.parts = parts
+
+    @property
+    def entropy(self):
+        """Guesses as bits, comparable with calculate_entropy"""
+        return round(self.guesses_log2, 2)
+
+    @property
+    def weak_structure(self):
+        """The base structure if it is a common one, else None"""
+        return self.structure if self.structure_log2 >= WEAK_STRUCTURE_LOG2 else None
+
+    def to_dict(self):
+        return {
+            "guesses_log2": self.guesses_log2,
+            "structure": self.structure,
+            "structure_log2": self.structure_log2,
+            "parts": [{"section": section, "log2_probability": log2p, "seen": seen}
+                      for section, log2p, seen in self.parts],
+        }
+
+    def __repr__(self):
+        return f"PcfgEstimate({self.structure!r}, guesses_log2={self.guesses_log2:.2f})"
+
+
+class PcfgModel:
+    """Structure, terminal and case-mask probability tables"""
+
+    def __init__(self, sections):
+        # {section: (unseen log2 probability, {item: log2 probability})}
+        self.sections = sections
+        # GuessRankTable turning -log2 P into a guess number (None: use -log2 P)
+        self.ranks = None
+        # {section: (items, cumulative probabilities)}, built when sampling
+        self._samplers = {}
+
+    @classmethod
+    def load(cls, path):
+        """Read a grammar file"""
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a PCFG grammar file")
+        offset = HEADER.size
+        sections = {}
+        for _ in range(count):
+            key, offset = _read_item(data, offset)
+            unseen, entries = SECTION.unpack_from(data, offset)
+            offset += SECTION.size
+            table = {}
+            for _ in range(entries):
+                item, offset = _read_item(data, offset)
+                table[item] = LOG2P.unpack_from(data, offset)[0]
+                offset += LOG2P.size
+            sections[key] = (unseen, table)
+        model = cls(sections)
+        model.ranks = load_ranks(path)
+        return model
+
+    def save(self, path):
+        """Write a grammar file (removing the rank file of the grammar it replaces)"""
+        discard_ranks(path)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self.sections)))
+            for key, (unseen, table) in self.sections.items():
+                f.write(_item_bytes(key))
+                f.write(SECTION.pack(unseen, len(table)))
+                for item, log2p in table.items():
+                    f.write(_item_bytes(item))
+                    f.write(LOG2P.pack(log2p))
+
+    def _lookup(self, section, item, length):
+        entry = self.sections.get(section)
+        if entry is None:
+            # Never seen in training: uniform over the whole keyspace
+            return -length * math.log2(KEYSPACE[section[0]]), False
+        unseen, table = entry
+        log2p = table.get(item)
+        if log2p is None:
+            return unseen, False
+        return log2p, True
+
+    def estimate(self, password):
+        """Get the PcfgEstimate of a password"""
+        bits, structure, structure_log2, parts = self._parts(password)
+        if self.ranks is not None:
+            bits = self.ranks.guesses_log2(bits)
+        return PcfgEstimate(bits, structure, structure_log2, parts)
+
+    def log2_probability(self, password):
+        """Get log2 of the probability of a password under the grammar"""
+        return -self._parts(password)[0]
+
+    def _parts(self, password):
+        runs = parse(password)
+        structure = structure_of(runs)
+        unseen, structures = self.sections.get(STRUCTURES, (0.0, {}))
+        structure_log2 = structures.get(structure)
+        seen = structure_log2 is not None
+        if not seen:
+            structure_log2 = unseen - len(password) * UNSEEN_STRUCTURE_LOG2
+        parts = [(STRUCTURES, structure_log2, seen)]
+        total = structure_log2
+        for kind, token in runs:
+            length = len(token)
+            section = f"{kind}{length}"
+            if kind == LETTERS:
+                log2p, seen = self._lookup(section, token.lower(), length)
+                parts.append((section, log2p, seen))
+                total += log2p
+                section = f"{CASE}{length}"
+                token = case_mask(token)
+            log2p, seen = self._lookup(section, token, length)
+            parts.append((section, log2p, seen))
+            total += log2p
+        return -total, structure, structure_log2, tuple(parts)
+
+    def guesses_log2(self, password):
+        """Estimated guesses (log2) for a cracker enumerating by grammar probability"""
+        return self.estimate(password).guesses_log2
+
+    def entropy(self, password):
+        """Guesses as bits, comparable with calculate_entropy"""
+        return self.estimate(password).entropy
+
+    def estimate_many(self, passwords):
+        """Get the PcfgEstimate of every password, in order"""
+        return [self.estimate(password) for password in passwords]
+
+    def batch_guesses_log2(self, passwords):
+        """guesses_log2 for a batch, as a NumPy array"""
+        import numpy as np
+
+        return np.fromiter((self.estimate(password).guesses_log2 for password in passwords),
+                           dtype=np.float64, count=len(passwords))
+
+    def _draw(self, section, length, rng):
+        """Draw one item of a section from the grammar, unseen items included"""
+        alphabet = ALPHABETS[section[0]] if section != STRUCTURES else None
+        entry = self.sections.get(section)
+        if entry is not None:
+            table = entry[1]
+            sampler = self._samplers.get(section)
+            if sampler is None:
+                items = list(table)
+                sampler = self._samplers[section] = (items, list(accumulate(2 ** table[item]
+                                                                            for item in items)))
+            items, cumulative = sampler
+            exhausted = alphabet is not None and len(items) >= len(alphabet) ** length
+            if items and (rng.random() < cumulative[-1] or exhausted):
+                return rng.choices(items, cum_weights=cumulative)[0]
+        while True:
+            if alphabet is None:
+                # Unseen structure: length n with probability 2**-n, then any
+                # of its 3**n kind sequences
+                length = 1
+                while rng.random() < 0.5:
+                    length += 1
+                kinds = "".join(rng.choice((LETTERS, DIGITS, SPECIALS)) for _ in range(length))
+                item = structure_of(parse_kinds(kinds))
+            else:
+                item = "".join(rng.choice(alphabet) for _ in range(length))
+            if entry is None or item not in entry[1]:
+                return item
+
+    def sample(self, rng):
+        """Draw one password from the grammar (rng is a random.Random)"""
+        pieces = []
+        for kind, length in parse_structure(self._draw(STRUCTURES, 0, rng)):
+            token = self._draw(f"{kind}{length}", length, rng)
+            if kind == LETTERS:
+                mask = self._draw(f"{CASE}{length}", length, rng)
+                token = "".join(c.upper() if m == "U" and len(c.upper()) == 1 else c
+                                for c, m in zip(token, mask))
+            pieces.append(token)
+        return "".join(pieces)
+
+    def sample_bits(self, count, seed=None):
+        """Draw count passwords from the grammar and get their -log2 probabilities"""
+        import random
+
+        rng = random.Random(seed)
+        return [-self.log2_probability(self.sample(rng)) for _ in range(count)]
+
+    def __repr__(self):
+        structures = len(self.sections.get(STRUCTURES, (0, ()))[1])
+        return f"PcfgModel(sections={len(self.sections)}, structures={structures})"
+
+
+def parse_kinds(kinds):
+    """Group a string of run kinds ("LLLDD") into (kind, token) runs"""
+    return [(match.group()[0], match.group()) for match in re.finditer(r"L+|D+|S+", kinds)]
+
+
+def _item_bytes(item):
+    data = item.encode("utf-8", "surrogatepass")
+    if len(data) > MAX_ITEM_BYTES:
+        raise ValueError(f"Grammar item of {len(data)} bytes is over {MAX_ITEM_BYTES}")
+    return bytes((len(data),)) + data
+
+
+def _read_item(data, offset):
+    length = data[offset]
+    end = offset + 1 + length
+    return data[offset + 1:end].decode("utf-8", "surrogatepass"), end
+
+
+def train(passwords, max_items=50000):
+    """Count structures, terminals and case masks and build a PcfgModel
+
+    Each section keeps its max_items most frequent items. Probabilities are
+    Witten-Bell smoothed: a section with N occurrences of T distinct items
+    reserves T / (N + T) (plus the mass of the dropped items) for unseen
+    ones, shared uniformly over the rest of the section's keyspace.
+    """
+    counters = {}
+    for password in passwords:
+        if not password or len(password) > MAX_ITEM_BYTES:
+            continue
+        runs = parse(password)
+        items = [(STRUCTURES, structure_of(runs))]
+        for kind, token in runs:
+            section = f"{kind}{len(token)}"
+            if kind == LETTERS:
+                items.append((section, token.lower()))
+                section = f"{CASE}{len(token)}"
+                token = case_mask(token)
+            items.append((section, token))
+        # Passwords with an item longer than the file format allows are not
+        # worth keeping: a structure takes two or more characters per run
+        # ("a1" * 100), and lowercasing or UTF-8 can lengthen a terminal
+        if any(len(item.encode("utf-8", "surrogatepass")) > MAX_ITEM_BYTES for _, item in items):
+            continue
+        for section, item in items:
+            counters.setdefault(section, Counter())[item] += 1
+
+    sections = {}
+    for key, counter in sorted(counters.items()):
+        total = sum(counter.values())
+        types = len(counter)
+        kept = counter.most_common(max_items)
+        dropped = total - sum(count for _, count in kept)
+        denominator = total + types
+        reserve = (types + dropped) / denominator
+        if key == STRUCTURES:
+            unseen = math.log2(reserve)
+        else:
+            keyspace = KEYSPACE[key[0]] ** int(key[1:])
+            unseen = math.log2(reserve) - math.log2(max(1, keyspace - len(kept)))
+        table = {item: math.log2(count / denominator) for item, count in kept}
+        sections[key] = (unseen, table)
+    return PcfgModel(sections)
+
+
+def is_grammar_file(path):
+    """Check if a file starts with the PCFG grammar magic"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+_active_model = None
+_model_loaded = False
+
+
+def get_model():
+    """Get the grammar named by $PASSWORD_ANALYZER_PCFG, or None when not configured"""
+    global _active_model, _model_loaded
+    if not _model_loaded:
+        path = os.environ.get(PCFG_ENV)
+        _active_model = PcfgModel.load(path) if path else None
+        _model_loaded = True
+    return _active_model
+
+
+def set_model(model):
+    """Replace the active grammar (None disables the PCFG estimate)"""
+    global _active_model, _model_loaded
+    _active_model = model
+    _model_loaded = True
+
+
+def estimate_structure(password):
+    """Get the PcfgEstimate of a password or PasswordProfile, None without a grammar
+
+    The estimate is kept on the profile, so every analysis step sharing the
+    profile parses the password once.
+    """
+    from .profile import get_profile
+
+    model = get_model()
+    if model is None:
+        return None
+    profile = get_profile(password)
+    if profile.structure is None:
+        profile.structure = model.estimate(profile.password)
+    return profile.structure
+
+
+def main(argv=None):
+    from .audit import iter_passwords
+
+    parser = argparse.ArgumentParser(
+        description="Train PCFG structure and terminal tables from a leaked password list")
+    parser.add_argument("source", help="password list, one per line")
+    parser.add_argument("output", help="grammar file to write")
+    parser.add_argument("--max-items", type=int, default=50000,
+                        help="most frequent items kept per section (default: 50000)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES,
+                        help="passwords sampled for the guess rank table, 0 to skip "
+                             f"(default: {DEFAULT_SAMPLES})")
+    parser.add_argument("--seed", type=int, help="random seed for the sampling")
+    args = parser.parse_args(argv)
+
+    with open(args.source, "rb") as f:
+        model = train(iter_passwords(f), args.max_items)
+    model.save(args.output)
+    structures = model.sections.get(STRUCTURES, (0, {}))[1]
+    top = sorted(structures.items(), key=lambda item: -item[1])[:5]
+    print(f"Wrote {len(model.sections)} sections ({len(structures):,} structures) to "
+          f"{args.output} ({os.path.getsize(args.output) / 2 ** 20:.1f} MiB)")
+    for structure, log2p in top:
+        print(f"  {structure:12} {2 ** log2p:7.2%}")
+    if args.samples:
+        build_for_model(model, args.output + RANKS_SUFFIX, args.samples, args.seed)
+        print(f"Wrote {args.samples:,} samples to {args.output + RANKS_SUFFIX}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
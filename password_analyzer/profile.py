@@ -0,0 +1,114 @@
+# Single-pass password profile shared by every scoring step
+#
+# Scoring, rating, recommendations and policy checks only need the length,
+# which character classes occur (and how often) and the lowercase form.
+# PasswordProfile computes all of it in one scan instead of each step
+# rescanning the string with its own any(...) generators.
+
+# Character classes
+LOWER = 0
+UPPER = 1
+DIGIT = 2
+SPECIAL = 3
+OTHER = 4  # alphanumeric but not lower/upper/digit (e.g. CJK ideographs)
+
+# Pool size contributed by each class, as used by calculate_entropy
+POOL_SIZES = (26, 26, 10, 32)
+
+# Class of non-ASCII characters seen so far (bounded)
+MAX_CACHED_CHARS = 65536
+
+
+def classify(c):
+    """Get the class of one character (same tests as the original scoring code)"""
+    if c.islower():
+        return LOWER
+    if c.isupper():
+        return UPPER
+    if c.isdigit():
+        return DIGIT
+    if not c.isalnum():
+        return SPECIAL
+    return OTHER
+
+
+_char_classes = {chr(i): classify(chr(i)) for i in range(128)}
+
+
+class PasswordProfile:
+    """Length, character class counts and lowercase form of a password"""
+
+    __slots__ = ("password", "length", "counts", "lowered", "estimate", "structure")
+
+    def __init__(self, password):
+        counts = [0, 0, 0, 0, 0]
+        char_classes = _char_classes
+        for c in password:
+            cls = char_classes.get(c)
+            if cls is None:
+                cls = classify(c)
+                if len(char_classes) < MAX_CACHED_CHARS:
+                    char_classes[c] = cls
+            counts[cls] += 1
+
+        self.password = password
+        self.length = len(password)
+        self.counts = counts
+        self.lowered = password.lower()
+        # Pattern-based guess estimate, filled in by matching.estimate_guesses
+        self.estimate = None
+        # PCFG estimate, filled in by pcfg.estimate_structure
+        self.structure = None
+
+    @property
+    def has_lower(self):
+        return self.counts[LOWER] > 0
+
+    @property
+    def has_upper(self):
+        return self.counts[UPPER] > 0
+
+    @property
+    def has_digit(self):
+        return self.counts[DIGIT] > 0
+
+    @property
+    def has_special(self):
+        return self.counts[SPECIAL] > 0
+
+    @property
+    def has_keyboard_walk(self):
+        """Whether the password contains a keyboard walk of four or more keys"""
+        from .matching import keyboard_walks
+
+        return bool(keyboard_walks(self))
+
+    @property
+    def weak_structure(self):
+        """The PCFG base structure (e.g. "L8D1") if it is a common one, else None"""
+        from .pcfg import estimate_structure
+
+        estimate = estimate_structure(self)
+        return estimate.weak_structure if estimate is not None else None
+
+    @property
+    def char_types(self):
+        """Number of character classes present (0-4)"""
+        counts = self.counts
+        return (counts[LOWER] > 0) + (counts[UPPER] > 0) + (counts[DIGIT] > 0) + (counts[SPECIAL] > 0)
+
+    @property
+    def pool_size(self):
+        """Size of the character pool the password is drawn from"""
+        counts = self.counts
+        return sum(size for size, count in zip(POOL_SIZES, counts) if count)
+
+    def __repr__(self):
+        return f"PasswordProfile(length={self.length}, counts={self.counts})"
+
+
+def get_profile(password):
+    """Get the profile of a password, or return it unchanged if it already is one"""
+    if isinstance(password, PasswordProfile):
+        return password
+    return PasswordProfile(password)
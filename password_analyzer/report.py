@@ -0,0 +1,186 @@
+# Page-shaped analysis reports, as served by the web API
+#
+# The browser page renders crack times for several attackers, policy
+# compliance, a risk assessment and prioritised recommendations.  build_report
+# produces the same structure from the Python scoring engine so services get
+# exactly what the page would show.
+import math
+
+from .attacker import get_attacker_model
+from .cache import cached_analyze, cached_analyze_many
+from .pcfg import describe_structure
+
+# Password policies: (name, minimum length, required character classes)
+POLICIES = (
+    ("Basic", 6, ()),
+    ("Standard", 8, ("upper", "lower", "digit")),
+    ("Strong", 12, ("upper", "lower", "digit", "special")),
+    ("Military", 16, ("upper", "lower", "digit", "special")),
+)
+
+# Risk levels from the best score down: (minimum score, level, description, color, action)
+RISK_LEVELS = (
+    (80, "VERY LOW", "Excellent password security - very difficult to crack", "#27ae60", "Password is secure"),
+    (70, "LOW", "Good password security - adequate for most purposes", "#2ecc71", "Password is acceptable"),
+    (60, "MODERATE", "Moderate security risk - could be improved", "#f1c40f", "Consider improving password"),
+    (50, "MEDIUM", "Medium security risk - vulnerable to determined attackers", "#f39c12", "Improve password soon"),
+    (40, "HIGH", "High security risk - vulnerable to basic attacks", "#e67e22", "Change password as soon as possible"),
+    (0, "VERY HIGH", "Very high security risk - can be cracked quickly", "#e74c3c", "CHANGE PASSWORD IMMEDIATELY"),
+)
+
+PRIORITY_ORDER = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
+
+
+def _plural(value, unit):
+    """Format a duration like the page does ("1.5 minute", "3.0 minutes")"""
+    return f"{value:.1f} {unit}" if value < 2 else f"{value:.1f} {unit}s"
+
+
+def format_crack_time(seconds):
+    """Get the (text, color) the page shows for a crack time"""
+    if seconds < 1:
+        return "Instantly", "#e74c3c"
+    elif seconds < 60:
+        return f"{seconds:.1f} seconds", "#e74c3c"
+    elif seconds < 3600:
+        return _plural(seconds / 60, "minute"), "#f39c12"
+    elif seconds < 86400:
+        return _plural(seconds / 3600, "hour"), "#f1c40f"
+    elif seconds < 31536000:
+        return _plural(seconds / 86400, "day"), "#2ecc71"
+    else:
+        years = seconds / 31536000
+        if math.isinf(years):
+            return "Infinity years", "#3498db"
+        return _plural(years, "year"), "#27ae60" if years < 100 else "#3498db"
+
+
+def estimate_crack_times(entropy, attacker_model=None):
+    """Estimate crack time for each attacker tier (of the active attacker model by default)"""
+    if attacker_model is None:
+        attacker_model = get_attacker_model()
+    try:
+        combinations = 2.0 ** entropy
+    except OverflowError:
+        combinations = math.inf
+
+    results = {}
+    for name, speed in attacker_model.speeds:
+        time, color = format_crack_time(combinations / speed)
+        results[name] = {"time": time, "color": color}
+    return results
+
+
+def check_policy_compliance(profile):
+    """Check how much of each password policy is met
+
+    profile is a PasswordProfile, or anything with the same length and
+    has_* attributes (such as an AnalysisResult).
+    """
+    length = profile.length
+    present = {"upper": profile.has_upper, "lower": profile.has_lower,
+               "digit": profile.has_digit, "special": profile.has_special}
+
+    compliance = {}
+    for name, min_length, requires in POLICIES:
+        total = 1 + len(requires)
+        passed = (length >= min_length) + sum(1 for req in requires if present[req])
+        percentage = passed / total * 100
+        compliance[name] = {
+            "passed": passed,
+            "total": total,
+            "percentage": round(percentage),
+            "compliant": passed == total,
+        }
+    return compliance
+
+
+def assess_risk(score, is_common):
+    """Assess the risk level of a password"""
+    if is_common:
+        return {
+            "level": "CRITICAL",
+            "description": "This password is in common password lists and can be cracked instantly",
+            "color": "#c0392b",
+            "action": "CHANGE PASSWORD IMMEDIATELY",
+        }
+
+    for min_score, level, description, color, action in RISK_LEVELS:
+        if score >= min_score:
+            return {"level": level, "description": description, "color": color, "action": action}
+
+
+def prioritized_recommendations(profile, score, is_common):
+    """Get the page's prioritised recommendations, most urgent first (at most 6)"""
+    length = profile.length
+    recs = []
+
+    if is_common:
+        recs.append({"priority": "CRITICAL", "text": "CHANGE PASSWORD - It's in common password lists"})
+
+    if length < 8:
+        recs.append({"priority": "HIGH", "text": f"Increase length from {length} to at least 8 characters"})
+    elif length < 12:
+        recs.append({"priority": "MEDIUM", "text": f"Increase length from {length} to 12+ characters"})
+
+    if not profile.has_upper:
+        recs.append({"priority": "MEDIUM", "text": "Add uppercase letters (A-Z)"})
+    if not profile.has_lower:
+        recs.append({"priority": "MEDIUM", "text": "Add lowercase letters (a-z)"})
+    if not profile.has_digit:
+        recs.append({"priority": "MEDIUM", "text": "Add numbers (0-9)"})
+    if not profile.has_special:
+        recs.append({"priority": "HIGH", "text": "Add special characters (!@#$%^&*)"})
+    if profile.has_keyboard_walk:
+        recs.append({"priority": "HIGH", "text": "Avoid keyboard patterns like 'qwerty' or '1qaz2wsx'"})
+    if profile.weak_structure:
+        recs.append({"priority": "MEDIUM",
+                     "text": f"Avoid predictable layouts ({describe_structure(profile.weak_structure)})"})
+
+    if score < 60:
+        recs.append({"priority": "LOW", "text": "Consider using a passphrase (e.g., 'CorrectHorseBatteryStaple')"})
+
+    if not recs and score < 70:
+        recs.append({"priority": "LOW", "text": "Your password is decent but could be improved with more length"})
+
+    recs.sort(key=lambda rec: PRIORITY_ORDER[rec["priority"]])
+    return recs[:6]
+
+
+def _camel_case(name):
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def report_from_result(result):
+    """Build the page-shaped report from an AnalysisResult"""
+    return {
+        "score": result.score,
+        "rating": result.rating,
+        "color": result.rating_color,
+        "length": result.length,
+        "hasUpper": result.has_upper,
+        "hasLower": result.has_lower,
+        "hasDigit": result.has_digit,
+        "hasSpecial": result.has_special,
+        "hasKeyboardWalk": result.has_keyboard_walk,
+        "weakStructure": result.weak_structure,
+        "entropy": result.entropy,
+        "isCommon": result.is_common,
+        "breachCount": result.breach_count,
+        "crackTimes": estimate_crack_times(result.entropy),
+        "recommendations": prioritized_recommendations(result, result.score, result.is_common),
+        "policies": check_policy_compliance(result),
+        "risk": assess_risk(result.score, result.is_common),
+        "breakdown": {_camel_case(key): points for key, points in result.breakdown.items()},
+    }
+
+
+def build_report(password):
+    """Analyze a password (through the result cache) and build its page-shaped report"""
+    return report_from_result(cached_analyze(password))
+
+
+def build_reports(passwords):
+    """Analyze a batch of passwords and build their reports, in order"""
+    return [report_from_result(result) for result in cached_analyze_many(passwords)]
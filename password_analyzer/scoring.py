@@ -0,0 +1,286 @@
+# Password scoring core - no UI imports, safe to use from services and batch jobs
+import math
+
+from .breach import breach_count, is_breached
+from .profile import get_profile
+
+
+# Points taken off when at least this fraction of the password is keyboard walks
+KEYBOARD_PENALTY_COVERAGE = 0.5
+KEYBOARD_PENALTY = -10
+
+
+def is_common_password(password, breached=None):
+    """Check if a password is breached, or a l33t spelling of a common password
+
+    breached is the breached-corpus check result; it is looked up when omitted.
+    """
+    from .matching import leet_common_word
+
+    profile = get_profile(password)
+    if breached is None:
+        breached = is_breached(profile)
+    return breached or leet_common_word(profile) is not None
+
+
+def calculate_pool_entropy(password):
+    """Calculate entropy in bits assuming uniformly random characters from the pool"""
+    profile = get_profile(password)
+    if not profile.length:
+        return 0
+
+    # Character pool size (32 common special characters)
+    pool_size = profile.pool_size
+    if pool_size == 0:
+        return 0
+
+    # Entropy calculation
+    entropy = profile.length * math.log2(pool_size)
+    return round(entropy, 2)
+
+
+def calculate_entropy(password):
+    """Calculate password entropy in bits (accepts a password or its PasswordProfile)
+
+    The pool entropy, capped by log2 of the guesses the pattern matchers
+    need (dictionary words, keyboard walks, dates... are far cheaper to
+    guess than their length suggests) and, when a Markov model or PCFG
+    grammar is configured, by the guesses of a cracker enumerating by its
+    probability.
+    """
+    # Imported here: the matchers pull in re and build their tables at import
+    from .markov import get_model
+    from .matching import pattern_entropy
+    from .pcfg import estimate_structure
+
+    profile = get_profile(password)
+    entropy = calculate_pool_entropy(profile)
+    if not entropy:
+        return entropy
+    entropy = min(entropy, pattern_entropy(profile))
+    model = get_model()
+    if model is not None:
+        entropy = min(entropy, model.entropy(profile.password))
+    structure = estimate_structure(profile)
+    if structure is not None:
+        entropy = min(entropy, structure.entropy)
+    return entropy
+
+
+def score_breakdown(password, is_common=None):
+    """Get the points calculate_strength_score awards for each component
+
+    is_common is the is_common_password result; it is looked up when omitted.
+    """
+    profile = get_profile(password)
+    if not profile.length:
+        return {}
+
+    # Length points (max 40)
+    length = profile.length
+    length_points = 0
+    if length >= 8:
+        length_points += 10
+    if length >= 12:
+        length_points += 10
+    if length >= 16:
+        length_points += 10
+    if length >= 20:
+        length_points += 10
+
+    # Character variety points (max 40)
+    char_types = profile.char_types
+
+    # Entropy points (max 20)
+    entropy = calculate_entropy(profile)
+    if entropy > 50:
+        entropy_points = 20
+    elif entropy > 30:
+        entropy_points = 15
+    elif entropy > 20:
+        entropy_points = 10
+    elif entropy > 10:
+        entropy_points = 5
+    else:
+        entropy_points = 0
+
+    breakdown = {
+        "length": length_points,
+        "variety": char_types * 10,
+        "entropy": entropy_points,
+    }
+
+    # Penalty for passwords that are mostly keyboard walks ("1qaz2wsx!")
+    from .matching import keyboard_coverage
+
+    if keyboard_coverage(profile) >= KEYBOARD_PENALTY_COVERAGE:
+        breakdown["keyboard_penalty"] = KEYBOARD_PENALTY
+
+    # Penalty for common password (never below 10 points)
+    if is_common is None:
+        is_common = is_common_password(profile)
+    if is_common:
+        score = sum(breakdown.values())
+        breakdown["common_penalty"] = max(10, score - 30) - score
+
+    return breakdown
+
+
+def calculate_strength_score(password, is_common=None):
+    """Calculate password strength score (0-100)
+
+    is_common is the is_common_password result; it is looked up when omitted.
+    """
+    profile = get_profile(password)
+    if not profile.length:
+        return 0
+
+    return min(100, sum(score_breakdown(profile, is_common).values()))
+
+
+def get_strength_rating(score):
+    """Get rating based on score"""
+    if score >= 90:
+        return "A+ (EXCELLENT)", "#4CAF50"
+    elif score >= 80:
+        return "A (VERY GOOD)", "#8BC34A"
+    elif score >= 70:
+        return "B (GOOD)", "#CDDC39"
+    elif score >= 60:
+        return "C (FAIR)", "#FFEB3B"
+    elif score >= 50:
+        return "D (WEAK)", "#FFC107"
+    elif score >= 40:
+        return "E (POOR)", "#FF9800"
+    else:
+        return "F (VERY POOR)", "#F44336"
+
+
+def estimate_crack_time(entropy, guesses_per_second=None):
+    """Estimate crack time based on entropy (log2 of the guesses needed)
+
+    guesses_per_second defaults to the "Botnet" tier of the active attacker
+    model: 10^9 guesses per second unless a hash scheme is configured.
+    """
+    if guesses_per_second is None:
+        from .attacker import get_attacker_model
+
+        guesses_per_second = get_attacker_model().speed()
+    try:
+        possible_combinations = 2 ** entropy
+    except OverflowError:
+        return "Longer than the age of the universe"
+    seconds = possible_combinations / guesses_per_second
+
+    # Convert to readable time
+    if seconds < 1:
+        return "Instantly"
+    elif seconds < 60:
+        return f"{int(seconds)} seconds"
+    elif seconds < 3600:
+        return f"{int(seconds / 60)} minutes"
+    elif seconds < 86400:
+        return f"{int(seconds / 3600)} hours"
+    elif seconds < 31536000:
+        return f"{int(seconds / 86400)} days"
+    elif seconds < 3153600000:
+        return f"{int(seconds / 31536000)} years"
+    else:
+        return f"{int(seconds / 31536000):,} years"
+
+
+def get_recommendations(password, score, is_common=None):
+    """Get security recommendations (accepts a password or its PasswordProfile)"""
+    profile = get_profile(password)
+    recommendations = []
+
+    if score < 60:
+        recommendations.append("🔴 **CRITICAL:** Consider changing this password")
+
+    if profile.length < 8:
+        recommendations.append("🔴 Increase password length to at least 8 characters")
+    elif profile.length < 12:
+        recommendations.append("🟡 Increase password length to 12+ characters for better security")
+
+    if not profile.has_lower:
+        recommendations.append("🟡 Add lowercase letters (a-z)")
+    if not profile.has_upper:
+        recommendations.append("🟡 Add uppercase letters (A-Z)")
+    if not profile.has_digit:
+        recommendations.append("🟡 Add numbers (0-9)")
+    if not profile.has_special:
+        recommendations.append("🟡 Add special characters (!@#$%^&*)")
+    if profile.has_keyboard_walk:
+        recommendations.append("🟡 Avoid keyboard patterns like 'qwerty' or '1qaz2wsx'")
+    if profile.weak_structure:
+        from .pcfg import describe_structure
+
+        recommendations.append(f"🟡 Avoid predictable layouts ({describe_structure(profile.weak_structure)})")
+
+    if is_common is None:
+        is_common = is_common_password(profile)
+    if is_common:
+        recommendations.append("🔴 **WARNING:** This is a very common password!")
+
+    if score >= 80:
+        recommendations.append("✅ Your password is strong! Keep it up!")
+
+    return recommendations
+
+
+class AnalysisResult:
+    """Structured result of a single password analysis (never holds the password)"""
+
+    __slots__ = (
+        "length", "has_lower", "has_upper", "has_digit", "has_special",
+        "has_keyboard_walk", "weak_structure", "entropy", "score", "rating", "rating_color", "crack_time",
+        "is_common", "breach_count", "breakdown", "recommendations",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    def to_dict(self):
+        """Convert the result to a plain dict (JSON serializable)"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"AnalysisResult(score={self.score}, rating={self.rating!r}, entropy={self.entropy})"
+
+
+def analyze(password):
+    """Run the full analysis for one password"""
+    # Scan the password once and check the breached corpus once; every step
+    # below works from those
+    profile = get_profile(password)
+    prevalence = breach_count(profile)
+    is_common = is_common_password(profile, prevalence > 0)
+    entropy = calculate_entropy(profile)
+    breakdown = score_breakdown(profile, is_common)
+    score = min(100, sum(breakdown.values()))
+    rating, rating_color = get_strength_rating(score)
+
+    return AnalysisResult(
+        length=profile.length,
+        has_lower=profile.has_lower,
+        has_upper=profile.has_upper,
+        has_digit=profile.has_digit,
+        has_special=profile.has_special,
+        has_keyboard_walk=profile.has_keyboard_walk,
+        weak_structure=profile.weak_structure,
+        entropy=entropy,
+        score=score,
+        rating=rating,
+        rating_color=rating_color,
+        crack_time=estimate_crack_time(entropy),
+        is_common=is_common,
+        breach_count=prevalence,
+        breakdown=breakdown,
+        recommendations=get_recommendations(profile, score, is_common),
+    )
+
+
+def analyze_many(passwords):
+    """Analyze every password of an iterable, returning a list of results"""
+    return [analyze(password) for password in passwords]
@@ -0,0 +1,189 @@
+# NumPy batch engine - same results as the scalar functions in scoring.py
+#
+# A batch is packed into a padded 2-D array of code points (uint8 when the
+# whole batch is ASCII, uint32 otherwise) and every step of
+# calculate_entropy / calculate_strength_score / get_strength_rating runs as
+# an array operation over it.  Requires numpy, which the scalar core does not.
+import math
+
+import numpy as np
+
+from .breach import get_corpus
+from .markov import get_model as get_markov_model
+from .matching import keyboard_coverage, pattern_entropy
+from .pcfg import estimate_structure, get_model as get_grammar
+from .profile import get_profile
+from .scoring import KEYBOARD_PENALTY, KEYBOARD_PENALTY_COVERAGE, is_common_password
+
+# Character class bits
+LOWER = 1
+UPPER = 2
+DIGIT = 4
+SPECIAL = 8
+
+# Pool size and number of character types for every combination of class bits
+POOL_SIZES = np.array(
+    [(26 if f & LOWER else 0) + (26 if f & UPPER else 0)
+     + (10 if f & DIGIT else 0) + (32 if f & SPECIAL else 0) for f in range(16)],
+    dtype=np.int64,
+)
+CHAR_TYPES = np.array([bin(f).count("1") for f in range(16)], dtype=np.int64)
+
+# Rating labels from worst to best, with the score each one starts at
+RATING_BOUNDS = np.array([40, 50, 60, 70, 80, 90])
+RATINGS = np.array([
+    "F (VERY POOR)", "E (POOR)", "D (WEAK)", "C (FAIR)",
+    "B (GOOD)", "A (VERY GOOD)", "A+ (EXCELLENT)",
+])
+
+
+def classify_char(c):
+    """Get the class bits of one character (same tests as the scalar code)"""
+    bits = 0
+    if c.islower():
+        bits |= LOWER
+    if c.isupper():
+        bits |= UPPER
+    if c.isdigit():
+        bits |= DIGIT
+    if not c.isalnum():
+        bits |= SPECIAL
+    return bits
+
+
+# Lookup table for the ASCII fast path
+ASCII_CLASSES = np.array([classify_char(chr(i)) for i in range(128)], dtype=np.uint8)
+
+
+def pack(passwords):
+    """Pack a batch into a zero-padded (n, max_length) code point array
+
+    Returns (codes, lengths, flat) where flat holds the concatenated code
+    points without padding. The dtype is uint8 for all-ASCII batches.
+    """
+    lengths = np.fromiter((len(p) for p in passwords), dtype=np.int64, count=len(passwords))
+    joined = "".join(passwords)
+    if joined.isascii():
+        flat = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+    else:
+        flat = np.frombuffer(joined.encode("utf-32-le", "surrogatepass"), dtype="<u4").astype(np.uint32)
+
+    max_length = int(lengths.max()) if len(lengths) else 0
+    mask = np.arange(max_length) < lengths[:, None]
+    codes = np.zeros((len(passwords), max_length), dtype=flat.dtype)
+    codes[mask] = flat
+    return codes, lengths, flat
+
+
+def class_flags(codes, lengths, flat):
+    """Get the OR of the character class bits of every password"""
+    if flat.dtype == np.uint8:
+        flat_bits = ASCII_CLASSES[flat]
+    else:
+        # Classify each distinct code point once with the str methods
+        unique, inverse = np.unique(flat, return_inverse=True)
+        unique_bits = np.array([classify_char(chr(c)) for c in unique.tolist()], dtype=np.uint8)
+        flat_bits = unique_bits[inverse.reshape(-1)]
+
+    mask = np.arange(codes.shape[1]) < lengths[:, None]
+    bits = np.zeros(codes.shape, dtype=np.uint8)
+    bits[mask] = flat_bits
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def entropy_from_flags(flags, lengths):
+    """Pool entropy in bits, rounded exactly like calculate_pool_entropy
+
+    Python's round() and np.round() can disagree in the last digit, so each
+    distinct (pool, length) pair is rounded once with round() and scattered back.
+    """
+    stride = int(lengths.max(initial=0)) + 1
+    keys = POOL_SIZES[flags] * stride + lengths
+    unique, inverse = np.unique(keys, return_inverse=True)
+
+    values = np.empty(len(unique), dtype=np.float64)
+    for i, key in enumerate(unique.tolist()):
+        pool, length = divmod(key, stride)
+        values[i] = round(length * math.log2(pool), 2) if pool and length else 0.0
+    return values[inverse.reshape(-1)]
+
+
+def score_from_parts(flags, lengths, entropy, common, walks=None):
+    """Strength score (0-100) from class flags, lengths, entropy and the common mask
+
+    walks marks the passwords that take the keyboard walk penalty.
+    """
+    score = 10 * ((lengths >= 8).astype(np.int64) + (lengths >= 12) + (lengths >= 16) + (lengths >= 20))
+    score += CHAR_TYPES[flags] * 10
+    score += np.select(
+        [entropy > 50, entropy > 30, entropy > 20, entropy > 10],
+        [20, 15, 10, 5],
+        default=0,
+    )
+    if walks is not None:
+        score = np.where(walks, score + KEYBOARD_PENALTY, score)
+    score = np.where(common, np.maximum(10, score - 30), score)
+    score = np.minimum(100, score)
+    return np.where(lengths == 0, 0, score)
+
+
+def rate(scores):
+    """Rating label for every score"""
+    return RATINGS[np.searchsorted(RATING_BOUNDS, scores, side="right")]
+
+
+def evaluate(passwords, chunk_size=65536):
+    """Score a batch of passwords with array operations
+
+    Returns a dict of NumPy arrays: length, flags, pool_size, entropy, score
+    and rating. Batches are processed in chunks of chunk_size passwords so
+    the padded arrays stay bounded for very large batches.
+    """
+    passwords = list(passwords)
+    corpus = get_corpus()
+    model = get_markov_model()
+    grammar = get_grammar()
+    parts = []
+    for start in range(0, len(passwords), chunk_size):
+        chunk = passwords[start:start + chunk_size]
+        codes, lengths, flat = pack(chunk)
+        flags = class_flags(codes, lengths, flat)
+        # The pattern matchers have no array form: cap the pool entropy and
+        # find keyboard walks per password, as the scalar scoring does
+        profiles = [get_profile(p) for p in chunk]
+        entropy = np.minimum(entropy_from_flags(flags, lengths), np.fromiter(
+            (pattern_entropy(p) for p in profiles), dtype=np.float64, count=len(chunk)))
+        if model is not None:
+            # Rounded per element like MarkovModel.entropy (np.round differs)
+            entropy = np.minimum(entropy, np.fromiter(
+                (round(bits, 2) for bits in model.batch_guesses_log2(chunk).tolist()),
+                dtype=np.float64, count=len(chunk)))
+        if grammar is not None:
+            entropy = np.minimum(entropy, np.fromiter(
+                (estimate_structure(p).entropy for p in profiles), dtype=np.float64, count=len(chunk)))
+        walks = np.fromiter((keyboard_coverage(p) >= KEYBOARD_PENALTY_COVERAGE for p in profiles),
+                            dtype=bool, count=len(chunk))
+        is_common = np.fromiter((is_common_password(p, p.password in corpus) for p in profiles),
+                                dtype=bool, count=len(chunk))
+        scores = score_from_parts(flags, lengths, entropy, is_common, walks)
+        parts.append((lengths, flags, entropy, scores))
+
+    if not parts:
+        empty = np.zeros(0, dtype=np.int64)
+        parts.append((empty, empty.astype(np.uint8), empty.astype(np.float64), empty))
+
+    lengths, flags, entropy, scores = (np.concatenate(column) for column in zip(*parts))
+    return {
+        "length": lengths,
+        "flags": flags,
+        "pool_size": POOL_SIZES[flags],
+        "entropy": entropy,
+        "score": scores,
+        "rating": rate(scores),
+    }
+
+
+def score_batch(passwords, chunk_size=65536):
+    """Get (scores, ratings) arrays for a batch of passwords"""
+    result = evaluate(passwords, chunk_size)
+    return result["score"], result["rating"]
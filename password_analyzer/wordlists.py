@@ -0,0 +1,47 @@
+# Bundled word lists, loaded from disk the first time they are needed
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Ranked lists (most common first) used by the dictionary matchers
+DICTIONARIES = ("common_passwords", "common_words")
+
+# Extra ranked word lists for the dictionary matchers (os.pathsep separated)
+WORDLISTS_ENV = "PASSWORD_ANALYZER_WORDLISTS"
+
+_loaded = {}
+
+
+def load_wordlist(name):
+    """Load a bundled word list (one entry per line) on first use"""
+    words = _loaded.get(name)
+    if words is None:
+        words = read_wordlist(os.path.join(DATA_DIR, name + ".txt"))
+        _loaded[name] = words
+    return words
+
+
+def read_wordlist(path):
+    """Read a word list file (one entry per line)"""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def common_passwords():
+    """Get the common passwords list"""
+    return load_wordlist("common_passwords")
+
+
+def dictionaries():
+    """Get the ranked word lists for dictionary matching, as {name: words}
+
+    The bundled DICTIONARIES, plus the files named by
+    $PASSWORD_ANALYZER_WORDLISTS (named after the file, without extension).
+    """
+    lists = {name: load_wordlist(name) for name in DICTIONARIES}
+    paths = os.environ.get(WORDLISTS_ENV)
+    if paths:
+        for path in paths.split(os.pathsep):
+            name = os.path.splitext(os.path.basename(path))[0]
+            lists[name] = read_wordlist(path)
+    return lists
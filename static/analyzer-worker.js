@@ -0,0 +1,501 @@
+// Password analysis engine of the analyzer page
+//
+// Runs in a Web Worker so scoring never blocks the page.  Message API:
+//
+//   page -> worker   { type: 'analyze', id, password }
+//                    { type: 'attackers', attackers: { name: guesses per second } }
+//   worker -> page   { id, report } or { id, error }
+//
+// Analyses are run one at a time and only the latest pending request is
+// run: requests superseded while the worker was busy are dropped (the page
+// only waits for the id it sent last).  Where workers are unavailable, such
+// as a page opened from file://, the page loads this script directly and
+// calls self.PasswordEngine.analyze on the main thread.
+//
+// Live scoring sends the password again after every keystroke, so the engine
+// keeps the state of the last password (AnalysisState) and only processes
+// the characters typed or deleted at its end.
+self.PasswordEngine = (() => {
+    // Common passwords list (hashed set - constant-time lookups)
+    const commonPasswords = new Set([
+        "123456", "password", "12345678", "qwerty", "123456789",
+        "12345", "admin", "welcome", "monkey", "dragon", "letmein",
+        "football", "iloveyou", "123123", "sunshine", "password1",
+        "princess", "abc123", "111111", "000000", "1234", "superman",
+        "trustno1", "master", "hello", "charlie", "secret", "123qwe",
+        "password123", "admin123", "login", "welcome123", "passw0rd",
+        "1234567", "1234567890", "qwerty123", "1q2w3e4r", "qwertyuiop",
+        "asdfgh", "zxcvbnm", "password1234", "12345678910"
+    ]);
+
+    // L33t spellings of the common passwords ("p@ssw0rd"): each word is
+    // indexed under its canonical form in a trie, walked one character at a
+    // time as the password is typed; at the end of the password the few
+    // candidate words of the node are checked character by character
+    const leetCanonical = {
+        '!': 'i', '$': 's', '%': 'x', '(': 'c', '+': 'i', '0': 'o', '1': 'i', '2': 'z',
+        '3': 'e', '4': 'a', '5': 's', '6': 'g', '7': 'i', '8': 'b', '9': 'g', '<': 'c',
+        '@': 'a', '[': 'c', 'l': 'i', 't': 'i', '{': 'c', '|': 'i'
+    };
+    const leetLetters = {
+        '!': 'i', '$': 's', '%': 'x', '(': 'c', '+': 't', '0': 'o', '1': 'il', '2': 'z',
+        '3': 'e', '4': 'a', '5': 's', '6': 'g', '7': 'lt', '8': 'b', '9': 'g', '<': 'c',
+        '@': 'a', '[': 'c', '{': 'c', '|': 'il'
+    };
+
+    // Trie node after reading lowercase text from node (null once no common
+    // password can match any more)
+    function walk(node, text) {
+        for (let i = 0; node && i < text.length; i++) {
+            const c = text[i];
+            node = node.next.get(leetCanonical[c] || c) || null;
+        }
+        return node;
+    }
+
+    const commonTrie = { next: new Map(), words: null };
+    for (const word of commonPasswords) {
+        let node = commonTrie;
+        for (const c of word) {
+            const key = leetCanonical[c] || c;
+            if (!node.next.has(key)) node.next.set(key, { next: new Map(), words: null });
+            node = node.next.get(key);
+        }
+        (node.words = node.words || []).push(word);
+    }
+
+    // Whether token spells word with l33t symbols (each symbol standing for one letter)
+    function isLeetSpelling(word, token) {
+        const subs = {};
+        let used = false;
+        for (let i = 0; i < word.length; i++) {
+            const letter = word[i], c = token[i];
+            if (c === letter) continue;
+            const letters = leetLetters[c];
+            if (!letters || !letters.includes(letter)) return false;
+            if (subs[c] && subs[c] !== letter) return false;
+            subs[c] = letter;
+            used = true;
+        }
+        return used;
+    }
+
+    // Character classes, as counted in AnalysisState.counts
+    const LOWER = 0, UPPER = 1, DIGIT = 2, SPECIAL = 3;
+
+    function charClass(code) {
+        if (code >= 97 && code <= 122) return LOWER;
+        if (code >= 65 && code <= 90) return UPPER;
+        if (code >= 48 && code <= 57) return DIGIT;
+        return SPECIAL;
+    }
+
+    // Analysis state of the password being typed.  Typing or deleting at
+    // the end of the password updates it one character at a time: the
+    // class counts, and the common-password trie node reached by every
+    // prefix, are pushed and popped like a stack, so a keystroke costs the
+    // same whatever the length.  Any other edit rebuilds it from scratch.
+    class AnalysisState {
+        constructor() {
+            this.reset();
+        }
+
+        reset() {
+            this.password = '';
+            this.counts = [0, 0, 0, 0];
+            // Per character: its class, and the trie node after it
+            this.classes = [];
+            this.nodes = [commonTrie];
+        }
+
+        get length() {
+            return this.classes.length;
+        }
+
+        push(unit) {
+            const code = unit.charCodeAt(0);
+            const cls = charClass(code);
+            this.counts[cls]++;
+            this.classes.push(cls);
+            // Lowercased one character at a time, as toLowerCase does for
+            // every character a common password can be made of
+            const lowered = code >= 65 && code <= 90 ? String.fromCharCode(code + 32)
+                : code < 128 ? unit : unit.toLowerCase();
+            this.nodes.push(walk(this.nodes[this.nodes.length - 1], lowered));
+        }
+
+        pop() {
+            this.counts[this.classes.pop()]--;
+            this.nodes.pop();
+        }
+
+        // Move the state to password
+        update(password) {
+            const current = this.password;
+            if (password.length >= current.length && password.startsWith(current)) {
+                // Typed at the end: only the new characters are added below
+            } else if (current.startsWith(password)) {
+                // Deleted at the end
+                while (this.length > password.length) this.pop();
+            } else {
+                // Edited elsewhere: full recompute
+                this.reset();
+            }
+            for (let i = this.length; i < password.length; i++) {
+                this.push(password[i]);
+            }
+            this.password = password;
+        }
+
+        // Length, character class counts and pool size of the password
+        profile() {
+            const [lower, upper, digit, special] = this.counts;
+
+            let poolSize = 0;
+            if (lower) poolSize += 26;
+            if (upper) poolSize += 26;
+            if (digit) poolSize += 10;
+            if (special) poolSize += 32;
+
+            return {
+                length: this.length,
+                lower, upper, digit, special,
+                hasLower: lower > 0,
+                hasUpper: upper > 0,
+                hasDigit: digit > 0,
+                hasSpecial: special > 0,
+                poolSize
+            };
+        }
+
+        // Whether the password is a common password or a l33t spelling of one
+        isCommon() {
+            const node = this.nodes[this.nodes.length - 1];
+            if (!node || !node.words) return false;
+            // No longer than the longest common password here
+            const lowered = this.password.toLowerCase();
+            return node.words.some(word => word === lowered || (word.length === lowered.length &&
+                                                                isLeetSpelling(word, lowered)));
+        }
+    }
+
+    // Calculate password entropy in bits (rounded to 2 decimal places)
+    function calculateEntropy(profile) {
+        if (profile.length === 0 || profile.poolSize === 0) return 0;
+
+        // Calculate and round to 2 decimal places
+        const entropy = Math.log2(Math.pow(profile.poolSize, profile.length));
+        return Math.round(entropy * 100) / 100;
+    }
+
+    // Calculate strength score (0-100)
+    function calculateScore(profile, entropy, isCommon) {
+        const { hasUpper, hasLower, hasDigit, hasSpecial } = profile;
+        let score = 0;
+        const breakdown = {};
+
+        // Length score (max 30)
+        const lengthScore = Math.min(30, profile.length * 3);
+        score += lengthScore;
+        breakdown.length = Math.round(lengthScore * 100) / 100;
+
+        // Character variety (max 40)
+        let varietyScore = 0;
+        if (hasUpper) varietyScore += 10;
+        if (hasLower) varietyScore += 10;
+        if (hasDigit) varietyScore += 10;
+        if (hasSpecial) varietyScore += 10;
+        score += varietyScore;
+        breakdown.variety = varietyScore;
+
+        // Bonus for mixed case (10)
+        if (hasUpper && hasLower) {
+            score += 10;
+            breakdown.mixedCase = 10;
+        }
+
+        // Entropy bonus (max 20)
+        const entropyScore = Math.min(20, entropy / 5);
+        score += entropyScore;
+        breakdown.entropy = Math.round(entropyScore * 100) / 100;
+
+        // Penalty for common password
+        if (isCommon) {
+            score = Math.max(10, score - 30);
+            breakdown.commonPenalty = -30;
+        }
+
+        // Ensure score is between 0-100 and round to 2 decimal places
+        score = Math.max(0, Math.min(100, Math.round(score * 100) / 100));
+
+        return { score, breakdown };
+    }
+
+    // Get rating based on score
+    function getRating(score) {
+        if (score >= 80) {
+            return { rating: "A+ (EXCELLENT)", color: "#27ae60" };
+        } else if (score >= 70) {
+            return { rating: "A (VERY GOOD)", color: "#2ecc71" };
+        } else if (score >= 60) {
+            return { rating: "B (GOOD)", color: "#f1c40f" };
+        } else if (score >= 50) {
+            return { rating: "C (FAIR)", color: "#f39c12" };
+        } else if (score >= 40) {
+            return { rating: "D (POOR)", color: "#e67e22" };
+        } else {
+            return { rating: "F (VERY POOR)", color: "#e74c3c" };
+        }
+    }
+
+    // Attacker guessing speeds (guesses/second); the page replaces them with
+    // the server's attacker model (/api/attackers) when there is one
+    let attackerSpeeds = {
+        "Basic Computer": 1000,
+        "Hacker (GPU)": 1000000,
+        "Botnet": 1000000000,
+        "Supercomputer": 1000000000000
+    };
+
+    function setAttackerSpeeds(speeds) {
+        attackerSpeeds = speeds;
+    }
+
+    // Estimate crack time for different attackers
+    function estimateCrackTime(entropy) {
+        const results = {};
+        const totalCombinations = Math.pow(2, entropy);
+
+        Object.entries(attackerSpeeds).forEach(([name, speed]) => {
+            let seconds = totalCombinations / speed;
+
+            let timeStr, color;
+
+            if (seconds < 1) {
+                timeStr = "Instantly";
+                color = "#e74c3c";
+            } else if (seconds < 60) {
+                timeStr = `${seconds.toFixed(1)} seconds`;
+                color = "#e74c3c";
+            } else if (seconds < 3600) {
+                const minutes = seconds / 60;
+                timeStr = minutes < 2 ? `${minutes.toFixed(1)} minute` : `${minutes.toFixed(1)} minutes`;
+                color = "#f39c12";
+            } else if (seconds < 86400) {
+                const hours = seconds / 3600;
+                timeStr = hours < 2 ? `${hours.toFixed(1)} hour` : `${hours.toFixed(1)} hours`;
+                color = "#f1c40f";
+            } else if (seconds < 31536000) {
+                const days = seconds / 86400;
+                timeStr = days < 2 ? `${days.toFixed(1)} day` : `${days.toFixed(1)} days`;
+                color = "#2ecc71";
+            } else {
+                const years = seconds / 31536000;
+                timeStr = years < 2 ? `${years.toFixed(1)} year` : `${years.toFixed(1)} years`;
+                color = years < 100 ? "#27ae60" : "#3498db";
+            }
+
+            results[name] = { time: timeStr, color };
+        });
+
+        return results;
+    }
+
+    // Generate security recommendations
+    function getRecommendations(profile, score, isCommon) {
+        const { length, hasUpper, hasLower, hasDigit, hasSpecial } = profile;
+        const recs = [];
+
+        if (isCommon) {
+            recs.push({ priority: "CRITICAL", text: "CHANGE PASSWORD - It's in common password lists" });
+        }
+
+        if (length < 8) {
+            recs.push({ priority: "HIGH", text: `Increase length from ${length} to at least 8 characters` });
+        } else if (length < 12) {
+            recs.push({ priority: "MEDIUM", text: `Increase length from ${length} to 12+ characters` });
+        }
+
+        if (!hasUpper) {
+            recs.push({ priority: "MEDIUM", text: "Add uppercase letters (A-Z)" });
+        }
+
+        if (!hasLower) {
+            recs.push({ priority: "MEDIUM", text: "Add lowercase letters (a-z)" });
+        }
+
+        if (!hasDigit) {
+            recs.push({ priority: "MEDIUM", text: "Add numbers (0-9)" });
+        }
+
+        if (!hasSpecial) {
+            recs.push({ priority: "HIGH", text: "Add special characters (!@#$%^&*)" });
+        }
+
+        if (score < 60) {
+            recs.push({ priority: "LOW", text: "Consider using a passphrase (e.g., 'CorrectHorseBatteryStaple')" });
+        }
+
+        // If no recommendations and password is weak, add generic one
+        if (recs.length === 0 && score < 70) {
+            recs.push({ priority: "LOW", text: "Your password is decent but could be improved with more length" });
+        }
+
+        // Sort by priority
+        const priorityOrder = { "CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3 };
+        recs.sort((a, b) => priorityOrder[a.priority] - priorityOrder[b.priority]);
+
+        return recs.slice(0, 6);
+    }
+
+    // Check policy compliance
+    function checkPolicyCompliance(profile) {
+        const { length, hasUpper, hasLower, hasDigit, hasSpecial } = profile;
+        const policies = {
+            "Basic": { minLength: 6, requires: [] },
+            "Standard": { minLength: 8, requires: ["upper", "lower", "digit"] },
+            "Strong": { minLength: 12, requires: ["upper", "lower", "digit", "special"] },
+            "Military": { minLength: 16, requires: ["upper", "lower", "digit", "special"] }
+        };
+
+        const compliance = {};
+
+        Object.entries(policies).forEach(([name, policy]) => {
+            let passed = 0;
+            let total = 0;
+
+            // Length check
+            total++;
+            if (length >= policy.minLength) passed++;
+
+            // Character requirements
+            policy.requires.forEach(req => {
+                total++;
+                if (req === "upper" && hasUpper) passed++;
+                if (req === "lower" && hasLower) passed++;
+                if (req === "digit" && hasDigit) passed++;
+                if (req === "special" && hasSpecial) passed++;
+            });
+
+            const percentage = total > 0 ? (passed / total) * 100 : 0;
+            compliance[name] = {
+                passed,
+                total,
+                percentage: Math.round(percentage),
+                compliant: percentage === 100
+            };
+        });
+
+        return compliance;
+    }
+
+    // Assess risk level
+    function assessRisk(score, isCommon) {
+        if (isCommon) {
+            return {
+                level: "CRITICAL",
+                description: "This password is in common password lists and can be cracked instantly",
+                color: "#c0392b",
+                action: "CHANGE PASSWORD IMMEDIATELY"
+            };
+        }
+
+        if (score >= 80) {
+            return {
+                level: "VERY LOW",
+                description: "Excellent password security - very difficult to crack",
+                color: "#27ae60",
+                action: "Password is secure"
+            };
+        } else if (score >= 70) {
+            return {
+                level: "LOW",
+                description: "Good password security - adequate for most purposes",
+                color: "#2ecc71",
+                action: "Password is acceptable"
+            };
+        } else if (score >= 60) {
+            return {
+                level: "MODERATE",
+                description: "Moderate security risk - could be improved",
+                color: "#f1c40f",
+                action: "Consider improving password"
+            };
+        } else if (score >= 50) {
+            return {
+                level: "MEDIUM",
+                description: "Medium security risk - vulnerable to determined attackers",
+                color: "#f39c12",
+                action: "Improve password soon"
+            };
+        } else if (score >= 40) {
+            return {
+                level: "HIGH",
+                description: "High security risk - vulnerable to basic attacks",
+                color: "#e67e22",
+                action: "Change password as soon as possible"
+            };
+        } else {
+            return {
+                level: "VERY HIGH",
+                description: "Very high security risk - can be cracked quickly",
+                color: "#e74c3c",
+                action: "CHANGE PASSWORD IMMEDIATELY"
+            };
+        }
+    }
+
+    // State of the last password analyzed: live scoring sends the password
+    // again after every keystroke
+    const state = new AnalysisState();
+
+    // Full analysis of one password, as rendered by the page
+    function analyze(password) {
+        // Basic character analysis (incremental over the last password)
+        state.update(password);
+        const profile = state.profile();
+        const isCommon = state.isCommon();
+
+        // Calculate entropy (rounded to 2 decimal places)
+        const entropy = calculateEntropy(profile);
+
+        const { score, breakdown } = calculateScore(profile, entropy, isCommon);
+        const { rating, color } = getRating(score);
+
+        return {
+            profile, entropy, score, breakdown, rating, color,
+            crackTimes: estimateCrackTime(entropy),
+            recommendations: getRecommendations(profile, score, isCommon),
+            policies: checkPolicyCompliance(profile),
+            risk: assessRisk(score, isCommon)
+        };
+    }
+
+    return { analyze, setAttackerSpeeds, AnalysisState };
+})();
+
+if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {
+    let pending = null;
+
+    function runPending() {
+        const message = pending;
+        pending = null;
+        try {
+            self.postMessage({ id: message.id, report: self.PasswordEngine.analyze(message.password) });
+        } catch (error) {
+            self.postMessage({ id: message.id, error: String(error) });
+        }
+    }
+
+    self.onmessage = event => {
+        const message = event.data;
+        if (message.type === 'attackers') {
+            self.PasswordEngine.setAttackerSpeeds(message.attackers);
+        } else if (message.type === 'analyze') {
+            // Run after the messages already queued, so a burst of keystrokes
+            // only analyzes the last password
+            if (!pending) setTimeout(runPending, 0);
+            pending = message;
+        }
+    };
+}
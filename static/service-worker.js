@@ -0,0 +1,46 @@
+// Service worker of the analyzer page
+//
+// Precaches the app shell (the page, the analysis engine and, once
+// build_assets.py has run, the self-hosted fonts and Chart.js) so repeat
+// visits load from the cache and the page works offline.  web.py serves
+// this file as /service-worker.js, preceded by the constants it needs:
+//
+//   const CACHE_NAME = 'password-analyzer-<version>';
+//   const PRECACHE_URLS = [ ...urls relative to this script ];
+//
+// The version is a hash of every precached response, so any change to them
+// makes the browser install a new worker.  It takes over once the pages of
+// the old one are closed (their lazily loaded files stay in the old cache
+// until then) and deletes the old cache.
+const CACHE_PREFIX = 'password-analyzer-';
+const SHELL_URL = new URL('./', self.location).href;
+const API_PATH = new URL('api/', self.location).pathname;
+
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(CACHE_NAME).then(cache => cache.addAll(PRECACHE_URLS)));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(caches.keys()
+        .then(names => Promise.all(names
+            .filter(name => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+            .map(name => caches.delete(name))))
+        .then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    // Only the app shell: API calls and other sites always go to the network
+    if (request.method !== 'GET' || url.origin !== self.location.origin ||
+            url.pathname.startsWith(API_PATH)) {
+        return;
+    }
+    // The page, whatever its query string (?perf) or name (/index.html)
+    const key = request.mode === 'navigate' &&
+        (url.href.split(/[?#]/)[0] === SHELL_URL || url.pathname.endsWith('/index.html'))
+        ? SHELL_URL : request;
+    event.respondWith(caches.open(CACHE_NAME)
+        .then(cache => cache.match(key))
+        .then(cached => cached || fetch(request)));
+});
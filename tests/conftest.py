@@ -0,0 +1,40 @@
+import http.client
+import threading
+
+import pytest
+
+
+class Client:
+    """HTTP/1.1 client of an in-process server, one connection per request"""
+
+    def __init__(self, port):
+        self.port = port
+
+    def request(self, method, path, body=None, headers=None):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        try:
+            connection.request(method, path, body=body, headers=headers or {})
+            response = connection.getresponse()
+            return response.status, response.headers, response.read()
+        finally:
+            connection.close()
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """A PooledHTTPServer on an ephemeral port, run from an empty working directory"""
+    import web
+
+    monkeypatch.chdir(tmp_path)
+    httpd = web.PooledHTTPServer(("127.0.0.1", 0), web.PasswordAnalyzerHandler, workers=4)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def client(server):
+    return Client(server.server_address[1])
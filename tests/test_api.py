@@ -0,0 +1,69 @@
+import json
+import socket
+
+import pytest
+
+import web
+from password_analyzer.report import build_report
+
+
+def post(client, path, body, content_type="application/json"):
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode("utf-8")
+    status, headers, data = client.request("POST", path, body, {"Content-Type": content_type})
+    return status, headers, json.loads(data) if data else None
+
+
+def test_analyze_returns_the_page_report(client):
+    status, headers, report = post(client, "/api/analyze", {"password": "Tr0ub4dor&3"})
+    assert status == 200
+    assert headers["Cache-Control"] == "no-store"
+    assert report == json.loads(json.dumps(build_report("Tr0ub4dor&3")))
+    assert set(report["crackTimes"]) and report["policies"]
+
+
+def test_batch_keeps_the_order_as_json_and_ndjson(client):
+    passwords = ["password", "Tr0ub4dor&3", "", "İpassword"]
+    status, _, reports = post(client, "/api/analyze/batch", passwords)
+    assert status == 200
+    assert [report["score"] for report in reports] == [build_report(p)["score"] for p in passwords]
+
+    status, _, wrapped = post(client, "/api/analyze/batch",
+                              {"passwords": [{"password": p} for p in passwords]})
+    assert wrapped == reports
+
+    body = "\n".join(json.dumps(p) for p in passwords).encode("utf-8") + b"\n\n"
+    status, headers, data = client.request("POST", "/api/analyze/batch", body,
+                                           {"Content-Type": "application/x-ndjson"})
+    assert status == 200 and headers["Content-Type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in data.splitlines()] == reports
+
+
+@pytest.mark.parametrize("path, body, status", [
+    ("/api/analyze", b"{not json", 400),
+    ("/api/analyze", {"password": 123}, 400),
+    ("/api/analyze", {}, 400),
+    ("/api/analyze/batch", {"passwords": "password"}, 400),
+    ("/api/analyze/batch", ["password", None], 400),
+    ("/api/nothing", {}, 404),
+])
+def test_errors_are_json_and_close_the_connection(client, path, body, status):
+    got, headers, data = post(client, path, body)
+    assert got == status
+    assert "error" in data
+    assert headers["Connection"] == "close"
+
+
+def test_request_limits(client, monkeypatch):
+    monkeypatch.setattr(web, "MAX_BATCH_SIZE", 2)
+    status, _, data = post(client, "/api/analyze/batch", ["a", "b", "c"])
+    assert status == 413 and "error" in data
+
+    monkeypatch.setattr(web, "MAX_REQUEST_BYTES", 10)
+    status, _, data = post(client, "/api/analyze", {"password": "long enough"})
+    assert status == 413
+
+    # No Content-Length at all
+    with socket.create_connection(("127.0.0.1", client.port)) as sock:
+        sock.sendall(b"POST /api/analyze HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        assert sock.recv(4096).startswith(b"HTTP/1.1 411 ")
@@ -0,0 +1,101 @@
+import pytest
+
+from password_analyzer import attacker
+from password_analyzer.attacker import (
+    HASH_ENV,
+    LEGACY_SPEEDS,
+    PRIMITIVES,
+    AttackerModel,
+    HashScheme,
+    calibrate,
+    get_attacker_model,
+    set_attacker_model,
+)
+
+# Every primitive at its reference speed: models become exact published figures
+REFERENCE = {name: reference for name, (reference, _) in PRIMITIVES.items()}
+
+
+@pytest.fixture(autouse=True)
+def default_model(monkeypatch):
+    monkeypatch.delenv(HASH_ENV, raising=False)
+    set_attacker_model(None)
+    yield
+    set_attacker_model(None)
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("MD5", "md5"),
+    ("bcrypt:12", "bcrypt:cost=12"),
+    ("bcrypt", "bcrypt:cost=10"),
+    ("pbkdf2-sha256", "pbkdf2-sha256:iterations=600000"),
+    ("scrypt:n=1024", "scrypt:n=1024,r=8,p=1"),
+    ("argon2id:m=65536,t=3,p=4", "argon2id:m=65536,t=3,p=4"),
+])
+def test_parse(spec, expected):
+    scheme = HashScheme.parse(spec)
+    assert str(scheme) == expected
+    assert str(HashScheme.parse(str(scheme))) == expected
+
+
+@pytest.mark.parametrize("spec", ["rot13", "md5:5", "bcrypt:cost=x", "bcrypt:rounds=5",
+                                  "scrypt:n=0", "pbkdf2-md5"])
+def test_parse_rejects_bad_specs(spec):
+    with pytest.raises(ValueError):
+        HashScheme.parse(spec)
+
+
+def test_speeds_follow_the_scheme_cost():
+    md5 = dict(AttackerModel.for_scheme("md5", REFERENCE).speeds)
+    assert md5["Hacker (GPU)"] == pytest.approx(PRIMITIVES["md5"][1])
+    assert md5["Basic Computer"] == pytest.approx(4 * PRIMITIVES["md5"][0])
+
+    bcrypt5 = AttackerModel.for_scheme("bcrypt:5", REFERENCE)
+    bcrypt6 = AttackerModel.for_scheme("bcrypt:6", REFERENCE)
+    assert bcrypt5.speed("Hacker (GPU)") == pytest.approx(PRIMITIVES["bcrypt"][1])
+    assert bcrypt6.speed() == pytest.approx(bcrypt5.speed() / 2)
+
+    pbkdf2 = AttackerModel.for_scheme("pbkdf2-sha256:1000", REFERENCE)
+    assert pbkdf2.speed() == pytest.approx(
+        AttackerModel.for_scheme("sha256", REFERENCE).speed() / 2000)
+    with pytest.raises(KeyError):
+        pbkdf2.speed("Quantum")
+
+
+def test_active_model(monkeypatch):
+    assert get_attacker_model().speeds == LEGACY_SPEEDS
+    assert get_attacker_model().to_dict()["scheme"] is None
+
+    set_attacker_model(None)
+    monkeypatch.setattr(attacker, "_calibration", REFERENCE)
+    monkeypatch.setenv(HASH_ENV, "bcrypt:12")
+    assert get_attacker_model().to_dict() == AttackerModel.for_scheme("bcrypt:12", REFERENCE).to_dict()
+
+    model = AttackerModel.for_scheme("ntlm", REFERENCE)
+    set_attacker_model(model)
+    assert get_attacker_model() is model
+
+
+def test_attackers_endpoint(client, monkeypatch):
+    monkeypatch.setattr(attacker, "_calibration", REFERENCE)
+    set_attacker_model(AttackerModel.for_scheme("argon2id", REFERENCE))
+    status, _, body = client.request("GET", "/api/attackers")
+    assert status == 200
+    assert b'"scheme": "argon2id:m=19456,t=2,p=1"' in body
+
+
+def test_calibrate_measures_every_primitive():
+    speeds = calibrate(seconds=0.001)
+    assert set(speeds) == set(PRIMITIVES)
+    assert all(speed > 0 for speed in speeds.values())
+
+
+def test_command_line(monkeypatch, capsys):
+    monkeypatch.setattr(attacker, "_calibration", REFERENCE)
+    assert attacker.main(["md5", "bcrypt:12"]) == 0
+    out = capsys.readouterr().out
+    assert "\nmd5\n" in out and "\nbcrypt:cost=12\n" in out and "Botnet" in out
+    with pytest.raises(SystemExit) as exit_info:
+        attacker.main(["md5:5"])
+    assert exit_info.value.code == 2
+    assert "md5 takes no parameters" in capsys.readouterr().err
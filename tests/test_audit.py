@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+
+import pytest
+
+from password_analyzer import analyze
+from password_analyzer.audit import iter_chunks, iter_passwords, main, run_audit
+
+
+def test_iter_passwords_splits_records():
+    stream = io.BytesIO(b"password\r\nhunter2\n\n\xff\xfeabc")
+    assert list(iter_passwords(stream)) == ["password", "hunter2", "", "\udcff\udcfeabc"]
+    stream = io.BytesIO(b"with\nnewline\0second\0")
+    assert list(iter_passwords(stream, b"\0")) == ["with\nnewline", "second"]
+
+
+def test_iter_chunks():
+    assert list(iter_chunks("abcde", 2)) == [(0, ["a", "b"]), (2, ["c", "d"]), (4, ["e"])]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_are_written_in_input_order(workers):
+    passwords = [f"password{i}" for i in range(25)] + ["Tr0ub4dor&3", "\udcff"]
+    out = io.StringIO()
+    assert run_audit(iter(passwords), out, workers=workers, chunk_size=4) == len(passwords)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record["index"] for record in records] == list(range(len(passwords)))
+    assert [record["score"] for record in records] == [analyze(p).score for p in passwords]
+    assert all("password" not in record for record in records)
+
+
+def test_csv_output_with_passwords():
+    out = io.StringIO()
+    run_audit(["hunter2", "a,b"], out, "csv", workers=1, include_password=True)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row["password"] for row in rows] == ["hunter2", "a,b"]
+    assert rows[0]["score"] == str(analyze("hunter2").score)
+
+
+def test_command_line(tmp_path, capsys):
+    source = tmp_path / "passwords.txt"
+    source.write_bytes(b"password\nhunter2\n")
+    output = tmp_path / "report.jsonl"
+    assert main([str(source), "-o", str(output), "-w", "1", "-c", "1"]) == 0
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 2
+    assert "Audited 2 passwords" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("option", [["--chunk-size", "0"], ["--chunk-size=-1"],
+                                    ["--workers", "0"], ["--workers=-2"]])
+def test_command_line_rejects_sizes_below_one(option, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["-"] + option)
+    assert exit_info.value.code == 2
+    assert "must be at least 1" in capsys.readouterr().err
@@ -0,0 +1,70 @@
+import hashlib
+
+import pytest
+
+from password_analyzer.bloom import BloomCorpus, BloomFilter, build_filter, optimal_parameters
+from password_analyzer.breach import SetCorpus, detect_corpus_kind, load_tiered_corpus
+from password_analyzer.hashcorpus import build_corpus
+
+
+def test_filter_has_no_false_negatives_and_few_false_positives():
+    bloom_filter = BloomFilter.for_capacity(1000, fp_rate=0.01)
+    words = [f"word{i}" for i in range(1000)]
+    for word in words:
+        bloom_filter.add_digest(bloom_filter.key(word))
+    assert all(word in bloom_filter for word in words)
+    false_positives = sum(f"other{i}" in bloom_filter for i in range(10000))
+    assert false_positives < 300
+    assert bloom_filter.false_positive_rate() == pytest.approx(0.01, rel=0.5)
+
+
+def test_optimal_parameters():
+    assert optimal_parameters(1000, 0.01) == (9586, 7)
+    with pytest.raises(ValueError):
+        optimal_parameters(1000, 1.5)
+
+
+def test_plaintext_filter_round_trip(tmp_path):
+    source = tmp_path / "list.txt"
+    source.write_text("Password\ndragon\n\n", encoding="utf-8")
+    path = str(tmp_path / "list.bloom")
+    built = build_filter(str(source), path, fp_rate=0.001)
+    assert built.count == 2
+
+    assert detect_corpus_kind(path) == "bloom"
+    corpus = BloomCorpus.from_file(path)
+    assert len(corpus) == 2
+    # Plaintext lists are lowercased, like the bundled check
+    assert corpus.count("PASSWORD") == 1
+    assert corpus.count("dragon") == 1
+    assert corpus.count("correct horse") == 0
+
+
+def test_hash_dump_filter_fronts_the_exact_corpus(tmp_path):
+    dump = tmp_path / "dump.txt"
+    dump.write_text(hashlib.sha1(b"Password").hexdigest().upper() + ":42\n", encoding="ascii")
+    bloom_path = str(tmp_path / "edge.bloom")
+    corpus_path = str(tmp_path / "corpus.bin")
+    build_filter(str(dump), bloom_path, hashed=True)
+    build_corpus(str(dump), corpus_path)
+
+    tiered = load_tiered_corpus([bloom_path, corpus_path])
+    # Case-sensitive, with the prevalence count from the exact tier
+    assert tiered.count("Password") == 42
+    assert tiered.count("password") == 0
+    with pytest.raises(ValueError):
+        build_filter(str(dump), bloom_path, hashed=True, lowercase=True)
+
+
+def test_positives_are_confirmed_by_the_exact_corpus():
+    bloom_filter = BloomFilter.for_capacity(10)
+    bloom_filter.add_digest(bloom_filter.key("hunter2"))
+    assert BloomCorpus(bloom_filter).count("hunter2") == 1
+    assert BloomCorpus(bloom_filter, exact=SetCorpus([])).count("hunter2") == 0
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "list.txt"
+    path.write_bytes(b"password\n")
+    with pytest.raises(ValueError):
+        BloomFilter.load(str(path))
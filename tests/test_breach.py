@@ -0,0 +1,68 @@
+import pytest
+
+from password_analyzer import analyze
+from password_analyzer.breach import (
+    CORPUS_ENV,
+    SetCorpus,
+    SortedCorpus,
+    breach_count,
+    get_corpus,
+    is_breached,
+    load_corpus,
+    load_tiered_corpus,
+    set_corpus,
+)
+
+
+@pytest.fixture(autouse=True)
+def default_corpus(monkeypatch):
+    monkeypatch.delenv(CORPUS_ENV, raising=False)
+    set_corpus(None)
+    yield
+    set_corpus(None)
+
+
+@pytest.mark.parametrize("corpus_class", [SetCorpus, SortedCorpus])
+def test_lookups_are_case_insensitive(corpus_class):
+    corpus = corpus_class(["Password", "dragon", "ŁÓDŹ", "dragon"])
+    assert len(corpus) == 3
+    assert corpus.count("PASSWORD") == 1
+    assert "łódź" in corpus
+    assert "dragon1" not in corpus
+    assert corpus.count("") == 0
+    assert corpus.count("\udcff") == 0
+
+
+@pytest.mark.parametrize("kind", ["set", "sorted"])
+def test_load_text_list(tmp_path, kind):
+    path = tmp_path / "list.txt"
+    path.write_text("hunter2\n\n  letmein  \n", encoding="utf-8")
+    corpus = load_corpus(str(path), kind)
+    assert "hunter2" in corpus and "letmein" in corpus
+    assert len(corpus) == 2
+
+
+def test_load_rejects_unknown_kinds(tmp_path):
+    path = tmp_path / "list.txt"
+    path.write_text("hunter2\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_corpus(str(path), "csv")
+    # Only Bloom filters may front another corpus
+    with pytest.raises(ValueError):
+        load_tiered_corpus([str(path), str(path)])
+
+
+def test_active_corpus_drives_the_analysis(tmp_path, monkeypatch):
+    assert is_breached("password")
+    assert isinstance(get_corpus(), SetCorpus)
+
+    path = tmp_path / "list.txt"
+    path.write_text("CorrectHorse\n", encoding="utf-8")
+    monkeypatch.setenv(CORPUS_ENV, str(path))
+    set_corpus(None)
+    assert breach_count("correcthorse") == 1
+    assert not is_breached("password")
+    assert analyze("correcthorse").is_common
+
+    set_corpus(SetCorpus([]))
+    assert not analyze("correcthorse").is_common
@@ -0,0 +1,130 @@
+import os
+import stat
+
+import pytest
+
+from password_analyzer import analyze
+from password_analyzer import cache as cache_module
+from password_analyzer.cache import (
+    CACHE_ENV,
+    CACHE_KEY_ENV,
+    KEY_DIR_ENV,
+    MemoryResultCache,
+    SqliteResultCache,
+    cached_analyze,
+    cached_analyze_many,
+    fingerprint,
+    get_cache,
+    key_path,
+    set_cache,
+)
+
+
+def test_sqlite_key_file_is_private_and_away_from_the_database(tmp_path, monkeypatch):
+    monkeypatch.setenv(KEY_DIR_ENV, str(tmp_path / "keys"))
+    database = str(tmp_path / "cache.db")
+    cache = SqliteResultCache(database)
+    cache.close()
+
+    assert not any(name.endswith(".key") for name in os.listdir(tmp_path))
+    path = key_path(database)
+    assert os.path.dirname(path) == str(tmp_path / "keys")
+    assert stat.S_IMODE(os.stat(tmp_path / "keys").st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    # Every process opening the database agrees on the key
+    again = SqliteResultCache(database)
+    assert again.key == cache.key
+    again.close()
+
+
+def test_cache_files_are_not_served(tmp_path, monkeypatch, client):
+    monkeypatch.setenv(KEY_DIR_ENV, str(tmp_path / "keys"))
+    cache = SqliteResultCache(str(tmp_path / "cache.db"))
+    cache.analyze("hunter2")
+    cache.close()
+    (tmp_path / "cache.db.key").write_bytes(os.urandom(32))
+
+    for path in ("/cache.db", "/cache.db.key", "/keys/", "/static/../cache.db",
+                 "/static/%2e%2e/cache.db", "/"):
+        status, _, body = client.request("GET", path)
+        assert b"SQLite format" not in body
+        if path != "/":
+            assert status == 404, path
+    status, _, _ = client.request("HEAD", "/cache.db")
+    assert status == 404
+    # The static tree still is
+    status, _, body = client.request("GET", "/static/service-worker.js")
+    assert status == 200 and b"CACHE_PREFIX" in body
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control the time the caches see"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_memory_cache_hits_evicts_and_expires(clock):
+    cache = MemoryResultCache(max_entries=2, ttl=60)
+    assert cache.analyze("one").to_dict() == analyze("one").to_dict()
+    assert cache.analyze("one") is cache.get("one")
+    cache.analyze("two")
+    cache.get("one")
+    cache.analyze("three")  # evicts "two", the least recently used
+    assert cache.get("two") is None and cache.get("one") is not None
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 4, "misses": 4,
+                             "evictions": 1, "hit_rate": 0.5}
+    clock[0] += 61
+    assert cache.get("one") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_fingerprints_depend_on_the_key(monkeypatch):
+    assert fingerprint(b"k" * 32, "hunter2") != fingerprint(b"j" * 32, "hunter2")
+    monkeypatch.setenv(CACHE_KEY_ENV, "ab" * 32)
+    assert MemoryResultCache().key == bytes.fromhex("ab" * 32)
+
+
+def test_sqlite_cache_is_shared_and_holds_no_plaintext(tmp_path, monkeypatch, clock):
+    monkeypatch.setenv(KEY_DIR_ENV, str(tmp_path / "keys"))
+    database = str(tmp_path / "cache.db")
+    writer = SqliteResultCache(database, ttl=60)
+    result = writer.analyze("CorrectHorse9!")
+    writer.close()
+
+    reader = SqliteResultCache(database, ttl=60)
+    assert reader.get("CorrectHorse9!").to_dict() == result.to_dict()
+    assert reader.get("other") is None
+    assert len(reader) == 1
+    clock[0] += 61
+    assert reader.get("CorrectHorse9!") is None
+    reader.close()
+    with open(database, "rb") as f:
+        assert b"CorrectHorse9!" not in f.read()
+
+
+def test_sqlite_cache_prunes_to_max_entries(tmp_path, monkeypatch):
+    monkeypatch.setenv(KEY_DIR_ENV, str(tmp_path / "keys"))
+    cache = SqliteResultCache(str(tmp_path / "cache.db"), max_entries=10)
+    result = analyze("x")
+    for i in range(SqliteResultCache.PRUNE_INTERVAL):
+        cache.put(f"password{i}", result)
+    assert len(cache) == 10
+    assert cache.evictions == SqliteResultCache.PRUNE_INTERVAL - 10
+    cache.close()
+
+
+def test_active_cache(monkeypatch):
+    monkeypatch.setattr(cache_module, "_active_cache", None)
+    monkeypatch.setattr(cache_module, "_cache_loaded", False)
+    monkeypatch.setenv(CACHE_ENV, "off")
+    assert get_cache() is None
+    assert cached_analyze("hunter2").to_dict() == analyze("hunter2").to_dict()
+
+    cache = MemoryResultCache()
+    set_cache(cache)
+    assert [r.score for r in cached_analyze_many(["a", "b", "a"])] == [analyze(p).score for p in "aba"]
+    assert cache.hits == 1 and len(cache) == 2
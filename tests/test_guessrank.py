@@ -0,0 +1,69 @@
+import math
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from password_analyzer import guessrank  # noqa: E402
+from password_analyzer.guessrank import RANKS_SUFFIX, GuessRankTable, build, load_ranks  # noqa: E402
+from password_analyzer.markov import MarkovModel  # noqa: E402
+from password_analyzer.markov import save as save_markov  # noqa: E402
+from password_analyzer.markov import train as train_markov  # noqa: E402
+
+
+def load_table(tmp_path, sample_bits):
+    path = str(tmp_path / "model.bin.ranks")
+    guessrank.save(path, *build(sample_bits))
+    return GuessRankTable.load(path)
+
+
+def test_uniform_distribution_ranks(tmp_path):
+    # Samples of a uniform distribution over 2**20 passwords
+    table = load_table(tmp_path, [20.0] * 1000)
+    assert table.samples == 1000
+    # More likely than any sample: guessed first
+    assert table.guesses_log2(10.0) == 0.0
+    # Less likely than every sample: after all 2**20 of them, or its own 1/p
+    assert table.guesses_log2(20.5) == pytest.approx(20.5)
+    assert table.guesses_log2(30.0) == pytest.approx(30.0)
+    table.close()
+
+
+def test_ranks_grow_with_the_bits_and_batch_matches_scalar(tmp_path):
+    rng = np.random.default_rng(3)
+    table = load_table(tmp_path, rng.geometric(0.5, size=5000).astype(float))
+    bits = np.array([0.5, 1.0, 1.5, 3.0, 6.0, 12.0, 40.0])
+    scalar = [table.guesses_log2(b) for b in bits]
+    assert scalar == sorted(scalar)
+    assert list(table.batch_guesses_log2(bits)) == scalar
+    # Password k has probability 2**-k: six of them are more likely than 2**-6.5
+    assert table.guesses_log2(6.5) == pytest.approx(math.log2(6), abs=0.2)
+    table.close()
+
+
+def test_rank_files_follow_their_model(tmp_path):
+    path = str(tmp_path / "model.bin")
+    table = train_markov(["password", "letmein", "dragon"] * 10, order=2)
+    save_markov(path, table, 2, 0.5)
+    model = MarkovModel.load(path)
+    raw = model.guesses_log2("password")
+    guessrank.build_for_model(model, path + RANKS_SUFFIX, samples=2000, seed=7)
+    assert model.guesses_log2("password") <= raw
+    model.close()
+
+    model = MarkovModel.load(path)
+    assert model.ranks is not None and model.ranks.samples == 2000
+    model.close()
+    # Writing a new model removes the ranks of the old one
+    save_markov(path, table, 2, 0.5)
+    assert not os.path.exists(path + RANKS_SUFFIX)
+    assert load_ranks(path) is None
+
+
+def test_load_rejects_bad_files(tmp_path):
+    for data in (b"short", b"PWRANK01" + (1000).to_bytes(8, "little") + b"\0" * 16):
+        path = tmp_path / "bad.ranks"
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            GuessRankTable.load(str(path))
@@ -0,0 +1,63 @@
+import hashlib
+
+import pytest
+
+from password_analyzer.breach import detect_corpus_kind, load_corpus
+from password_analyzer.hashcorpus import Sha1Corpus, build_corpus, format_range, parse_line
+
+
+def sha1_hex(password):
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    dump = tmp_path / "dump.txt"
+    lines = [f"{sha1_hex('password')}:100", f"{sha1_hex('Password')}:7", "",
+             f"{sha1_hex('hunter2').lower()}", f"{sha1_hex('password')}:23"]
+    lines += [f"{sha1_hex(f'filler{i}')}:{i + 1}" for i in range(50)]
+    dump.write_text("\n".join(lines) + "\n", encoding="ascii")
+    path = str(tmp_path / "corpus.bin")
+    # Small runs: the external merge sort combines several of them
+    assert build_corpus(str(dump), path, chunk_records=8) == 53
+    return path
+
+
+def test_build_and_look_up(corpus_path):
+    corpus = Sha1Corpus(corpus_path)
+    try:
+        assert len(corpus) == 53
+        # Duplicates are added up; lookups are case-sensitive
+        assert corpus.count("password") == 123
+        assert corpus.count("Password") == 7
+        assert corpus.count("hunter2") == 1
+        assert corpus.count("PASSWORD") == 0
+        assert corpus.count("filler49") == 50
+        records = [corpus.record(i)[0] for i in range(len(corpus))]
+        assert records == sorted(records)
+    finally:
+        corpus.close()
+
+
+def test_hash_range_lists_every_suffix_of_a_prefix(corpus_path):
+    corpus = load_corpus(corpus_path)
+    digest = sha1_hex("password")
+    records = dict(corpus.hash_range(digest[:5]))
+    assert records[digest[5:]] == 123
+    assert all(len(suffix) == 35 for suffix in records)
+    assert format_range([(digest[5:], 123)]) == f"{digest[5:]}:123".encode("ascii")
+    with pytest.raises(ValueError):
+        list(corpus.hash_range("ABC"))
+    corpus.close()
+
+
+def test_file_detection_and_bad_input(tmp_path, corpus_path):
+    assert detect_corpus_kind(corpus_path) == "sha1"
+    other = tmp_path / "list.txt"
+    other.write_bytes(b"password\n")
+    assert detect_corpus_kind(str(other)) == "set"
+    with pytest.raises(ValueError):
+        Sha1Corpus(str(other))
+    with pytest.raises(ValueError):
+        parse_line(b"ABCDEF:1")
+    assert parse_line(b"%s:99999999999\n" % sha1_hex("x").encode())[1] == 0xFFFFFFFF
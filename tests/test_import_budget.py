@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "password_analyzer"
+BUDGET_MS = 25
+RUNS = 5
+
+
+def import_in_fresh_interpreter():
+    """Import the package with -X importtime, return (cumulative ms, imported modules)"""
+    code = f"import {PACKAGE}, sys; print(' '.join(sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == PACKAGE:
+            cumulative = int(parts[1]) / 1000
+    return cumulative, proc.stdout.split()
+
+
+def test_import_stays_headless_and_within_budget():
+    timings = []
+    for _ in range(RUNS):
+        cumulative, modules = import_in_fresh_interpreter()
+        assert "streamlit" not in modules
+        timings.append(cumulative)
+    # Best of several runs: the budget is for the import, not a busy machine
+    assert min(timings) <= BUDGET_MS, f"import {PACKAGE} took {min(timings):.1f} ms"
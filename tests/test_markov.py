@@ -0,0 +1,58 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from password_analyzer import markov  # noqa: E402
+from password_analyzer.markov import SYMBOLS, MarkovModel, is_model_file, save, train  # noqa: E402
+
+PASSWORDS = ["password", "password1", "iloveyou", "princess", "sunshine", "monkey12"] * 20
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    path = str(tmp_path / "model.bin")
+    save(path, train(PASSWORDS, order=3, chunk_size=7), 3, 0.5)
+    return path
+
+
+def test_round_trip_and_probabilities(model_path):
+    assert is_model_file(model_path)
+    model = MarkovModel.load(model_path)
+    try:
+        assert (model.order, model.smoothing) == (3, 0.5)
+        assert model.ranks is None
+        # Every context is a distribution over the next symbol
+        rows = np.exp2(np.frombuffer(model.data, dtype="<f4", offset=markov.HEADER.size)
+                       .reshape(-1, SYMBOLS).astype(np.float64))
+        assert rows.sum(axis=1) == pytest.approx(1.0, abs=1e-4)
+        # Trained passwords are far likelier than random strings of the same length
+        assert model.guesses_log2("password") + 20 < model.guesses_log2("qz7#Vk!w")
+        assert model.entropy("password") == round(model.guesses_log2("password"), 2)
+    finally:
+        model.close()
+
+
+def test_batch_matches_the_scalar_path(model_path):
+    model = MarkovModel.load(model_path)
+    passwords = ["", "password", "PASSWORD1!", "päßwörd", "lone\udcff", "x" * 40]
+    batch = model.batch_guesses_log2(passwords)
+    assert list(batch) == [model.guesses_log2(p) for p in passwords]
+    bits = model.sample_bits(50, seed=1)
+    assert bits.shape == (50,) and (bits > 0).all()
+    assert list(bits) == list(model.sample_bits(50, seed=1))
+    model.close()
+
+
+def test_bad_input(tmp_path, model_path):
+    with pytest.raises(ValueError):
+        train(PASSWORDS, order=5)
+    for data in (b"short", b"not a model file at all" * 4):
+        path = tmp_path / "other.bin"
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            MarkovModel.load(str(path))
+    with open(model_path, "rb") as f:
+        truncated = f.read()[:-4]
+    (tmp_path / "truncated.bin").write_bytes(truncated)
+    with pytest.raises(ValueError):
+        MarkovModel.load(str(tmp_path / "truncated.bin"))
@@ -0,0 +1,21 @@
+import pytest
+
+from password_analyzer import analyze
+from password_analyzer.matching import estimate_guesses, lower_aligned
+
+
+@pytest.mark.parametrize("password", ["İpassword", "passwordİİ", "İ", "STRASSE", "straße", "Straße1!"])
+def test_case_changing_characters_keep_match_indices(password):
+    """Characters whose lowercase is longer must not shift or break the matches"""
+    assert lower_aligned(password) == "".join(
+        c.lower() if len(c.lower()) == 1 else c for c in password)
+    estimate = estimate_guesses(password)
+    assert "".join(match.token for match in estimate.sequence) == password
+    for match in estimate.matches:
+        assert password[match.i:match.j + 1] == match.token
+    assert analyze(password).score >= 0
+
+
+def test_dictionary_words_after_dotted_capital_i():
+    words = {match.token for match in estimate_guesses("İpassword").matches}
+    assert "password" in words
@@ -0,0 +1,33 @@
+import pytest
+
+from password_analyzer.pcfg import MAX_ITEM_BYTES, STRUCTURES, PcfgModel, _item_bytes, train
+
+
+def test_save_load_round_trip_skips_items_too_long_to_store(tmp_path):
+    passwords = ["password1", "Password1!", "dragon", "a1" * 100, "İ" * 200, "x" * 300]
+    model = train(passwords)
+    assert "L1D1" * 100 not in model.sections[STRUCTURES][1]
+
+    path = str(tmp_path / "grammar.bin")
+    model.save(path)
+    loaded = PcfgModel.load(path)
+    assert loaded.sections.keys() == model.sections.keys()
+    for key, (unseen, table) in model.sections.items():
+        assert loaded.sections[key][0] == pytest.approx(unseen)
+        assert loaded.sections[key][1] == pytest.approx(table)
+    assert loaded.guesses_log2("password1") == pytest.approx(model.guesses_log2("password1"))
+    assert loaded.guesses_log2("a1" * 100) > loaded.guesses_log2("password1")
+
+
+def test_items_over_the_length_prefix_are_refused():
+    assert _item_bytes("a" * MAX_ITEM_BYTES)[0] == MAX_ITEM_BYTES
+    with pytest.raises(ValueError):
+        _item_bytes("a" * (MAX_ITEM_BYTES + 1))
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = str(tmp_path / "grammar.bin")
+    with open(path, "wb") as f:
+        f.write(b"not a grammar file")
+    with pytest.raises(ValueError):
+        PcfgModel.load(path)
@@ -0,0 +1,143 @@
+import http.client
+import socket
+import threading
+import time
+
+import pytest
+
+import web
+
+
+@pytest.fixture
+def start_server(tmp_path, monkeypatch):
+    """Start PooledHTTPServers with the given options, closing them after the test"""
+    monkeypatch.chdir(tmp_path)
+    servers = []
+
+    def start(**options):
+        httpd = web.PooledHTTPServer(("127.0.0.1", 0), web.PasswordAnalyzerHandler, **options)
+        thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        servers.append((httpd, thread))
+        return httpd
+
+    yield start
+    for httpd, thread in servers:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+
+
+def connect(httpd):
+    return http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+
+
+def get(connection, path="/api/attackers"):
+    connection.request("GET", path)
+    response = connection.getresponse()
+    response.read()
+    return response
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_requests_reuse_the_connection(start_server):
+    httpd = start_server(workers=2)
+    connection = connect(httpd)
+    get(connection)
+    sock = connection.sock
+    for _ in range(5):
+        assert get(connection).status == 200
+    assert connection.sock is sock
+    assert len(httpd._connections) == 1
+    connection.close()
+    wait_for(lambda: not httpd._connections)
+
+
+def test_pipelined_requests_are_all_answered(start_server):
+    httpd = start_server(workers=1)
+    with socket.create_connection(httpd.server_address) as sock:
+        sock.sendall(b"GET /api/attackers HTTP/1.1\r\nHost: localhost\r\n\r\n" * 3)
+        data = b""
+        while data.count(b"HTTP/1.1 200") < 3:
+            chunk = sock.recv(65536)
+            assert chunk
+            data += chunk
+
+
+def test_idle_connections_do_not_hold_workers(start_server):
+    httpd = start_server(workers=1)
+    idle = [connect(httpd) for _ in range(3)]
+    for connection in idle:
+        get(connection)
+    silent = [socket.create_connection(httpd.server_address) for _ in range(3)]
+
+    started = time.monotonic()
+    assert get(connect(httpd)).status == 200
+    assert time.monotonic() - started < 1
+    for connection in idle:
+        assert get(connection).status == 200
+    for sock in silent:
+        sock.close()
+
+
+def test_idle_connections_time_out(start_server):
+    httpd = start_server(workers=1)
+    httpd.keep_alive_timeout = 0.2
+    with socket.create_connection(httpd.server_address) as sock:
+        sock.settimeout(5)
+        assert sock.recv(1) == b""
+    wait_for(lambda: not httpd._connections)
+
+
+def test_connections_over_the_limit_are_closed(start_server):
+    httpd = start_server(workers=1, max_connections=1)
+    first = connect(httpd)
+    get(first)
+    with socket.create_connection(httpd.server_address) as sock:
+        sock.settimeout(5)
+        sock.sendall(b"GET /api/attackers HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        try:
+            assert sock.recv(1) == b""
+        except ConnectionResetError:
+            pass
+    assert get(first).status == 200
+
+
+def test_drain_closes_idle_connections_and_ends_responses(start_server):
+    httpd = start_server(workers=2)
+    idle = connect(httpd)
+    get(idle)
+    httpd.shutdown()
+
+    started = time.monotonic()
+    assert httpd.draining is False
+    assert httpd.drain(timeout=5) == 0
+    assert time.monotonic() - started < 1
+    assert not httpd._connections
+    assert idle.sock.recv(1) == b""
+
+
+def test_responses_while_draining_close_their_connection(start_server):
+    httpd = start_server(workers=2)
+    httpd.draining = True
+    response = get(connect(httpd))
+    assert response.status == 200
+    assert response.getheader("Connection") == "close"
+
+
+def test_server_close_does_not_wait_for_idle_connections(start_server):
+    httpd = start_server(workers=1)
+    idle = [connect(httpd) for _ in range(3)]
+    for connection in idle:
+        get(connection)
+    httpd.shutdown()
+    started = time.monotonic()
+    httpd.server_close()
+    assert time.monotonic() - started < 1
+    wait_for(lambda: not httpd._connections)
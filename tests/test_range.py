@@ -0,0 +1,62 @@
+import gzip
+import hashlib
+
+import pytest
+
+import web
+from password_analyzer.bloom import BloomCorpus, BloomFilter
+from password_analyzer.breach import SetCorpus, set_corpus
+from password_analyzer.hashcorpus import Sha1Corpus, build_corpus
+
+DIGEST = hashlib.sha1(b"password").hexdigest().upper()
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    dump = tmp_path / "dump.txt"
+    lines = [f"{DIGEST}:100"] + [f"{DIGEST[:5]}{i:035X}:{i + 1}" for i in range(300)]
+    dump.write_text("\n".join(lines) + "\n", encoding="ascii")
+    path = str(tmp_path / "corpus.bin")
+    build_corpus(str(dump), path)
+    corpus = Sha1Corpus(path)
+    monkeypatch.setattr(web, "range_cache", web.AssetCache(max_entries=16))
+    set_corpus(corpus)
+    yield corpus
+    set_corpus(None)
+    corpus.close()
+
+
+def test_range_lists_the_suffixes_of_a_prefix(corpus, client):
+    status, headers, body = client.request("GET", f"/range/{DIGEST[:5].lower()}")
+    assert status == 200
+    assert headers["Content-Type"] == "text/plain"
+    lines = body.decode("ascii").split("\r\n")
+    assert f"{DIGEST[5:]}:100" in lines
+    assert len(lines) == 301
+
+
+def test_range_revalidates_with_its_etag(corpus, client):
+    path = f"/range/{DIGEST[:5]}"
+    status, headers, body = client.request("GET", path, headers={"Accept-Encoding": "gzip"})
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+    assert b"%s:100" % DIGEST[5:].encode() in gzip.decompress(body)
+    assert "max-age" in headers["Cache-Control"]
+
+    status, headers, body = client.request(
+        "GET", path, headers={"Accept-Encoding": "gzip", "If-None-Match": headers["ETag"]})
+    assert status == 304 and body == b""
+
+
+def test_range_behind_a_bloom_filter(corpus, client):
+    set_corpus(BloomCorpus(BloomFilter.for_capacity(10), exact=corpus))
+    status, _, body = client.request("GET", f"/range/{DIGEST[:5]}")
+    assert status == 200 and b":100" in body
+
+
+def test_range_errors(corpus, client):
+    for path in ("/range/ABC", "/range/ABCDEF", "/range/XYZ12"):
+        status, _, _ = client.request("GET", path)
+        assert status == 400, path
+    set_corpus(SetCorpus(["password"]))
+    status, _, _ = client.request("GET", "/range/00000")
+    assert status == 404
@@ -0,0 +1,17 @@
+import pytest
+
+from password_analyzer import calculate_entropy, calculate_strength_score, get_strength_rating
+
+np = pytest.importorskip("numpy")
+from password_analyzer.vectorized import evaluate  # noqa: E402
+
+
+def test_matches_scalar_scoring():
+    passwords = ["", "password", "PASSWORD123", "Tr0ub4dor&3", "中文密码", "ǅß𝔘½²",
+                 "lone\udcffsurrogate", "\ud800", "a" * 500]
+    result = evaluate(passwords, chunk_size=4)
+    for i, password in enumerate(passwords):
+        score = calculate_strength_score(password)
+        assert result["entropy"][i] == calculate_entropy(password)
+        assert result["score"][i] == score
+        assert result["rating"][i] == get_strength_rating(score)[0]
@@ -3,16 +3,48 @@ import socketserver
 import webbrowser
 import socket
 import threading
+import time
 import os
 import sys
+import errno
+import gzip
+import hashlib
+import json
+import mimetypes
+import re
+import select
+import selectors
+import signal
+import subprocess
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from password_analyzer.attacker import HASH_ENV, HashScheme, get_attacker_model
+from password_analyzer.breach import get_corpus
+from password_analyzer.cache import MemoryResultCache, SqliteResultCache, set_cache
+from password_analyzer.hashcorpus import Sha1Corpus, format_range
+from password_analyzer.report import build_report, build_reports
+
+
+# Network discovery for the startup banner. It runs in the background once
+# the server is accepting connections, and gives up after this many seconds:
+# on offline hosts the lookups may never answer.
+DISCOVERY_TIMEOUT = 2.0
+PUBLIC_IP_URL = 'https://api.ipify.org'
+
 
 # Get local IP address for network access
 def get_local_ip():
     """Get the local IP address of the computer"""
     try:
-        # Create a socket connection to get local IP
+        # Create a socket connection to get local IP (UDP: nothing is sent)
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.connect(("8.8.8.8", 80))
         ip = s.getsockname()[0]
@@ -22,15 +54,35 @@ def get_local_ip():
         return "127.0.0.1"
 
 
-def get_public_ip():
+def get_public_ip(timeout=DISCOVERY_TIMEOUT):
     """Try to get public IP (for informational purposes)"""
     try:
         import urllib.request
-        return urllib.request.urlopen('https://api.ipify.org').read().decode('utf8')
-    except:
+        with urllib.request.urlopen(PUBLIC_IP_URL, timeout=timeout) as response:
+            return response.read().decode('utf8')
+    except Exception:
         return "Not available"
 
 
+def discover_addresses(timeout=DISCOVERY_TIMEOUT):
+    """Look up the local and public IP addresses concurrently
+
+    Returns (local ip, public ip) after at most `timeout` seconds; a lookup
+    that has not answered by then is reported as "Not available".
+    """
+    results = {}
+    lookups = {'local': get_local_ip, 'public': lambda: get_public_ip(timeout)}
+    threads = [threading.Thread(target=lambda name=name, lookup=lookup: results.update({name: lookup()}),
+                                daemon=True)
+               for name, lookup in lookups.items()]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    return results.get('local', "Not available"), results.get('public', "Not available")
+
+
 # Complete HTML, CSS, and JavaScript
 HTML_CONTENT = """<!DOCTYPE html>
 <html lang="en">
@@ -39,7 +91,6 @@ HTML_CONTENT = """<!DOCTYPE html>
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Password Security Analyzer</title>
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
     <style>
         * {
             margin: 0;
@@ -745,7 +796,7 @@ HTML_CONTENT = """<!DOCTYPE html>
                 </div>
 
                 <div id="crackTimeDetails" style="margin-top: 20px;">
-                    <h4>Estimated Crack Times</h4>
+                    <h4>Estimated Crack Times <span id="attackerScheme"></span></h4>
                     <div class="crack-time-box" style="border-left-color: #e74c3c;">
                         <div class="crack-time-title">Basic Computer</div>
                         <div class="crack-time-value color-red" id="crackTimeBasic">Instantly</div>
@@ -798,22 +849,42 @@ HTML_CONTENT = """<!DOCTYPE html>
         const crackTimeBotnet = document.getElementById('crackTimeBotnet');
         const crackTimeSuper = document.getElementById('crackTimeSuper');
 
-        // Common passwords list
-        const commonPasswords = [
-            "123456", "password", "12345678", "qwerty", "123456789",
-            "12345", "admin", "welcome", "monkey", "dragon", "letmein",
-            "football", "iloveyou", "123123", "sunshine", "password1",
-            "princess", "abc123", "111111", "000000", "1234", "superman",
-            "trustno1", "master", "hello", "charlie", "secret", "123qwe",
-            "password123", "admin123", "login", "welcome123", "passw0rd",
-            "1234567", "1234567890", "qwerty123", "1q2w3e4r", "qwertyuiop",
-            "asdfgh", "zxcvbnm", "password1234", "12345678910"
-        ];
-
-        // Chart instances
+        // Chart instances, created once Chart.js is loaded and then updated in place
         let strengthGaugeChart = null;
         let crackTimeChart = null;
         let componentsChart = null;
+        // Report the charts show (read by their tooltips and center text)
+        let chartReport = null;
+
+        // Chart.js is only loaded once the charts section first comes into view
+        const CHART_JS_URL = 'https://cdn.jsdelivr.net/npm/chart.js';
+        let chartLibrary = null;
+
+        // Performance marks: open the page with ?perf to log first paint and
+        // the timings of every analysis to the console.  The measures stay in
+        // performance.getEntriesByType('measure') either way.
+        const PERF_LOG = new URLSearchParams(location.search).has('perf');
+
+        function measure(name, startMark) {
+            try {
+                const entry = performance.measure(name, startMark);
+                if (PERF_LOG && entry) console.log(`[perf] ${name}: ${entry.duration.toFixed(1)} ms`);
+            } catch (error) {
+                // Start mark missing (e.g. cleared) or measure unsupported
+            }
+        }
+
+        if (PERF_LOG && typeof PerformanceObserver !== 'undefined') {
+            try {
+                new PerformanceObserver(list => {
+                    list.getEntries().forEach(entry => {
+                        console.log(`[perf] ${entry.name}: ${entry.startTime.toFixed(1)} ms`);
+                    });
+                }).observe({ type: 'paint', buffered: true });
+            } catch (error) {
+                // Paint timing unsupported
+            }
+        }
 
         // Toggle password visibility
         togglePassword.addEventListener('click', function() {
@@ -840,25 +911,31 @@ HTML_CONTENT = """<!DOCTYPE html>
                 return;
             }
 
-            // Show loading state
-            loading.style.display = 'block';
-            analyzeBtn.disabled = true;
-            analyzeBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Analyzing...';
+            clearTimeout(liveTimer);
+            setLoading(true);
+            requestAnalysis(password, { explicit: true });
+        });
 
-            // Simulate analysis delay for better UX
-            setTimeout(() => {
-                try {
-                    analyzePassword(password);
-                } catch (error) {
-                    console.error("Analysis error:", error);
-                    showAlert("An error occurred during analysis. Please try again.");
-                } finally {
-                    // Hide loading state
-                    loading.style.display = 'none';
-                    analyzeBtn.disabled = false;
-                    analyzeBtn.innerHTML = '<i class="fas fa-search"></i> Analyze Password Security';
+        // Show or hide the loading state of the Analyze button
+        function setLoading(active) {
+            loading.style.display = active ? 'block' : 'none';
+            analyzeBtn.disabled = active;
+            analyzeBtn.innerHTML = active
+                ? '<i class="fas fa-spinner fa-spin"></i> Analyzing...'
+                : '<i class="fas fa-search"></i> Analyze Password Security';
+        }
+
+        // Live scoring while typing: debounced, and each new analysis supersedes
+        // the ones still in flight
+        let liveTimer = null;
+        passwordInput.addEventListener('input', function() {
+            clearTimeout(liveTimer);
+            liveTimer = setTimeout(() => {
+                const password = passwordInput.value.trim();
+                if (password && password.length <= 100) {
+                    requestAnalysis(password, { explicit: false });
                 }
-            }, 800);
+            }, LIVE_DEBOUNCE_MS);
         });
 
         // Show alert function
@@ -873,328 +950,164 @@ HTML_CONTENT = """<!DOCTYPE html>
             }
         });
 
-        // Main analysis function
-        function analyzePassword(password) {
+        // Show an analysis report from the engine
+        function showReport(report, scroll) {
+            performance.mark('render-start');
             // Show results and charts
             resultsSection.style.display = 'block';
             chartsSection.style.display = 'grid';
 
             // Scroll to results smoothly
-            setTimeout(() => {
-                resultsSection.scrollIntoView({ behavior: 'smooth', block: 'start' });
-            }, 100);
-
-            // Basic character analysis
-            const length = password.length;
-            const hasUpper = /[A-Z]/.test(password);
-            const hasLower = /[a-z]/.test(password);
-            const hasDigit = /\d/.test(password);
-            const hasSpecial = /[^A-Za-z0-9]/.test(password);
-            const isCommon = commonPasswords.includes(password.toLowerCase());
-
-            // Calculate entropy (rounded to 2 decimal places)
-            const entropy = calculateEntropy(password);
-
-            // Calculate strength score
-            const scoreResult = calculateScore(password, length, hasUpper, hasLower, hasDigit, hasSpecial, entropy, isCommon);
-            const score = scoreResult.score;
-            const breakdown = scoreResult.breakdown;
-
-            // Get rating
-            const ratingResult = getRating(score);
-            const rating = ratingResult.rating;
-            const color = ratingResult.color;
-
-            // Estimate crack times
-            const crackTimes = estimateCrackTime(entropy);
-
-            // Get recommendations
-            const recommendations = getRecommendations(length, hasUpper, hasLower, hasDigit, hasSpecial, score, isCommon);
-
-            // Check policy compliance
-            const policies = checkPolicyCompliance(length, hasUpper, hasLower, hasDigit, hasSpecial);
-
-            // Assess risk
-            const risk = assessRisk(score, isCommon);
+            if (scroll) {
+                setTimeout(() => {
+                    resultsSection.scrollIntoView({ behavior: 'smooth', block: 'start' });
+                }, 100);
+            }
 
             // Update UI with results
-            updateUI(password, length, hasUpper, hasLower, hasDigit, hasSpecial, 
-                    entropy, score, rating, color, crackTimes, recommendations, 
-                    policies, risk, breakdown);
-
-            // Create visual charts
-            createCharts(score, rating, color, crackTimes, breakdown);
-        }
-
-        // Calculate password entropy in bits (rounded to 2 decimal places)
-        function calculateEntropy(password) {
-            if (!password || password.length === 0) return 0;
-
-            let poolSize = 0;
-            if (/[a-z]/.test(password)) poolSize += 26;
-            if (/[A-Z]/.test(password)) poolSize += 26;
-            if (/\d/.test(password)) poolSize += 10;
-            if (/[^A-Za-z0-9]/.test(password)) poolSize += 32;
-
-            if (poolSize === 0) return 0;
-
-            // Calculate and round to 2 decimal places
-            const entropy = Math.log2(Math.pow(poolSize, password.length));
-            return Math.round(entropy * 100) / 100;
-        }
-
-        // Calculate strength score (0-100)
-        function calculateScore(password, length, hasUpper, hasLower, hasDigit, hasSpecial, entropy, isCommon) {
-            let score = 0;
-            const breakdown = {};
-
-            // Length score (max 30)
-            const lengthScore = Math.min(30, length * 3);
-            score += lengthScore;
-            breakdown.length = Math.round(lengthScore * 100) / 100;
-
-            // Character variety (max 40)
-            let varietyScore = 0;
-            if (hasUpper) varietyScore += 10;
-            if (hasLower) varietyScore += 10;
-            if (hasDigit) varietyScore += 10;
-            if (hasSpecial) varietyScore += 10;
-            score += varietyScore;
-            breakdown.variety = varietyScore;
-
-            // Bonus for mixed case (10)
-            if (hasUpper && hasLower) {
-                score += 10;
-                breakdown.mixedCase = 10;
+            updateUI(report.profile, report.entropy, report.score, report.rating, report.color,
+                     report.crackTimes, report.recommendations, report.policies, report.risk,
+                     report.breakdown);
+
+            // Update visual charts
+            chartReport = report;
+            if (strengthGaugeChart) {
+                updateCharts();
+            } else {
+                watchCharts();
             }
-
-            // Entropy bonus (max 20)
-            const entropyScore = Math.min(20, entropy / 5);
-            score += entropyScore;
-            breakdown.entropy = Math.round(entropyScore * 100) / 100;
-
-            // Penalty for common password
-            if (isCommon) {
-                score = Math.max(10, score - 30);
-                breakdown.commonPenalty = -30;
+            measure('render', 'render-start');
+        }
+
+        // Analysis engine: static/analyzer-worker.js, run in a Web Worker so
+        // scoring never blocks the page, or loaded into the page where workers
+        // are unavailable (e.g. when the page is opened from file://)
+        const ENGINE_URL = 'static/analyzer-worker.js';
+        // A worker still busy with a superseded analysis after this long is
+        // restarted instead of waited for
+        const ENGINE_RESTART_MS = 250;
+        const LIVE_DEBOUNCE_MS = 150;
+
+        let engineWorker = null;
+        let inlineEngine = null;
+        let requestCounter = 0;
+        // The analysis the page is waiting for: { id, password, explicit, started }
+        let latestRequest = null;
+        // Server attacker model speeds, once loaded (the engine has defaults)
+        let attackerSpeeds = null;
+
+        function startEngine() {
+            try {
+                engineWorker = new Worker(ENGINE_URL);
+            } catch (error) {
+                engineWorker = null;
+                return;
+            }
+            engineWorker.onmessage = event => {
+                const { id, report, error } = event.data;
+                // Answers to superseded requests are dropped
+                if (latestRequest && id === latestRequest.id) {
+                    finishRequest(report, error);
+                }
+            };
+            engineWorker.onerror = event => {
+                // The script could not be loaded as a worker: use the page instead
+                event.preventDefault();
+                engineWorker.terminate();
+                engineWorker = null;
+                if (latestRequest) runInline(latestRequest);
+            };
+            if (attackerSpeeds) {
+                engineWorker.postMessage({ type: 'attackers', attackers: attackerSpeeds });
             }
-
-            // Ensure score is between 0-100 and round to 2 decimal places
-            score = Math.max(0, Math.min(100, Math.round(score * 100) / 100));
-
-            return { score, breakdown };
         }
 
-        // Get rating based on score
-        function getRating(score) {
-            if (score >= 80) {
-                return { rating: "A+ (EXCELLENT)", color: "#27ae60" };
-            } else if (score >= 70) {
-                return { rating: "A (VERY GOOD)", color: "#2ecc71" };
-            } else if (score >= 60) {
-                return { rating: "B (GOOD)", color: "#f1c40f" };
-            } else if (score >= 50) {
-                return { rating: "C (FAIR)", color: "#f39c12" };
-            } else if (score >= 40) {
-                return { rating: "D (POOR)", color: "#e67e22" };
-            } else {
-                return { rating: "F (VERY POOR)", color: "#e74c3c" };
+        function loadInlineEngine() {
+            if (!inlineEngine) {
+                inlineEngine = new Promise((resolve, reject) => {
+                    const script = document.createElement('script');
+                    script.src = ENGINE_URL;
+                    script.onload = () => resolve(self.PasswordEngine);
+                    script.onerror = reject;
+                    document.head.appendChild(script);
+                });
             }
+            return inlineEngine;
         }
 
-        // Estimate crack time for different attackers
-        function estimateCrackTime(entropy) {
-            const attackers = {
-                "Basic Computer": { speed: 1000 },
-                "Hacker (GPU)": { speed: 1000000 },
-                "Botnet": { speed: 1000000000 },
-                "Supercomputer": { speed: 1000000000000 }
-            };
-
-            const results = {};
-            const totalCombinations = Math.pow(2, entropy);
-
-            Object.entries(attackers).forEach(([name, att]) => {
-                let seconds = totalCombinations / att.speed;
-
-                let timeStr, color;
-
-                if (seconds < 1) {
-                    timeStr = "Instantly";
-                    color = "#e74c3c";
-                } else if (seconds < 60) {
-                    timeStr = `${seconds.toFixed(1)} seconds`;
-                    color = "#e74c3c";
-                } else if (seconds < 3600) {
-                    const minutes = seconds / 60;
-                    timeStr = minutes < 2 ? `${minutes.toFixed(1)} minute` : `${minutes.toFixed(1)} minutes`;
-                    color = "#f39c12";
-                } else if (seconds < 86400) {
-                    const hours = seconds / 3600;
-                    timeStr = hours < 2 ? `${hours.toFixed(1)} hour` : `${hours.toFixed(1)} hours`;
-                    color = "#f1c40f";
-                } else if (seconds < 31536000) {
-                    const days = seconds / 86400;
-                    timeStr = days < 2 ? `${days.toFixed(1)} day` : `${days.toFixed(1)} days`;
-                    color = "#2ecc71";
-                } else {
-                    const years = seconds / 31536000;
-                    timeStr = years < 2 ? `${years.toFixed(1)} year` : `${years.toFixed(1)} years`;
-                    color = years < 100 ? "#27ae60" : "#3498db";
+        function runInline(request) {
+            loadInlineEngine().then(engine => {
+                if (request !== latestRequest) return;
+                if (attackerSpeeds) engine.setAttackerSpeeds(attackerSpeeds);
+                try {
+                    finishRequest(engine.analyze(request.password), null);
+                } catch (error) {
+                    finishRequest(null, String(error));
                 }
-
-                results[name] = { time: timeStr, color };
+            }, () => {
+                if (request === latestRequest) finishRequest(null, "Could not load the analysis engine");
             });
-
-            return results;
         }
 
-        // Generate security recommendations
-        function getRecommendations(length, hasUpper, hasLower, hasDigit, hasSpecial, score, isCommon) {
-            const recs = [];
-
-            if (isCommon) {
-                recs.push({ priority: "CRITICAL", text: "CHANGE PASSWORD - It's in common password lists" });
+        // Ask the engine for a report; a newer request supersedes this one
+        function requestAnalysis(password, { explicit }) {
+            const now = performance.now();
+            if (engineWorker && latestRequest && now - latestRequest.started > ENGINE_RESTART_MS) {
+                // Don't queue behind a long stale analysis: cancel it
+                engineWorker.terminate();
+                startEngine();
             }
 
-            if (length < 8) {
-                recs.push({ priority: "HIGH", text: `Increase length from ${length} to at least 8 characters` });
-            } else if (length < 12) {
-                recs.push({ priority: "MEDIUM", text: `Increase length from ${length} to 12+ characters` });
-            }
-
-            if (!hasUpper) {
-                recs.push({ priority: "MEDIUM", text: "Add uppercase letters (A-Z)" });
-            }
-
-            if (!hasLower) {
-                recs.push({ priority: "MEDIUM", text: "Add lowercase letters (a-z)" });
-            }
-
-            if (!hasDigit) {
-                recs.push({ priority: "MEDIUM", text: "Add numbers (0-9)" });
-            }
-
-            if (!hasSpecial) {
-                recs.push({ priority: "HIGH", text: "Add special characters (!@#$%^&*)" });
-            }
-
-            if (score < 60) {
-                recs.push({ priority: "LOW", text: "Consider using a passphrase (e.g., 'CorrectHorseBatteryStaple')" });
-            }
-
-            // If no recommendations and password is weak, add generic one
-            if (recs.length === 0 && score < 70) {
-                recs.push({ priority: "LOW", text: "Your password is decent but could be improved with more length" });
+            const request = { id: ++requestCounter, password, explicit, started: now };
+            latestRequest = request;
+            performance.mark('analysis-start');
+            if (engineWorker) {
+                engineWorker.postMessage({ type: 'analyze', id: request.id, password });
+            } else {
+                runInline(request);
             }
-
-            // Sort by priority
-            const priorityOrder = { "CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3 };
-            recs.sort((a, b) => priorityOrder[a.priority] - priorityOrder[b.priority]);
-
-            return recs.slice(0, 6);
         }
 
-        // Check policy compliance
-        function checkPolicyCompliance(length, hasUpper, hasLower, hasDigit, hasSpecial) {
-            const policies = {
-                "Basic": { minLength: 6, requires: [] },
-                "Standard": { minLength: 8, requires: ["upper", "lower", "digit"] },
-                "Strong": { minLength: 12, requires: ["upper", "lower", "digit", "special"] },
-                "Military": { minLength: 16, requires: ["upper", "lower", "digit", "special"] }
-            };
-
-            const compliance = {};
-
-            Object.entries(policies).forEach(([name, policy]) => {
-                let passed = 0;
-                let total = 0;
-
-                // Length check
-                total++;
-                if (length >= policy.minLength) passed++;
-
-                // Character requirements
-                policy.requires.forEach(req => {
-                    total++;
-                    if (req === "upper" && hasUpper) passed++;
-                    if (req === "lower" && hasLower) passed++;
-                    if (req === "digit" && hasDigit) passed++;
-                    if (req === "special" && hasSpecial) passed++;
-                });
-
-                const percentage = total > 0 ? (passed / total) * 100 : 0;
-                compliance[name] = {
-                    passed,
-                    total,
-                    percentage: Math.round(percentage),
-                    compliant: percentage === 100
-                };
-            });
-
-            return compliance;
-        }
-
-        // Assess risk level
-        function assessRisk(score, isCommon) {
-            if (isCommon) {
-                return {
-                    level: "CRITICAL",
-                    description: "This password is in common password lists and can be cracked instantly",
-                    color: "#c0392b",
-                    action: "CHANGE PASSWORD IMMEDIATELY"
-                };
+        function finishRequest(report, error) {
+            const request = latestRequest;
+            latestRequest = null;
+            measure('analysis', 'analysis-start');
+            setLoading(false);
+            if (error) {
+                console.error("Analysis error:", error);
+                if (request.explicit) {
+                    showAlert("An error occurred during analysis. Please try again.");
+                }
+                return;
             }
+            showReport(report, request.explicit);
+        }
 
-            if (score >= 80) {
-                return {
-                    level: "VERY LOW",
-                    description: "Excellent password security - very difficult to crack",
-                    color: "#27ae60",
-                    action: "Password is secure"
-                };
-            } else if (score >= 70) {
-                return {
-                    level: "LOW",
-                    description: "Good password security - adequate for most purposes",
-                    color: "#2ecc71",
-                    action: "Password is acceptable"
-                };
-            } else if (score >= 60) {
-                return {
-                    level: "MODERATE",
-                    description: "Moderate security risk - could be improved",
-                    color: "#f1c40f",
-                    action: "Consider improving password"
-                };
-            } else if (score >= 50) {
-                return {
-                    level: "MEDIUM",
-                    description: "Medium security risk - vulnerable to determined attackers",
-                    color: "#f39c12",
-                    action: "Improve password soon"
-                };
-            } else if (score >= 40) {
-                return {
-                    level: "HIGH",
-                    description: "High security risk - vulnerable to basic attacks",
-                    color: "#e67e22",
-                    action: "Change password as soon as possible"
-                };
-            } else {
-                return {
-                    level: "VERY HIGH",
-                    description: "Very high security risk - can be cracked quickly",
-                    color: "#e74c3c",
-                    action: "CHANGE PASSWORD IMMEDIATELY"
-                };
-            }
+        function loadAttackerModel() {
+            fetch('/api/attackers')
+                .then(response => response.ok ? response.json() : null)
+                .then(model => {
+                    if (!model) return;
+                    attackerSpeeds = model.attackers;
+                    if (engineWorker) {
+                        engineWorker.postMessage({ type: 'attackers', attackers: attackerSpeeds });
+                    }
+                    if (model.scheme) {
+                        document.getElementById('attackerScheme').textContent = `(${model.scheme})`;
+                    }
+                    // Refresh results already shown with the default speeds
+                    const password = passwordInput.value.trim();
+                    if (password && resultsSection.style.display === 'block') {
+                        requestAnalysis(password, { explicit: false });
+                    }
+                })
+                .catch(() => {});
         }
 
         // Update UI with results
-        function updateUI(password, length, hasUpper, hasLower, hasDigit, hasSpecial, 
-                         entropy, score, rating, color, crackTimes, recommendations, 
+        function updateUI(profile, entropy, score, rating, color, crackTimes, recommendations,
                          policies, risk, breakdown) {
+            const { length, hasUpper, hasLower, hasDigit, hasSpecial } = profile;
             // Update score and rating
             scoreValue.textContent = score.toFixed(2);
             scoreRating.textContent = rating;
@@ -1262,21 +1175,72 @@ HTML_CONTENT = """<!DOCTYPE html>
             crackTimeSuper.style.color = crackTimes["Supercomputer"].color;
         }
 
-        // Create charts
-        function createCharts(score, rating, color, crackTimes, breakdown) {
-            // Destroy existing charts if they exist
-            if (strengthGaugeChart) strengthGaugeChart.destroy();
-            if (crackTimeChart) crackTimeChart.destroy();
-            if (componentsChart) componentsChart.destroy();
+        function loadChartLibrary() {
+            if (!chartLibrary) {
+                chartLibrary = new Promise((resolve, reject) => {
+                    const script = document.createElement('script');
+                    script.src = CHART_JS_URL;
+                    script.onload = () => resolve(self.Chart);
+                    script.onerror = reject;
+                    document.head.appendChild(script);
+                });
+            }
+            return chartLibrary;
+        }
+
+        // Load Chart.js and create the charts when the charts section is
+        // first scrolled into view (right away without IntersectionObserver)
+        let chartsObserver = null;
 
+        function watchCharts() {
+            if (chartsObserver || chartLibrary) return;
+            if (typeof IntersectionObserver === 'undefined') {
+                showCharts();
+                return;
+            }
+            chartsObserver = new IntersectionObserver(entries => {
+                if (entries.some(entry => entry.isIntersecting)) {
+                    chartsObserver.disconnect();
+                    showCharts();
+                }
+            });
+            chartsObserver.observe(chartsSection);
+        }
+
+        function showCharts() {
+            performance.mark('chart-library-start');
+            loadChartLibrary().then(() => {
+                measure('chart-library', 'chart-library-start');
+                createCharts();
+                updateCharts(true);
+            }, () => {
+                console.error("Could not load Chart.js: charts are unavailable");
+            });
+        }
+
+        // Convert a crack time to seconds-like bar heights (log scale)
+        function crackTimeValue(time) {
+            if (time === "Instantly") return 0.1;
+            if (time.includes("seconds")) return parseFloat(time) / 10;
+            if (time.includes("minutes")) return parseFloat(time) * 6;
+            if (time.includes("hours")) return parseFloat(time) * 360;
+            if (time.includes("days")) return parseFloat(time) * 8640;
+            if (time.includes("years")) return parseFloat(time) * 31536000;
+            return 1;
+        }
+
+        const componentColors = ['#3498db', '#2ecc71', '#9b59b6', '#f1c40f', '#e74c3c', '#1abc9c'];
+
+        // Create the charts, empty: updateCharts fills them from chartReport
+        function createCharts() {
             // 1. Strength Gauge Chart
             const gaugeCtx = document.getElementById('strengthGauge').getContext('2d');
             strengthGaugeChart = new Chart(gaugeCtx, {
                 type: 'doughnut',
                 data: {
                     datasets: [{
-                        data: [score, 100 - score],
-                        backgroundColor: [color, 'rgba(255, 255, 255, 0.1)'],
+                        data: [0, 100],
+                        backgroundColor: ['#e74c3c', 'rgba(255, 255, 255, 0.1)'],
                         borderWidth: 0
                     }]
                 },
@@ -1286,11 +1250,11 @@ HTML_CONTENT = """<!DOCTYPE html>
                     cutout: '75%',
                     plugins: {
                         legend: { display: false },
-                        tooltip: { 
+                        tooltip: {
                             enabled: true,
                             callbacks: {
                                 label: function(context) {
-                                    return `Score: ${score.toFixed(2)}/100`;
+                                    return `Score: ${chartReport.score.toFixed(2)}/100`;
                                 }
                             }
                         }
@@ -1300,15 +1264,16 @@ HTML_CONTENT = """<!DOCTYPE html>
                 plugins: [{
                     id: 'centerText',
                     afterDraw: (chart) => {
+                        if (!chartReport) return;
                         const { ctx, chartArea: { left, right, top, bottom, width, height } } = chart;
                         const centerX = (left + right) / 2;
                         const centerY = (top + bottom) / 2 + 20;
 
                         ctx.save();
                         ctx.font = 'bold 24px Arial';
-                        ctx.fillStyle = color;
+                        ctx.fillStyle = chartReport.color;
                         ctx.textAlign = 'center';
-                        ctx.fillText(`${score.toFixed(2)}/100`, centerX, centerY);
+                        ctx.fillText(`${chartReport.score.toFixed(2)}/100`, centerX, centerY);
 
                         ctx.font = '16px Arial';
                         ctx.fillStyle = '#fff';
@@ -1320,28 +1285,15 @@ HTML_CONTENT = """<!DOCTYPE html>
 
             // 2. Crack Time Chart
             const crackTimeCtx = document.getElementById('crackTimeChart').getContext('2d');
-            const attackers = Object.keys(crackTimes);
-            const times = attackers.map(a => {
-                const time = crackTimes[a].time;
-                if (time === "Instantly") return 0.1;
-                if (time.includes("seconds")) return parseFloat(time) / 10;
-                if (time.includes("minutes")) return parseFloat(time) * 6;
-                if (time.includes("hours")) return parseFloat(time) * 360;
-                if (time.includes("days")) return parseFloat(time) * 8640;
-                if (time.includes("years")) return parseFloat(time) * 31536000;
-                return 1;
-            });
-            const colors = attackers.map(a => crackTimes[a].color);
-
             crackTimeChart = new Chart(crackTimeCtx, {
                 type: 'bar',
                 data: {
-                    labels: attackers,
+                    labels: [],
                     datasets: [{
                         label: 'Crack Time (log scale)',
-                        data: times,
-                        backgroundColor: colors,
-                        borderColor: colors.map(c => c.replace('0.7', '1')),
+                        data: [],
+                        backgroundColor: [],
+                        borderColor: [],
                         borderWidth: 1
                     }]
                 },
@@ -1371,9 +1323,8 @@ HTML_CONTENT = """<!DOCTYPE html>
                         tooltip: {
                             callbacks: {
                                 label: (context) => {
-                                    const label = context.dataset.label || '';
                                     const attacker = context.label;
-                                    return `${attacker}: ${crackTimes[attacker].time}`;
+                                    return `${attacker}: ${chartReport.crackTimes[attacker].time}`;
                                 }
                             }
                         }
@@ -1383,32 +1334,13 @@ HTML_CONTENT = """<!DOCTYPE html>
 
             // 3. Security Components Chart
             const componentsCtx = document.getElementById('componentsChart').getContext('2d');
-            const componentLabels = Object.keys(breakdown).map(key => 
-                key.replace(/([A-Z])/g, ' $1').replace(/^./, str => str.toUpperCase())
-            );
-            const componentData = Object.values(breakdown);
-            const componentColors = ['#3498db', '#2ecc71', '#9b59b6', '#f1c40f', '#e74c3c', '#1abc9c'];
-
-            // Filter out zero or negative values for the pie chart
-            const filteredLabels = [];
-            const filteredData = [];
-            const filteredColors = [];
-
-            componentData.forEach((value, index) => {
-                if (value > 0) {
-                    filteredLabels.push(componentLabels[index]);
-                    filteredData.push(Math.abs(value));
-                    filteredColors.push(componentColors[index]);
-                }
-            });
-
             componentsChart = new Chart(componentsCtx, {
                 type: 'pie',
                 data: {
-                    labels: filteredLabels,
+                    labels: [],
                     datasets: [{
-                        data: filteredData,
-                        backgroundColor: filteredColors,
+                        data: [],
+                        backgroundColor: [],
                         borderColor: 'rgba(0, 0, 0, 0.3)',
                         borderWidth: 1
                     }]
@@ -1434,8 +1366,62 @@ HTML_CONTENT = """<!DOCTYPE html>
             });
         }
 
+        // Show chartReport in the charts (animated only when they first appear)
+        function updateCharts(animate) {
+            performance.mark('charts-start');
+            const mode = animate ? undefined : 'none';
+            const { score, color, crackTimes, breakdown } = chartReport;
+
+            // 1. Strength Gauge Chart
+            const gauge = strengthGaugeChart.data.datasets[0];
+            gauge.data = [score, 100 - score];
+            gauge.backgroundColor = [color, 'rgba(255, 255, 255, 0.1)'];
+            strengthGaugeChart.update(mode);
+
+            // 2. Crack Time Chart
+            const attackers = Object.keys(crackTimes);
+            const colors = attackers.map(a => crackTimes[a].color);
+            const bars = crackTimeChart.data.datasets[0];
+            crackTimeChart.data.labels = attackers;
+            bars.data = attackers.map(a => crackTimeValue(crackTimes[a].time));
+            bars.backgroundColor = colors;
+            bars.borderColor = colors.map(c => c.replace('0.7', '1'));
+            crackTimeChart.update(mode);
+
+            // 3. Security Components Chart (only the components that add points)
+            const labels = [];
+            const data = [];
+            const backgroundColors = [];
+            Object.entries(breakdown).forEach(([key, value], index) => {
+                if (value > 0) {
+                    labels.push(key.replace(/([A-Z])/g, ' $1').replace(/^./, str => str.toUpperCase()));
+                    data.push(Math.abs(value));
+                    backgroundColors.push(componentColors[index]);
+                }
+            });
+            const slices = componentsChart.data.datasets[0];
+            componentsChart.data.labels = labels;
+            slices.data = data;
+            slices.backgroundColor = backgroundColors;
+            componentsChart.update(mode);
+            measure('charts', 'charts-start');
+        }
+
+        // Precache the page for instant repeat visits and offline use, once
+        // it has loaded (only when served: workers need http or https)
+        if ('serviceWorker' in navigator && location.protocol.startsWith('http')) {
+            window.addEventListener('load', () => {
+                navigator.serviceWorker.register('service-worker.js').catch(error => {
+                    console.warn("Service worker not registered:", error);
+                });
+            });
+        }
+
         // Initialize with a sample password for demonstration
         window.addEventListener('DOMContentLoaded', () => {
+            startEngine();
+            loadAttackerModel();
+
             // Set a sample password
             passwordInput.value = "MySecureP@ssw0rd!";
 
@@ -1449,46 +1435,738 @@ HTML_CONTENT = """<!DOCTYPE html>
 </html>"""
 
 
+def accepted_encodings(accept_encoding):
+    """Parse an Accept-Encoding header into {coding: q-value}"""
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    return accepted
+
+
+def etag_matches(if_none_match, etag):
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    for tag in (if_none_match or '').split(','):
+        tag = tag.strip()
+        if tag == '*' or tag.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+class Asset:
+    """Response body encoded once: identity, gzip and brotli variants with content-hash ETags"""
+
+    # Preferred content codings, best first
+    CODINGS = ('br', 'gzip')
+
+    def __init__(self, body, content_type, cache_control='no-cache', brotli_quality=11):
+        self.content_type = content_type
+        self.cache_control = cache_control
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {'identity': (body, f'"{digest}"')}
+
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(compressed) < len(body):
+            self.variants['gzip'] = (compressed, f'"{digest}-gz"')
+        if brotli is not None:
+            compressed = brotli.compress(body, quality=brotli_quality)
+            if len(compressed) < len(body):
+                self.variants['br'] = (compressed, f'"{digest}-br"')
+
+    def select(self, accept_encoding):
+        """Pick the (coding, body, etag) variant to send for an Accept-Encoding header"""
+        accepted = accepted_encodings(accept_encoding)
+        for coding in self.CODINGS:
+            if coding in self.variants and accepted.get(coding, accepted.get('*', 0)) > 0:
+                return (coding,) + self.variants[coding]
+        return ('identity',) + self.variants['identity']
+
+
+class AssetCache:
+    """Bounded LRU of built assets"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Get the asset stored under key, calling build() to create it on a miss"""
+        with self._lock:
+            asset = self._entries.get(key)
+            if asset is not None:
+                self._entries.move_to_end(key)
+                return asset
+
+        asset = build()
+        with self._lock:
+            self._entries[key] = asset
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return asset
+
+
+# The only files served from disk: never the working directory, which may
+# hold a result cache database, corpora or other private files
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STATIC_PATH = '/static/'
+
+# Self-hosted asset bundle written by build_assets.py: content-hashed copies
+# of the page's CDN assets and engine script, plus a manifest mapping the
+# page's URLs to them. Their names change with their content, so browsers
+# may cache them forever.
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+DIST_PATH = '/static/dist/'
+MANIFEST_FILE = os.path.join(DIST_DIR, 'manifest.json')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+_manifest = None
+
+
+def get_manifest():
+    """Get the asset bundle manifest ({"urls": {...}, "files": [...]}), empty when not built"""
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST_FILE, encoding='utf-8') as f:
+                _manifest = json.load(f)
+        except FileNotFoundError:
+            _manifest = {'urls': {}, 'files': []}
+    return _manifest
+
+
+_page_asset = None
+
+
+def get_page_asset():
+    """Get the analyzer page, encoded and compressed once
+
+    Once the asset bundle is built, the page loads it instead of the CDNs.
+    """
+    global _page_asset
+    if _page_asset is None:
+        html = HTML_CONTENT
+        for url, path in get_manifest()['urls'].items():
+            html = html.replace(url, path)
+        _page_asset = Asset(html.encode('utf-8'), 'text/html; charset=utf-8')
+    return _page_asset
+
+
+# Analysis engine script run by the page in a Web Worker.  Served with an
+# ETag and revalidated, so browsers keep it cached but pick up new versions.
+WORKER_PATH = '/static/analyzer-worker.js'
+WORKER_FILE = os.path.join(STATIC_DIR, 'analyzer-worker.js')
+_worker_asset = None
+
+
+def get_worker_asset():
+    """Get the analysis engine script, encoded and compressed once"""
+    global _worker_asset
+    if _worker_asset is None:
+        with open(WORKER_FILE, 'rb') as f:
+            _worker_asset = Asset(f.read(), 'text/javascript; charset=utf-8', 'public, no-cache')
+    return _worker_asset
+
+
+def get_dist_asset(path):
+    """Get a file of the asset bundle by URL path (None when it is not part of the bundle)"""
+    url = path[1:]
+    if url not in get_manifest()['files']:
+        return None
+
+    def build():
+        file = os.path.join(DIST_DIR, os.path.basename(url))
+        with open(file, 'rb') as f:
+            return Asset(f.read(), mimetypes.guess_type(file)[0] or 'application/octet-stream', IMMUTABLE)
+
+    return static_cache.get(('dist', url), build)
+
+
+# Service worker precaching the page and its assets, so repeat visits load
+# from the browser cache and work offline.  It has to be served from the
+# root to control the page; browsers revalidate it on every visit.
+SERVICE_WORKER_PATH = '/service-worker.js'
+SERVICE_WORKER_FILE = os.path.join(STATIC_DIR, 'service-worker.js')
+_service_worker_asset = None
+
+
+def get_service_worker_asset():
+    """Get the service worker script, with the precache list of this build"""
+    global _service_worker_asset
+    if _service_worker_asset is None:
+        # The bundle's file names already change with their content
+        versions = [get_page_asset().variants['identity'][1]]
+        files = get_manifest()['files']
+        if not files:
+            files = [WORKER_PATH[1:]]
+            versions.append(get_worker_asset().variants['identity'][1])
+        # Relative to the worker script, which is served next to the page
+        urls = ['./'] + files
+        version = hashlib.sha256(' '.join(versions + files).encode('utf-8')).hexdigest()[:16]
+
+        with open(SERVICE_WORKER_FILE, encoding='utf-8') as f:
+            script = f.read()
+        header = (f"const CACHE_NAME = 'password-analyzer-{version}';\n"
+                  f"const PRECACHE_URLS = {json.dumps(urls)};\n\n")
+        _service_worker_asset = Asset((header + script).encode('utf-8'),
+                                      'text/javascript; charset=utf-8', 'no-cache')
+    return _service_worker_asset
+
+
+# Static files up to this size are kept in memory, precompressed
+MAX_CACHED_FILE_BYTES = 2 * 1024 * 1024
+static_cache = AssetCache(max_entries=256)
+
+# There are 2^20 range prefixes, so range responses are built on first
+# request and kept until evicted instead of being rendered from the corpus
+# every time.
+RANGE_PATH = re.compile(r'^/range/([0-9A-Fa-f]{5})$')
+range_cache = AssetCache(max_entries=4096)
+
+# JSON API limits
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+MAX_BATCH_SIZE = 100000
+NDJSON_TYPES = ('application/x-ndjson', 'application/jsonl', 'application/ndjson')
+
+
+class APIError(Exception):
+    """Client error reported by the JSON API as {"error": message}"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_password(item):
+    """Get the password of a batch item: a string or {"password": string}"""
+    if isinstance(item, dict):
+        item = item.get('password')
+    if not isinstance(item, str):
+        raise APIError(400, 'Each item must be a string or an object with a "password" string')
+    return item
+
+
+def parse_batch(body, content_type):
+    """Parse a batch request body: a JSON array (or {"passwords": [...]}) or NDJSON"""
+    try:
+        if content_type in NDJSON_TYPES:
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body)
+            if isinstance(items, dict):
+                items = items.get('passwords')
+    except ValueError:
+        raise APIError(400, 'Request body is not valid JSON') from None
+
+    if not isinstance(items, list):
+        raise APIError(400, 'Expected a JSON array of passwords')
+    if len(items) > MAX_BATCH_SIZE:
+        raise APIError(413, f'Batches are limited to {MAX_BATCH_SIZE} passwords')
+    return [parse_password(item) for item in items]
+
+
+def get_hash_corpus():
+    """Find the memory-mapped SHA-1 corpus behind the active breach corpus, if any"""
+    corpus = get_corpus()
+    while corpus is not None and not isinstance(corpus, Sha1Corpus):
+        # Bloom filter tiers keep the exact corpus they front
+        corpus = getattr(corpus, 'exact', None)
+    return corpus
+
+
 class PasswordAnalyzerHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler for the password analyzer"""
 
+    # Persistent connections: every response carries a Content-Length
+    protocol_version = 'HTTP/1.1'
+    # Seconds a client may stall in the middle of a request (idle keep-alive
+    # connections are watched by PooledHTTPServer without holding a thread)
+    timeout = 5
+    # Seconds to wait for the next request on a kept-alive connection before
+    # handing it back: clients sending one request after another stay on their worker
+    keep_alive_linger = 0.01
+    # Headers and body are written separately; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=STATIC_DIR, **kwargs)
+
     def do_GET(self):
+        range_match = RANGE_PATH.match(self.path)
         if self.path == '/' or self.path == '/index.html':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            self.end_headers()
-            self.wfile.write(HTML_CONTENT.encode('utf-8'))
+            self.send_asset(get_page_asset())
+        elif self.path == WORKER_PATH:
+            self.send_asset(get_worker_asset())
+        elif self.path.startswith(DIST_PATH):
+            asset = get_dist_asset(self.path)
+            if asset is None:
+                self.send_error(404, 'Not part of the asset bundle')
+            else:
+                self.send_asset(asset)
+        elif self.path == SERVICE_WORKER_PATH:
+            self.send_asset(get_service_worker_asset())
+        elif self.path == '/api/attackers':
+            # Guessing speeds the page uses for its crack times
+            self.send_json(get_attacker_model().to_dict())
+        elif range_match:
+            self.send_range(range_match.group(1).upper())
+        elif self.path.startswith('/range/'):
+            self.send_error(400, 'Range prefix must be 5 hex digits')
         else:
             # Serve files if they exist
+            self.send_static()
+
+    def do_POST(self):
+        try:
+            if self.path == '/api/analyze':
+                self.handle_analyze()
+            elif self.path == '/api/analyze/batch':
+                self.handle_analyze_batch()
+            else:
+                raise APIError(404, 'Unknown API endpoint')
+        except APIError as e:
+            # The request body may not have been read; don't reuse the connection
+            self.close_connection = True
+            self.send_json({'error': str(e)}, e.status)
+
+    def read_body(self):
+        """Read the request body, enforcing the size limit"""
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            raise APIError(411, 'Content-Length required') from None
+        if length > MAX_REQUEST_BYTES:
+            raise APIError(413, 'Request body too large')
+        return self.rfile.read(length)
+
+    def request_content_type(self):
+        return (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+
+    def handle_analyze(self):
+        """POST /api/analyze - {"password": "..."} -> page-shaped report"""
+        try:
+            data = json.loads(self.read_body())
+        except ValueError:
+            raise APIError(400, 'Request body is not valid JSON') from None
+        self.send_json(build_report(parse_password(data)))
+
+    def handle_analyze_batch(self):
+        """POST /api/analyze/batch - JSON array or NDJSON of passwords -> reports in order"""
+        content_type = self.request_content_type()
+        reports = build_reports(parse_batch(self.read_body(), content_type))
+
+        if content_type in NDJSON_TYPES:
+            body = ''.join(json.dumps(report) + '\n' for report in reports).encode('utf-8')
+            self.send_body(body, 'application/x-ndjson')
+        else:
+            self.send_json(reports)
+
+    def send_json(self, data, status=200):
+        self.send_body(json.dumps(data).encode('utf-8'), 'application/json', status)
+
+    def send_body(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_range(self, prefix):
+        """Serve every hash suffix and count for a 5-hex-digit SHA-1 prefix"""
+        corpus = get_hash_corpus()
+        if corpus is None:
+            self.send_error(404, 'No SHA-1 breach corpus configured')
+            return
+
+        asset = range_cache.get(prefix, lambda: Asset(
+            format_range(corpus.hash_range(prefix)), 'text/plain', 'public, max-age=86400',
+            brotli_quality=5))
+        self.send_asset(asset)
+
+    def send_static(self):
+        """Serve a file from disk, keeping small files in memory precompressed"""
+        if not self.path.startswith(STATIC_PATH):
+            self.send_error(404, 'File not found')
+            return
+        path = self.translate_path(self.path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        if stat is None or not os.path.isfile(path) or stat.st_size > MAX_CACHED_FILE_BYTES:
+            # Directories, missing and large files go through the stock handler
             super().do_GET()
+            return
+
+        def build():
+            with open(path, 'rb') as f:
+                return Asset(f.read(), self.guess_type(path))
+
+        self.send_asset(static_cache.get((path, stat.st_mtime_ns, stat.st_size), build))
+
+    def send_head(self):
+        # The stock GET and HEAD: limited to the static tree as well
+        if not self.path.startswith(STATIC_PATH):
+            self.send_error(404, 'File not found')
+            return None
+        return super().send_head()
+
+    def translate_path(self, path):
+        """Map a /static/ URL to its file under STATIC_DIR"""
+        return super().translate_path(path[len(STATIC_PATH) - 1:])
+
+    def handle(self):
+        if not getattr(self.server, 'parks_idle_connections', False):
+            super().handle()
+            return
+        # Serve the requests the client has already sent, then return the
+        # connection to the server to wait for the next one
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self.next_request_arrives():
+            self.handle_one_request()
+
+    def next_request_arrives(self):
+        """Wait up to keep_alive_linger seconds for (part of) another request"""
+        self.connection.settimeout(self.keep_alive_linger)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'connection':
+            self.connection_header_sent = True
+        super().send_header(keyword, value)
+
+    def end_headers(self):
+        if getattr(self.server, 'draining', False):
+            # Stopping or handing over to a new process: have the client
+            # reconnect (to the new process) instead of keeping this connection
+            self.close_connection = True
+        # Whatever the reason, a response after which the connection closes says so
+        if self.close_connection and not getattr(self, 'connection_header_sent', False):
+            self.send_header('Connection', 'close')
+        self.connection_header_sent = False
+        super().end_headers()
+
+    def send_asset(self, asset):
+        """Send the best encoding of an asset, or 304 if the client copy is current"""
+        coding, body, etag = asset.select(self.headers.get('Accept-Encoding'))
+
+        not_modified = etag_matches(self.headers.get('If-None-Match'), etag)
+
+        self.send_response(304 if not_modified else 200)
+        if not not_modified:
+            self.send_header('Content-type', asset.content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if coding != 'identity':
+                self.send_header('Content-Encoding', coding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', asset.cache_control)
+        self.end_headers()
+        if not not_modified:
+            self.wfile.write(body)
 
     def log_message(self, format, *args):
         # Suppress default logging
         pass
 
 
-def check_port_available(port):
-    """Check if port is available"""
-    import socket
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+class PooledHTTPServer(socketserver.TCPServer):
+    """HTTP server handling connections on a bounded thread pool
+
+    A connection only holds one of `workers` threads while it has a request
+    to serve: new and idle keep-alive connections wait in a selector until
+    they are readable, and are closed after `keep_alive_timeout` seconds of
+    silence. Connections beyond `max_connections`, counting idle ones, are
+    closed right away instead of piling up.
+    """
+
+    allow_reuse_address = True
+    request_queue_size = 128
+    # Handlers return their connection after each request instead of reading the next
+    parks_idle_connections = True
+    keep_alive_timeout = 15
+    # Set once the server stops accepting: responses then close their connection
+    draining = False
+
+    def __init__(self, server_address, handler_class, workers=32, max_connections=256,
+                 bind_and_activate=True):
+        self.workers = workers
+        self.max_connections = max_connections
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http-worker')
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        # Connections handed to the idle watcher thread, which owns the selector
+        self._parked = []
+        self._idle_lock = threading.Lock()
+        self._idle_thread = None
+        self._wakeup = None
+        self._stopping = False
+        super().__init__(server_address, handler_class, bind_and_activate)
+
+    @classmethod
+    def from_socket(cls, sock, handler_class, workers=32, max_connections=256):
+        """Serve on a socket that is already bound and listening (e.g. inherited)"""
+        server = cls(sock.getsockname()[:2], handler_class, workers, max_connections,
+                     bind_and_activate=False)
+        server.socket.close()
+        server.socket = sock
+        server.server_address = sock.getsockname()
+        # Other processes may accept on the same socket: an accept that loses
+        # the race must not block serve_forever
+        sock.setblocking(False)
+        return server
+
+    def server_activate(self):
+        super().server_activate()
+        self.socket.setblocking(False)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self.shutdown_request(request)
+            return
+        with self._connections_lock:
+            self._connections.add(request)
+        # Clients may connect ahead of their first request (browser preconnects)
+        self._park(request, client_address)
+
+    def _process_request(self, request, client_address):
+        keep_alive = False
         try:
-            s.bind(('0.0.0.0', port))
-            return True
-        except socket.error:
-            return False
-
+            handler = self.RequestHandlerClass(request, client_address, self)
+            keep_alive = not getattr(handler, 'close_connection', True)
+        except Exception:
+            self.handle_error(request, client_address)
+        if keep_alive:
+            self._park(request, client_address, served=True)
+        else:
+            self._close(request)
+
+    def _close(self, request):
+        with self._connections_lock:
+            self._connections.discard(request)
+        self.shutdown_request(request)
+        self._slots.release()
+
+    def _park(self, request, client_address, served=False):
+        """Hand a connection to the idle watcher until it has a request to serve"""
+        with self._idle_lock:
+            stopped = self._stopping or (self.draining and served)
+            if not stopped:
+                self._parked.append((request, client_address, served))
+                if self._idle_thread is None:
+                    self._wakeup = socket.socketpair()
+                    for end in self._wakeup:
+                        end.setblocking(False)
+                    self._idle_thread = threading.Thread(target=self._watch_idle,
+                                                         name='http-idle', daemon=True)
+                    self._idle_thread.start()
+        if stopped:
+            self._close(request)
+        else:
+            self._wake()
 
-def find_available_port(start_port=8080):
-    """Find an available port starting from start_port"""
-    port = start_port
-    while port < start_port + 100:
-        if check_port_available(port):
-            return port
-        port += 1
-    return start_port  # Fallback
+    def _wake(self):
+        if self._wakeup is None:
+            return
+        try:
+            self._wakeup[1].send(b'\0')
+        except BlockingIOError:
+            pass  # a wakeup is pending already
+
+    def _watch_idle(self):
+        """Submit parked connections to the pool once readable, close them when they time out"""
+        wakeup = self._wakeup[0]
+        deadlines = {}
+        with selectors.DefaultSelector() as selector:
+            selector.register(wakeup, selectors.EVENT_READ)
+            while True:
+                with self._idle_lock:
+                    parked, self._parked = self._parked, []
+                    stopping = self._stopping
+                now = time.monotonic()
+                for request, client_address, served in parked:
+                    selector.register(request, selectors.EVENT_READ, client_address)
+                    deadlines[request] = (now + self.keep_alive_timeout, served)
+                # Draining closes idle keep-alive connections at once (clients
+                # retry those), but still answers the first request of new ones
+                expired = [request for request, (deadline, served) in deadlines.items()
+                           if deadline <= now or stopping or (served and self.draining)]
+                for request in expired:
+                    selector.unregister(request)
+                    del deadlines[request]
+                    self._close(request)
+                if stopping:
+                    return
+                timeout = min(deadline for deadline, _ in deadlines.values()) - now \
+                    if deadlines else None
+                for key, _ in selector.select(timeout):
+                    if key.fileobj is wakeup:
+                        try:
+                            wakeup.recv(4096)
+                        except BlockingIOError:
+                            pass
+                        continue
+                    selector.unregister(key.fileobj)
+                    del deadlines[key.fileobj]
+                    self._pool.submit(self._process_request, key.fileobj, key.data)
+
+    def drain(self, timeout):
+        """Let the open connections finish, closing those still open after timeout seconds
+
+        Call once serve_forever has returned. Every response from now on
+        closes its connection, and idle keep-alive connections are closed
+        right away; connections yet to send their first request still get
+        an answer. Returns the number of connections cut.
+        """
+        self.draining = True
+        self._wake()
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._connections_lock:
+                remaining = list(self._connections)
+            if not remaining or time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+        for connection in remaining:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        return len(remaining)
+
+    def server_close(self):
+        super().server_close()
+        # Close the idle connections first: only requests in progress are waited for
+        with self._idle_lock:
+            stopped, self._stopping = self._stopping, True
+            thread = self._idle_thread
+        if thread is not None and not stopped:
+            self._wake()
+            thread.join()
+            for end in self._wakeup:
+                end.close()
+        self._pool.shutdown(wait=True)
+
+
+def bind_server(port, workers=32, max_connections=256, attempts=100):
+    """Bind a server to the first free port from `port` on
+
+    Each port is bound for real and kept on success: nothing can take it
+    between a check and the bind.
+    """
+    for candidate in range(port, port + attempts):
+        try:
+            return PooledHTTPServer(("0.0.0.0", candidate), PasswordAnalyzerHandler,
+                                    workers, max_connections)
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE or port == 0 or candidate == port + attempts - 1:
+                raise
+
+
+# Listening socket handoff. The server can be started on a socket that is
+# already bound: by systemd socket activation (LISTEN_FDS=1 and LISTEN_PID,
+# the socket on fd 3), or by a server process being restarted. On SIGHUP
+# the running server starts a new process with the same arguments and its
+# listening socket (LISTEN_FD_ENV), waits for it to signal on a pipe
+# (READY_FD_ENV) that it is serving, then stops accepting and drains its
+# open connections: connections arriving meanwhile wait in the shared
+# socket's backlog, so none are refused. SIGTERM drains and stops.
+LISTEN_FD_ENV = 'PASSWORD_ANALYZER_LISTEN_FD'
+READY_FD_ENV = 'PASSWORD_ANALYZER_READY_FD'
+SD_LISTEN_FDS_START = 3
+# Seconds a new process may take to start serving, and the old one to drain
+RESTART_TIMEOUT = 30
+DRAIN_TIMEOUT = 30
+
+_restart_lock = threading.Lock()
+
+
+def inherited_socket():
+    """Get the listening socket passed by systemd or a restarting server, if any"""
+    fd = os.environ.pop(LISTEN_FD_ENV, None)
+    if (fd is None and os.environ.get('LISTEN_PID') == str(os.getpid())
+            and int(os.environ.get('LISTEN_FDS', '0')) >= 1):
+        fd = SD_LISTEN_FDS_START
+    # Not for the processes this one starts
+    for name in ('LISTEN_PID', 'LISTEN_FDS', 'LISTEN_FDNAMES'):
+        os.environ.pop(name, None)
+    if fd is None:
+        return None
+
+    sock = socket.socket(fileno=int(fd))
+    if sock.type != socket.SOCK_STREAM:
+        raise OSError(f"Inherited file descriptor {fd} is not a stream socket")
+    return sock
+
+
+def notify_ready():
+    """Tell the server process that started this one (if any) that it is serving"""
+    fd = os.environ.pop(READY_FD_ENV, None)
+    if fd is not None:
+        with os.fdopen(int(fd), 'wb') as ready:
+            ready.write(b'1')
+
+
+def restart_server(httpd):
+    """Hand the listening socket to a new server process, then stop this one"""
+    if not _restart_lock.acquire(blocking=False):
+        return
+    listen_fd = httpd.socket.fileno()
+    read_fd, write_fd = os.pipe()
+    env = dict(os.environ, **{LISTEN_FD_ENV: str(listen_fd), READY_FD_ENV: str(write_fd)})
+    try:
+        successor = subprocess.Popen([sys.executable] + sys.argv, env=env,
+                                     pass_fds=(listen_fd, write_fd))
+    except OSError as e:
+        print(f"\n❌ Restart failed: {e}; still serving")
+        os.close(read_fd)
+        _restart_lock.release()
+        return
+    finally:
+        os.close(write_fd)
+
+    # The pipe closes without a byte if the new process dies first
+    with os.fdopen(read_fd, 'rb') as ready:
+        started = bool(select.select([ready], [], [], RESTART_TIMEOUT)[0]) and ready.read(1) == b'1'
+    if not started:
+        print("\n❌ Restart failed: the new server did not start; still serving")
+        if successor.poll() is None:
+            successor.terminate()
+        _restart_lock.release()
+        return
+
+    print(f"\n♻️  Process {successor.pid} took over; finishing open requests...")
+    httpd.shutdown()
+
+
+def handle_signals(httpd):
+    """Drain and stop on SIGTERM; restart in a new process on SIGHUP"""
+    def stop(signum, frame):
+        print("\n🛑 Stopping: finishing open requests...")
+        # serve_forever runs in this (the main) thread: stop it from another
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+
+    def restart(signum, frame):
+        threading.Thread(target=restart_server, args=(httpd,), name='restart', daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, restart)
 
 
 def print_qr_code(ip, port):
@@ -1524,11 +2202,44 @@ def print_qr_code(ip, port):
         print("pip install qrcode[pil]")
 
 
-def run_server():
-    """Run the password analyzer web server"""
-    PORT = find_available_port(8080)
-    local_ip = get_local_ip()
+def announce_network(port, timeout=DISCOVERY_TIMEOUT):
+    """Print the network addresses and QR code of the server once discovered"""
+    local_ip, public_ip = discover_addresses(timeout)
+
+    lines = ["", "🌐 Network Access:"]
+    if local_ip not in ("127.0.0.1", "Not available"):
+        lines.append(f"   • Network IP: http://{local_ip}:{port}")
+        lines.append("   1. Ensure phone is on same Wi-Fi network")
+        lines.append("   2. Open browser on phone")
+        lines.append(f"   3. Enter: http://{local_ip}:{port}")
+    else:
+        lines.append("   • No network address found (offline host?)")
+    if public_ip != "Not available":
+        lines.append(f"   • Public IP: {public_ip} (if port forwarded)")
+    print("\n".join(lines))
+
+    if local_ip not in ("127.0.0.1", "Not available"):
+        print_qr_code(local_ip, port)
+
+
+def open_browser(url):
+    """Open the page in the default browser (best effort)"""
+    try:
+        webbrowser.open(url)
+    except Exception:
+        pass
+
+
+def run_server(port=8080, workers=32, max_connections=256, discovery=True,
+               discovery_timeout=DISCOVERY_TIMEOUT, browser=True):
+    """Run the password analyzer web server
 
+    The server accepts connections before anything else happens: network
+    discovery (LAN and public IP, QR code) and opening the browser run in
+    the background, and discovery=False skips the former entirely. It
+    serves on an inherited listening socket when there is one (see
+    inherited_socket), and binds one from `port` on otherwise.
+    """
     print("═" * 60)
     print("🔐 PASSWORD SECURITY ANALYZER - WEB SERVER")
     print("═" * 60)
@@ -1540,78 +2251,80 @@ def run_server():
     print("   • Security recommendations")
     print("   • Policy compliance checking")
 
-    print(f"\n🌐 Server Information:")
-    print(f"   • Local access: http://localhost:{PORT}")
-    print(f"   • Network IP: http://{local_ip}:{PORT}")
-
-    # Try to get public IP
-    try:
-        public_ip = get_public_ip()
-        if public_ip != "Not available":
-            print(f"   • Public IP: {public_ip} (if port forwarded)")
-    except:
-        pass
-
-    print("\n📱 Mobile Access Instructions:")
-    print("   1. Ensure phone is on same Wi-Fi network")
-    print("   2. Open browser on phone")
-    print("   3. Enter: http://" + local_ip + f":{PORT}")
-
     print("\n🚀 Starting server...")
 
+    # Encode and compress the page once, before the first visitor
+    get_page_asset()
+
     # Allow external connections by using "0.0.0.0"
     try:
-        with socketserver.TCPServer(("0.0.0.0", PORT), PasswordAnalyzerHandler) as httpd:
-            print(f"✅ Server started successfully on port {PORT}")
-
-            # Print QR code for easy access
-            print_qr_code(local_ip, PORT)
-
-            print("\n📝 Sample passwords to try:")
-            print("   • Weak: 'password123'")
-            print("   • Good: 'MySecureP@ssw0rd!'")
-            print("   • Strong: 'C0rrectHorseB@tteryStaple!'")
-
-            print("\n⚠  Security Note:")
-            print("   • All calculations happen in your browser")
-            print("   • No passwords are sent to any server")
-            print("   • Analysis is 100% private and secure")
-
-            print("\n🛑 Press Ctrl+C to stop the server")
-            print("═" * 60)
-
-            # Try to open browser automatically
-            try:
-                webbrowser.open(f"http://localhost:{PORT}")
-            except:
-                pass
-
-            try:
-                httpd.serve_forever()
-            except KeyboardInterrupt:
-                print("\n\n🛑 Server stopped by user.")
-                print("Thank you for using Password Security Analyzer!")
-
+        listener = inherited_socket()
+        if listener is not None:
+            httpd = PooledHTTPServer.from_socket(listener, PasswordAnalyzerHandler,
+                                                 workers, max_connections)
+        else:
+            httpd = bind_server(port, workers, max_connections)
     except PermissionError:
-        print(f"\n❌ ERROR: Port {PORT} is already in use or blocked!")
+        print(f"\n❌ ERROR: Port {port} is blocked!")
         print("   Try one of these solutions:")
-        print("   1. Close other applications using port {PORT}")
+        print("   1. Use a port above 1023 (--port 8080)")
         print("   2. Run as administrator (Windows)")
-        print("   3. The script will try a different port automatically")
-
-        # Try next port
-        PORT = find_available_port(PORT + 1)
-        print(f"   Trying port {PORT} instead...")
-
-        # Restart with new port
-        os.execv(sys.executable, ['python'] + sys.argv)
-
+        return
     except OSError as e:
         print(f"\n❌ ERROR: {e}")
         print("   Possible solutions:")
         print("   1. Check your firewall settings")
         print("   2. Try running on a different port")
         print("   3. Ensure you have network permissions")
+        return
+
+    PORT = httpd.server_address[1]
+    with httpd:
+        print(f"✅ Server started successfully on port {PORT}"
+              + (" (inherited socket)" if listener is not None else ""))
+        print(f"   • Local access: http://localhost:{PORT}")
+        print(f"   • {workers} worker threads, up to {max_connections} connections")
+
+        print("\n📝 Sample passwords to try:")
+        print("   • Weak: 'password123'")
+        print("   • Good: 'MySecureP@ssw0rd!'")
+        print("   • Strong: 'C0rrectHorseB@tteryStaple!'")
+
+        print("\n⚠  Security Note:")
+        print("   • The page analyzes passwords in your browser, without sending them")
+        print("   • POST /api/analyze and /api/analyze/batch receive passwords:")
+        print("     serve them over HTTPS (e.g. behind a proxy) beyond localhost")
+
+        print("\n🛑 Press Ctrl+C to stop the server")
+        if hasattr(signal, 'SIGHUP'):
+            print(f"♻️  kill -HUP {os.getpid()} restarts it without dropping connections")
+        print("═" * 60)
+
+        # Nothing below may delay serve_forever: the socket is already
+        # listening, and connections wait in its backlog until then
+        if discovery:
+            threading.Thread(target=announce_network, args=(PORT, discovery_timeout),
+                             name='network-discovery', daemon=True).start()
+        # Not for services, nor again on restarts
+        if browser and listener is None:
+            threading.Thread(target=open_browser, args=(f"http://localhost:{PORT}",),
+                             name='open-browser', daemon=True).start()
+        # With --hash this calibrates the machine: not before the first visitor
+        threading.Thread(target=get_attacker_model, name='attacker-model', daemon=True).start()
+
+        handle_signals(httpd)
+        notify_ready()
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n\n🛑 Server stopped by user.")
+            print("Thank you for using Password Security Analyzer!")
+        else:
+            # Stopped by SIGTERM, or handed over to a new process by SIGHUP
+            cut = httpd.drain(DRAIN_TIMEOUT)
+            if cut:
+                print(f"   {cut} connection(s) still open after {DRAIN_TIMEOUT} s were closed")
+            print("🛑 Server stopped.")
 
 
 if __name__ == "__main__":
@@ -1627,4 +2340,46 @@ if __name__ == "__main__":
         print("   This requires Python's standard libraries.")
         sys.exit(1)
 
-    run_server()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Password Security Analyzer web server")
+    parser.add_argument("--port", type=int, default=8080,
+                        help="first port to try, unless a listening socket is inherited "
+                             "(default: 8080)")
+    parser.add_argument("--workers", type=int, default=32,
+                        help="worker threads serving connections (default: 32)")
+    parser.add_argument("--max-connections", type=int, default=256,
+                        help="open connections accepted at once (default: 256)")
+    parser.add_argument("--cache-size", type=int, default=4096,
+                        help="analysis results kept in the result cache, 0 disables it (default: 4096)")
+    parser.add_argument("--cache-ttl", type=float, default=3600,
+                        help="seconds a cached result stays valid (default: 3600)")
+    parser.add_argument("--cache-file",
+                        help="SQLite file to share cached results between server processes")
+    parser.add_argument("--no-discovery", action="store_true",
+                        help="don't look up the network and public IP addresses (offline hosts)")
+    parser.add_argument("--discovery-timeout", type=float, default=DISCOVERY_TIMEOUT,
+                        help=f"seconds network discovery may take (default: {DISCOVERY_TIMEOUT:g})")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="don't open the page in a browser")
+    parser.add_argument("--hash",
+                        help="scheme passwords are stored with, for crack times: md5, ntlm, "
+                             "pbkdf2-sha256:600000, bcrypt:12, scrypt:n=131072,r=8,p=1, "
+                             "argon2id:m=65536,t=3,p=4... (calibrated on this machine)")
+    args = parser.parse_args()
+
+    if args.hash:
+        try:
+            scheme = HashScheme.parse(args.hash)
+        except ValueError as e:
+            parser.error(str(e))
+        # Calibrated on first use, once the server is listening
+        os.environ[HASH_ENV] = str(scheme)
+
+    if args.cache_size <= 0:
+        set_cache(None)
+    elif args.cache_file:
+        set_cache(SqliteResultCache(args.cache_file, args.cache_size, args.cache_ttl))
+    else:
+        set_cache(MemoryResultCache(args.cache_size, args.cache_ttl))
+
+    run_server(args.port, args.workers, args.max_connections, not args.no_discovery,
+               args.discovery_timeout, not args.no_browser)
\ No newline at end of file